@@ -0,0 +1,113 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+import chart_engine as eng
+import tzdb
+
+
+# --- Input streams ---
+def read_records(f, fmt):
+    if fmt == "csv":
+        for row in csv.DictReader(f): yield row
+    else:
+        for line in f:
+            line = line.strip()
+            if line: yield json.loads(line)
+
+def chunked(records, size):
+    chunk = []
+    for rec in records:
+        chunk.append(rec)
+        if len(chunk) >= size: yield chunk; chunk = []
+    if chunk: yield chunk
+
+
+# --- Worker side ---
+def compute_chunk(chunk, options):
+    lines, good, idx, errors = [None] * len(chunk), [], [], 0
+    options = dict(options); is_dst = options.pop("is_dst", False)
+    # A zone name in "tz" becomes that birth's historical UTC offset: one table lookup per zone and chunk.
+    flags, unknown = tzdb.resolve_records(chunk, is_dst)
+    for i in unknown:
+        lines[i] = json.dumps({"name": chunk[i].get("name"), "error": f"bad record: unknown time zone {chunk[i]['tz']!r}"}); errors += 1
+    for i, rec in enumerate(chunk):
+        if lines[i] is not None: continue
+        try: good.append(eng.parse_record(rec)); idx.append(i)
+        except Exception as e:
+            lines[i] = json.dumps({"name": rec.get("name"), "error": f"bad record: {e}"}); errors += 1
+    try:
+        charts = eng.compute_many(good, options)
+    except Exception:
+        charts = []
+        for r in good:
+            try: charts.append(eng.compute_many([r], options)[0])
+            except Exception as e: charts.append(e)
+    for i, chart in zip(idx, charts):
+        name = chunk[i].get("name")
+        if isinstance(chart, Exception): errors += 1
+        out = {"name": name, "error": str(chart)} if isinstance(chart, Exception) else {"name": name, "chart": chart}
+        if i in flags: out["tz_warning"] = f"{tzdb.FLAG_NAMES[flags[i]]} local time, resolved as UTC{chunk[i]['tz']:+g}"
+        lines[i] = json.dumps(out, ensure_ascii=False)
+    return lines, errors
+
+
+# --- Driver ---
+def run(records, out, options, workers, chunk_size, ordered):
+    count = errors = 0
+    max_pending = max(2, workers * 2)
+
+    def emit(result):
+        nonlocal count, errors
+        lines, n_err = result
+        out.write("\n".join(lines) + "\n")
+        count += len(lines); errors += n_err
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunked(records, chunk_size):
+            pending.append(pool.submit(compute_chunk, chunk, options))
+            while len(pending) >= max_pending:
+                if ordered: emit(pending.popleft().result())
+                else:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for fut in done: pending.remove(fut); emit(fut.result())
+        while pending:
+            if ordered: emit(pending.popleft().result())
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done: pending.remove(fut); emit(fut.result())
+    return count, errors
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="main.py batch", description="Compute charts for a stream of birth records (CSV or JSONL with profile fields) and write JSONL.")
+    ap.add_argument("input", help="input file, or - for stdin")
+    ap.add_argument("-o", "--output", default="-", help="output JSONL file, or - for stdout")
+    ap.add_argument("--format", choices=["csv", "jsonl"], help="input format (default: from the file extension, else jsonl)")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--chunk-size", type=int, default=200, help="records per worker task")
+    ap.add_argument("--unordered", action="store_true", help="emit results as they complete instead of in input order")
+    ap.add_argument("--outer", action="store_true", help="include Uranus, Neptune and Pluto")
+    ap.add_argument("--no-panchang", action="store_true")
+    ap.add_argument("--no-dashas", action="store_true")
+    ap.add_argument("--is-dst", action="store_true", help="read ambiguous or nonexistent local times in zone-named records as daylight time")
+    args = ap.parse_args(argv)
+
+    fmt = args.format or ("csv" if args.input.lower().endswith(".csv") else "jsonl")
+    options = {"outer": args.outer, "panchang": not args.no_panchang, "dashas": not args.no_dashas, "is_dst": args.is_dst}
+    fin = sys.stdin if args.input == "-" else open(args.input, newline="" if fmt == "csv" else None, encoding="utf-8")
+    fout = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    start = time.perf_counter()
+    try:
+        count, errors = run(read_records(fin, fmt), fout, options, max(1, args.workers), max(1, args.chunk_size), not args.unordered)
+    finally:
+        if fin is not sys.stdin: fin.close()
+        if fout is not sys.stdout: fout.close()
+    elapsed = time.perf_counter() - start
+    print(f"{count} records ({errors} errors) in {elapsed:.2f}s - {count / elapsed if elapsed else 0:.1f} charts/s with {args.workers} workers", file=sys.stderr)
+    return 1 if errors else 0
@@ -0,0 +1,23 @@
+import json
+import os
+
+
+# --- Baseline comparison shared by the benchmark scripts ---
+# A metric regresses when it exceeds baseline * (1 + tolerance) + slack; lower is better for every metric.
+def compare(result, path, tolerance, slack, update=False, unit="ms", tolerances=None):
+    baseline = {}
+    if os.path.exists(path):
+        with open(path) as f: baseline = json.load(f)
+    failed = []
+    for k, v in sorted(result.items()):
+        ref = baseline.get(k)
+        tol = (tolerances or {}).get(k, tolerance)
+        limit = ref * (1 + tol) + slack if ref is not None else None
+        status = "" if limit is None else ("  REGRESSED" if v > limit else "  ok")
+        print(f"{k:>32}: {v:10.1f} {unit}" + ("" if ref is None else f"  (baseline {ref:.1f}, limit {limit:.1f})") + status)
+        if limit is not None and v > limit: failed.append(k)
+    if update or not baseline:
+        with open(path, "w") as f: json.dump({k: round(v, 1) for k, v in result.items()}, f, indent=2, sort_keys=True)
+        print(f"baseline written to {path}")
+        return []
+    return failed
@@ -0,0 +1,110 @@
+import argparse
+import http.client
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlencode, urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENDPOINTS = ("chart", "vargas", "panchang", "dasha")
+
+
+# --- Request mix ---
+def birth_params(rng):
+    return {"year": rng.randint(1920, 2030), "month": rng.randint(1, 12), "day": rng.randint(1, 28), "hour": rng.randint(0, 23),
+            "minute": rng.randint(0, 59), "second": 0, "tz": rng.choice([5.5, 0, -5, 1, 8, 9.5]),
+            "lat": round(rng.uniform(-60, 60), 4), "lon": round(rng.uniform(-180, 180), 4)}
+
+def request_paths(n, distinct, endpoints, seed):
+    # `distinct` birth records reused across n requests, so the cache hit rate is roughly 1 - distinct/n.
+    rng = random.Random(seed)
+    births = [birth_params(rng) for _ in range(distinct)]
+    return [f"/{rng.choice(endpoints)}?{urlencode(rng.choice(births))}" for _ in range(n)]
+
+
+# --- Client threads: one keep-alive connection each ---
+def worker(host, port, paths, results):
+    conn = http.client.HTTPConnection(host, port, timeout=60)
+    for path in paths:
+        t = time.perf_counter()
+        try:
+            conn.request("GET", path); resp = conn.getresponse(); resp.read(); status = resp.status
+        except (OSError, http.client.HTTPException):
+            conn.close(); conn = http.client.HTTPConnection(host, port, timeout=60); status = 0
+        results.append((status, (time.perf_counter() - t) * 1000.0))
+    conn.close()
+
+def run(url, paths, concurrency):
+    host, port = urlsplit(url).hostname, urlsplit(url).port or 80
+    results, threads = [], []
+    t0 = time.perf_counter()
+    for i in range(concurrency):
+        th = threading.Thread(target=worker, args=(host, port, paths[i::concurrency], results)); th.start(); threads.append(th)
+    for th in threads: th.join()
+    return results, time.perf_counter() - t0
+
+def report(results, elapsed):
+    ok = sorted(ms for status, ms in results if status == 200)
+    statuses = {}
+    for status, _ in results: statuses[status] = statuses.get(status, 0) + 1
+    pct = lambda p: ok[min(len(ok) - 1, int(len(ok) * p))] if ok else float("nan")
+    return {"requests": len(results), "seconds": elapsed, "rps": len(results) / elapsed, "ok_rps": len(ok) / elapsed, "status": statuses,
+            "latency_ms": {"mean": statistics.fmean(ok) if ok else float("nan"), "p50": pct(0.50), "p90": pct(0.90), "p95": pct(0.95), "p99": pct(0.99), "max": ok[-1] if ok else float("nan")}}
+
+
+def wait_ready(url, proc, timeout=30):
+    host, port = urlsplit(url).hostname, urlsplit(url).port
+    t = time.perf_counter()
+    while time.perf_counter() - t < timeout:
+        if proc.poll() is not None: raise SystemExit(f"server exited with code {proc.returncode}")
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=1); conn.request("GET", "/health")
+            if conn.getresponse().status == 200: return
+        except OSError: time.sleep(0.1)
+    raise SystemExit("server did not come up")
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Load test for `main.py serve`: reports requests/sec and latency percentiles.")
+    ap.add_argument("--url", default="http://127.0.0.1:8765", help="server to test")
+    ap.add_argument("--spawn", action="store_true", help="start a server on --url for the run and stop it afterwards")
+    ap.add_argument("--workers", type=int, help="worker processes for a spawned server")
+    ap.add_argument("-n", "--requests", type=int, default=2000)
+    ap.add_argument("-c", "--concurrency", type=int, default=16)
+    ap.add_argument("--distinct", type=int, default=500, help="distinct birth records in the mix (cache hit rate is about 1 - distinct/requests)")
+    ap.add_argument("--endpoints", default=",".join(ENDPOINTS))
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--json", help="also write the report to this file")
+    args = ap.parse_args(argv)
+
+    proc = None
+    if args.spawn:
+        port = urlsplit(args.url).port
+        cmd = [sys.executable, os.path.join(ROOT, "main.py"), "serve", "--port", str(port)] + (["--workers", str(args.workers)] if args.workers else [])
+        proc = subprocess.Popen(cmd, cwd=ROOT); wait_ready(args.url, proc)
+    try:
+        paths = request_paths(args.requests, args.distinct, args.endpoints.split(","), args.seed)
+        rep = report(*run(args.url, paths, args.concurrency))
+        host, port = urlsplit(args.url).hostname, urlsplit(args.url).port
+        conn = http.client.HTTPConnection(host, port, timeout=10); conn.request("GET", "/stats")
+        rep["server"] = json.loads(conn.getresponse().read())
+    finally:
+        if proc: proc.terminate(); proc.wait()
+
+    lat = rep["latency_ms"]
+    print(f"{rep['requests']} requests in {rep['seconds']:.2f} s  ->  {rep['rps']:.0f} req/s  (concurrency {args.concurrency})")
+    print(f"latency ms: mean {lat['mean']:.1f}  p50 {lat['p50']:.1f}  p90 {lat['p90']:.1f}  p95 {lat['p95']:.1f}  p99 {lat['p99']:.1f}  max {lat['max']:.1f}")
+    print("status: " + ", ".join(f"{k}={v}" for k, v in sorted(rep["status"].items())))
+    srv = rep["server"]
+    print(f"server: hits {srv['hits']}  misses {srv['misses']}  coalesced {srv['coalesced']}  rejected {srv['rejected']}  errors {srv['errors']}")
+    if args.json:
+        with open(args.json, "w") as f: json.dump(rep, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
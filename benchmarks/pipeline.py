@@ -0,0 +1,182 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import swisseph as swe
+
+import chart_engine as eng
+import dasha
+from baseline import compare
+from chart_render import TkChartRenderer
+from ephemeris import EPHEMERIS
+from main import ProfessionalVedicAppV1 as App
+from profile_store import SQLiteProfileStore
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pipeline_baseline.json")
+BIRTH = datetime(1987, 5, 4, 10, 30)
+TZ, LAT, LON = 5.5, 12.9716, 77.5946
+PROFILE_SIZES = (1000, 10000, 100000)
+SYLLABLES = ["ra", "vi", "an", "ka", "sh", "ma", "de", "pr", "su", "ni"]
+
+
+# --- Timing ---
+def bench(fn, min_time=0.2, max_calls=100000):
+    # Calls fn(i) with a running counter until min_time has passed; returns per-call times in us.
+    times, spent, i = [], 0.0, 0
+    while spent < min_time and i < max_calls:
+        t = time.perf_counter(); fn(i); dt = time.perf_counter() - t
+        times.append(dt * 1e6); spent += dt; i += 1
+    return times
+
+def summarize(times):
+    s = sorted(times)
+    return {"median_us": statistics.median(s), "p95_us": s[min(len(s) - 1, int(len(s) * 0.95))], "calls": len(s)}
+
+
+# --- Headless canvas: records the calls TkChartRenderer makes, so drawing cost is the renderer's own ---
+class RecordingCanvas:
+    def __init__(self): self.n = 0; self.calls = 0
+    def _create(self, *a, **kw): self.n += 1; self.calls += 1; return self.n
+    def __getattr__(self, name):
+        if name.startswith("create_"): return self._create
+        raise AttributeError(name)
+    def itemconfig(self, *a, **kw): self.calls += 1
+    def coords(self, *a): self.calls += 1
+    def delete(self, *a): self.calls += 1
+    def tag_raise(self, *a): self.calls += 1
+    def tag_lower(self, *a): self.calls += 1
+
+def make_canvas(use_tk):
+    if not use_tk: return RecordingCanvas()
+    import tkinter as tk
+    root = tk.Tk(); root.withdraw()
+    return tk.Canvas(root, width=500, height=500)
+
+
+# --- Stages of update_chart ---
+def scrub(i):
+    # Time-scrubbing input: one minute further on every call, so nothing is served from a cache.
+    return BIRTH + timedelta(minutes=i)
+
+def stage_benchmarks(min_time):
+    EPHEMERIS.set_sid_mode(swe.SIDM_LAHIRI)
+    jd = eng.local_to_jd(BIRTH, TZ)
+    objs = eng.chart_objs(True)
+    out = {}
+    out["ephemeris.calc_ut_all_bodies"] = bench(lambda i: [EPHEMERIS.raw_calc_ut(jd + i/1440.0, p, eng.FLAGS) for n, p in objs if p >= 0], min_time)
+    out["ephemeris.calc_ut_cached"] = bench(lambda i: [EPHEMERIS.calc_ut(jd, p, eng.FLAGS) for n, p in objs if p >= 0], min_time)
+    out["ephemeris.houses_ex"] = bench(lambda i: swe.houses_ex(jd + i/1440.0, LAT, LON, b'A', eng.FLAGS), min_time)
+
+    lons = [EPHEMERIS.calc_ut(jd, p, eng.FLAGS)[0][0] for n, p in objs if p >= 0]
+    out["varga.get_divisional_sign_all"] = bench(lambda i: [eng.get_divisional_sign((l + i*0.01) % 360, d) for l in lons for d in eng.VARGAS], min_time)
+    try:
+        import numpy as np
+        from shodashvarga import shodashvarga
+        arr = np.array(lons)
+        out["varga.shodashvarga_all"] = bench(lambda i: shodashvarga((arr + i*0.01) % 360), min_time)
+    except ImportError: pass
+
+    sun, moon = EPHEMERIS.calc_ut(jd, 0, eng.FLAGS)[0], EPHEMERIS.calc_ut(jd, 1, eng.FLAGS)[0]
+    out["panchang.get_panchang_data"] = bench(lambda i: eng.get_panchang_data(sun[0], moon[0], moon[3], jd + i/1440.0, scrub(i), LAT, LON, TZ), min_time)
+
+    def legacy_dasha(i):
+        for lord, start, _ in eng.calculate_mahadasha((moon[0] + i*0.01) % 360, BIRTH):
+            for label, a_start, _ in eng.calculate_antardasha(lord, start):
+                eng.calculate_pratyantar(lord, label.split("-")[1], a_start)
+    out["dasha.maha_antar_pratyantar"] = bench(legacy_dasha, min_time)
+    # The same three levels as the app builds them: a fresh tree, every Antar and Pratyantar expanded.
+    def tree_dasha(i):
+        for maha in dasha.DashaTree((moon[0] + i*0.01) % 360, BIRTH).mahas:
+            for antar in maha.children: antar.children
+    out["dasha.tree_maha_antar_pratyantar"] = bench(tree_dasha, min_time)
+    out["dasha.tree_at_5_levels"] = bench(lambda i: dasha.DashaTree((moon[0] + i*0.01) % 360, BIRTH).at(BIRTH + timedelta(days=i % 30000)), min_time)
+    try:
+        import numpy as np
+        days = np.linspace(0, 36500, 1000)
+        out["dasha.tree_at_many_1000"] = bench(lambda i: dasha.DashaTree((moon[0] + i*0.01) % 360, BIRTH).at_many(days + i), min_time)
+    except ImportError: pass
+
+    out["chart.compute_chart"] = bench(lambda i: eng.compute_chart(scrub(i), TZ, LAT, LON), min_time)
+    return out
+
+def draw_benchmarks(min_time, use_tk):
+    # Steady-state frames while scrubbing: the renderer is warm and only the placements move.
+    views = []
+    for i in range(60):
+        req = {"dt": scrub(i * 7), "tz": TZ, "lat": LAT, "lon": LON, "outer": True}
+        core = App._compute_core(req)
+        t_d1, t_div = App._compute_transits(core["chart"]["jd"], True, 9)
+        views.append((core, t_d1))
+    empty = [[] for _ in range(12)]
+    out = {}
+    for style in ("south", "north"):
+        for drishti in (False, True):
+            for transits in (False, True):
+                renderer = TkChartRenderer(make_canvas(use_tk))
+                def frame(i):
+                    core, t_d1 = views[i % len(views)]
+                    renderer.draw(core["p_d1"], t_d1 if transits else empty, core["asc_d1"], "RASHI (D1)", True, style == "north", drishti)
+                frame(0)
+                out[f"draw.{style}{'.drishti' if drishti else ''}{'.transits' if transits else ''}"] = bench(frame, min_time)
+    return out
+
+def profile_name(i):
+    # Unique, pronounceable-ish names; a two-syllable prefix matches about 1% of them.
+    return "".join(SYLLABLES[int(c)] for c in f"{i:06d}").title()
+
+def profile_benchmarks(min_time, sizes):
+    out = {}
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as d:
+            store = SQLiteProfileStore(os.path.join(d, "bench.db"))
+            rec = {"city": "Bangalore", "lat": LAT, "lon": LON, "tz": TZ, "year": 1987, "month": 5, "day": 4, "hour": 10, "minute": 30, "second": 0}
+            t = time.perf_counter()
+            store.bulk_import(dict(rec, name=profile_name(i)) for i in range(n))
+            out[f"profiles.{n}.bulk_import"] = [(time.perf_counter() - t) * 1e6]
+            out[f"profiles.{n}.save"] = bench(lambda i: store.put(dict(rec, name=profile_name(i % n), hour=i % 24)), min_time)
+            out[f"profiles.{n}.load"] = bench(lambda i: store.get(profile_name((i * 7919) % n)), min_time)
+            out[f"profiles.{n}.search_prefix"] = bench(lambda i: store.search(SYLLABLES[i % 10] + SYLLABLES[(i // 10) % 10]), min_time)
+            out[f"profiles.{n}.search_substring"] = bench(lambda i: store.search(SYLLABLES[i % 10] + SYLLABLES[(i // 10) % 10] + SYLLABLES[(i // 100) % 10]), min_time)
+            store.close()
+    return out
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmarks for every stage of update_chart; exits 1 on regression against the baseline.")
+    ap.add_argument("--min-time", type=float, default=0.2, help="seconds spent on each benchmark")
+    ap.add_argument("--only", action="append", default=[], help="run benchmarks whose name starts with this prefix; may be repeated")
+    ap.add_argument("--quick", action="store_true", help="skip the 100k-profile store")
+    ap.add_argument("--tk", action="store_true", help="draw on a real Tk canvas (needs a display) instead of the recording canvas")
+    ap.add_argument("--json", help="write full results (median, p95, calls) to this file")
+    ap.add_argument("--tolerance", type=float, default=0.30, help="allowed relative slowdown of the median (default 30%%)")
+    ap.add_argument("--tolerances", type=json.loads, default={}, help='per-benchmark overrides as JSON, e.g. \'{"chart.compute_chart": 0.1}\'')
+    ap.add_argument("--slack-us", type=float, default=5.0, help="allowed absolute slowdown on top of the tolerance")
+    ap.add_argument("--baseline", default=BASELINE)
+    ap.add_argument("--update-baseline", action="store_true")
+    args = ap.parse_args(argv)
+
+    wanted = lambda prefix: not args.only or any(p.startswith(prefix) or prefix.startswith(p) for p in args.only)
+    raw = {}
+    if wanted("ephemeris") or wanted("varga") or wanted("panchang") or wanted("dasha") or wanted("chart"): raw.update(stage_benchmarks(args.min_time))
+    if wanted("draw"): raw.update(draw_benchmarks(args.min_time, args.tk))
+    if wanted("profiles"): raw.update(profile_benchmarks(args.min_time, PROFILE_SIZES[:2] if args.quick else PROFILE_SIZES))
+    results = {k: summarize(v) for k, v in raw.items() if not args.only or any(k.startswith(p) for p in args.only)}
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"python": sys.version.split()[0], "swisseph": swe.version, "canvas": "tk" if args.tk else "recording", "results": results}, f, indent=2)
+    failed = compare({k: r["median_us"] for k, r in results.items()}, args.baseline, args.tolerance, args.slack_us,
+                     args.update_baseline, unit="us", tolerances=args.tolerances)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from baseline import compare
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "startup_baseline.json")
+IMPORT_PROBE = "import sys, time; t = time.perf_counter(); sys.path.insert(0, sys.argv[1]); import main; print((time.perf_counter() - t) * 1000.0)"
+
+
+# --- Measurements (each run is a fresh interpreter, so every start is cold for Python) ---
+def time_import(cwd):
+    return float(subprocess.run([sys.executable, "-c", IMPORT_PROBE, ROOT], cwd=cwd, capture_output=True, text=True, check=True).stdout)
+
+def time_launch(cwd):
+    t = time.perf_counter()
+    out = subprocess.run([sys.executable, os.path.join(ROOT, "main.py"), "--startup-timings"], cwd=cwd, capture_output=True, text=True, check=True, timeout=60).stdout
+    wall = (time.perf_counter() - t) * 1000.0
+    timings = json.loads(out.strip().splitlines()[-1])
+    timings["wall_ms"] = wall
+    return timings
+
+def has_display():
+    return sys.platform in ("win32", "darwin") or bool(os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+
+def measure(runs, launch):
+    samples = {}
+    with tempfile.TemporaryDirectory() as cwd:  # keeps the profile and geocode databases out of the tree
+        for _ in range(runs):
+            samples.setdefault("module_import_ms", []).append(time_import(cwd))
+            if launch:
+                for k, v in time_launch(cwd).items(): samples.setdefault(k, []).append(v)
+    return {k: statistics.median(v) for k, v in samples.items()}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Cold-start benchmark; exits 1 if startup regressed against the recorded baseline.")
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown (default 25%%)")
+    ap.add_argument("--slack-ms", type=float, default=15.0, help="allowed absolute slowdown on top of the tolerance")
+    ap.add_argument("--baseline", default=BASELINE)
+    ap.add_argument("--update-baseline", action="store_true")
+    ap.add_argument("--no-window", action="store_true", help="only time the module import, even if a display is available")
+    args = ap.parse_args(argv)
+
+    launch = has_display() and not args.no_window
+    if not launch: print("no display: timing module import only", file=sys.stderr)
+    result = measure(args.runs, launch)
+
+    failed = compare(result, args.baseline, args.tolerance, args.slack_ms, args.update_baseline)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
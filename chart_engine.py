@@ -0,0 +1,300 @@
+import swisseph as swe
+from datetime import datetime, timedelta
+import calendar
+import math
+
+from ephemeris import EPHEMERIS
+from perf import PROFILER
+
+# --- Constants (shared by the Tk app, the batch tools and the services) ---
+NAKSHATRAS = ["Ashwini", "Bharani", "Krittika", "Rohini", "Mrigashira", "Ardra", "Punarvasu", "Pushya", "Ashlesha",
+              "Magha", "Purva Phalguni", "Uttara Phalguni", "Hasta", "Chitra", "Swati", "Vishakha", "Anuradha", "Jyeshtha",
+              "Moola", "Purva Ashadha", "Uttara Ashadha", "Shravana", "Dhanishta", "Shatabhisha", "Purva Bhadrapada", "Uttara Bhadrapada", "Revati"]
+LORD_ORDER = ["Ketu", "Venus", "Sun", "Moon", "Mars", "Rahu", "Jupiter", "Saturn", "Mercury"]
+DASHA_YEARS = {"Ketu": 7, "Venus": 20, "Sun": 6, "Moon": 10, "Mars": 7, "Rahu": 18, "Jupiter": 16, "Saturn": 19, "Mercury": 17}
+SIGNS = ["Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo", "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"]
+
+TITHIS = ["Pratipada (S)", "Dwitiya (S)", "Tritiya (S)", "Chaturthi (S)", "Panchami (S)", "Shashthi (S)", "Saptami (S)", "Ashtami (S)", "Navami (S)", "Dashami (S)", "Ekadashi (S)", "Dwadashi (S)", "Trayodashi (S)", "Chaturdashi (S)", "Purnima",
+          "Pratipada (K)", "Dwitiya (K)", "Tritiya (K)", "Chaturthi (K)", "Panchami (K)", "Shashthi (K)", "Saptami (K)", "Ashtami (K)", "Navami (K)", "Dashami (K)", "Ekadashi (K)", "Dwadashi (K)", "Trayodashi (K)", "Chaturdashi (K)", "Amavasya"]
+YOGAS = ["Vishkambha", "Priti", "Ayushman", "Saubhagya", "Shobhana", "Atiganda", "Sukarma", "Dhriti", "Shula", "Ganda", "Vriddhi", "Dhruva", "Vyaghata", "Harshana", "Vajra", "Siddhi", "Vyatipata", "Variyana", "Parigha", "Shiva", "Siddha", "Sadhya", "Shubha", "Shukla", "Brahma", "Indra", "Vaidhriti"]
+KARANAS = ["Bava", "Balava", "Kaulava", "Taitila", "Gara", "Vanija", "Vishti"]
+# Eighth of the daytime (1-based) holding each kala, by weekday (Monday = 0)
+RAHU_KALA_PARTS = {6: 8, 0: 2, 1: 7, 2: 5, 3: 6, 4: 4, 5: 3}
+YAMAGANDA_PARTS = {6: 5, 0: 4, 1: 3, 2: 2, 3: 1, 4: 7, 5: 6}
+GULIKA_PARTS = {6: 7, 0: 6, 1: 5, 2: 4, 3: 3, 4: 2, 5: 1}
+VARJYAM_STARTS = [50, 24, 30, 40, 14, 21, 30, 20, 32, 30, 20, 18, 21, 20, 14, 14, 10, 14, 20, 24, 20, 10, 10, 18, 16, 24, 30]
+
+D_CHARTS = {"D2 (Hora)": 2, "D3 (Drekkana)": 3, "D4 (Chaturthamsha)": 4, "D7 (Saptamsha)": 7, "D9 (Navamsha)": 9, "D10 (Dashamsha)": 10, "D12 (Dwadashamsha)": 12, "D16 (Shodashamsha)": 16, "D20 (Vimshamsha)": 20, "D24 (Chaturvimshamsha)": 24, "D27 (Saptavimshamsha)": 27, "D30 (Trimshamsha)": 30, "D40 (Khavedamsha)": 40, "D45 (Akshavedamsha)": 45, "D60 (Shastiamsha)": 60}
+VARGAS = [1] + list(D_CHARTS.values())
+
+DIGNITIES = {"Sun": (0, 10), "Moo": (1, 3), "Mar": (9, 28), "Mer": (5, 15), "Jup": (3, 5), "Ven": (11, 27), "Sat": (6, 20)}
+COMBUST_LIMITS = {"Moo": 12, "Mar": 17, "Mer": 14, "Jup": 11, "Ven": 10, "Sat": 15}
+
+OBJS = [("ASC", -1), ("Sun", 0), ("Moo", 1), ("Mar", 4), ("Mer", 2), ("Jup", 5), ("Ven", 3), ("Sat", 6), ("Rah", 11)]
+OUTER_OBJS = [("Ura", swe.URANUS), ("Nep", swe.NEPTUNE), ("Plu", swe.PLUTO)]
+FLAGS = swe.FLG_SWIEPH | swe.FLG_SIDEREAL | swe.FLG_SPEED
+NAK_W = 360 / 27
+
+DEFAULT_OPTIONS = {"outer": False, "vargas": True, "panchang": True, "dashas": True}
+
+
+# --- Formatting ---
+def format_time(hrs_float):
+    h = int(hrs_float) % 24
+    m = int(round((hrs_float - int(hrs_float)) * 60))
+    if m == 60: h = (h + 1) % 24; m = 0
+    return f"{h:02d}:{m:02d}"
+
+def format_dms(deg_float):
+    d = int(deg_float % 30); m = int((deg_float * 60) % 60); s = int((deg_float * 3600) % 60)
+    return f"{d:02d}°{m:02d}'{s:02d}\""
+
+
+# --- Planet attributes ---
+def get_planet_status(name, lon, speed, sun_lon):
+    if name == "ASC": return ""
+    status = []
+    is_retro = (name in ["Rah", "Ket"]) or (name not in ["Sun", "Moo"] and speed < 0)
+    if is_retro: status.append("↓")
+    if name not in ["Sun", "Rah", "Ket", "Ura", "Nep", "Plu"]:
+        diff = abs(lon - sun_lon); diff = 360 - diff if diff > 180 else diff
+        limit = COMBUST_LIMITS.get(name, 15.0)
+        if is_retro: limit = 12.0 if name == "Mer" else 8.0 if name == "Ven" else limit
+        if diff <= limit: status.append("*")
+    return "".join(status)
+
+def get_dignity_color(name, lon):
+    if name not in DIGNITIES: return "black"
+    sign_idx = int(lon/30); exalt_sign, _ = DIGNITIES[name]
+    if sign_idx == exalt_sign: return "green"
+    if sign_idx == (exalt_sign + 6) % 12: return "red"
+    return "black"
+
+def get_divisional_sign(lon, d_chart_val):
+    sign, rem = int(lon / 30), lon % 30
+    if d_chart_val == 2: return (4 if int(rem/15)==0 else 3) if sign%2==0 else (3 if int(rem/15)==0 else 4)
+    elif d_chart_val == 3: return (sign + int(rem/10)*4) % 12
+    elif d_chart_val == 4: return (sign + int(rem/7.5)*3) % 12
+    elif d_chart_val == 7: return (sign if sign%2==0 else (sign+6)%12 + int(rem/(30/7))) % 12
+    elif d_chart_val == 9: return int((lon*9)/30) % 12
+    elif d_chart_val == 10: return (sign if sign%2==0 else (sign+8)%12 + int(rem/3)) % 12
+    elif d_chart_val == 12: return (sign + int(rem/2.5)) % 12
+    elif d_chart_val == 16: return ((sign%3)*4 + int(rem/(30/16))) % 12
+    elif d_chart_val == 20: return ({0:0, 1:8, 2:4}[sign%3] + int(rem/1.5)) % 12
+    elif d_chart_val == 24: return ((4 if sign%2==0 else 3) + int(rem/1.25)) % 12
+    elif d_chart_val == 27: return ((sign%4)*3 + int(rem/(30/27))) % 12
+    elif d_chart_val == 30:
+        if sign%2==0: return 0 if rem<5 else 10 if rem<10 else 8 if rem<18 else 2 if rem<25 else 6
+        else: return 1 if rem<5 else 5 if rem<12 else 11 if rem<20 else 9 if rem<25 else 7
+    elif d_chart_val == 40: return ((0 if sign%2==0 else 6) + int(rem/0.75)) % 12
+    elif d_chart_val == 45: return ((sign%3)*4 + int(rem/(30/45))) % 12
+    elif d_chart_val == 60: return (sign + int(rem*2)) % 12
+    return sign
+
+def nakshatra_pada(lon):
+    n_idx = int(lon / NAK_W)
+    return n_idx, int(((lon/NAK_W)-n_idx)*4)+1
+
+
+# --- Panchang ---
+def karana_name(karana_idx):
+    return "Kintughna" if karana_idx == 0 else "Shakuni" if karana_idx == 57 else "Chatushpada" if karana_idx == 58 else "Naga" if karana_idx == 59 else KARANAS[(karana_idx - 1) % 7]
+
+def get_panchang_data(sun_lon, moon_lon, moon_speed, jd, curr_dt, lat, lon, tz):
+    tithi_idx = int((moon_lon - sun_lon) % 360 / 12)
+    yoga_idx = int((moon_lon + sun_lon) % 360 / 13.333333)
+    karana_idx = int((moon_lon - sun_lon) % 360 / 6)
+    k_name = karana_name(karana_idx)
+
+    sun_equ = EPHEMERIS.calc_ut(jd, swe.SUN, swe.FLG_SWIEPH | swe.FLG_EQUATORIAL)[0]
+    decl = sun_equ[1]
+    rad = math.pi / 180.0
+    lat_rad = lat * rad
+    decl_rad = decl * rad
+    alt_rad = -0.833 * rad
+    try:
+        cos_h = (math.sin(alt_rad) - math.sin(lat_rad) * math.sin(decl_rad)) / (math.cos(lat_rad) * math.cos(decl_rad))
+        cos_h = max(-1.0, min(1.0, cos_h))
+        h_hours = math.acos(cos_h) / rad / 15.0
+    except: h_hours = 6.0
+
+    day_dur = 2.0 * h_hours
+    night_dur = 24.0 - day_dur
+    lon_diff = lon - (tz * 15.0)
+    B = 360.0/365.24 * (curr_dt.timetuple().tm_yday - 81) * rad
+    eot_hours = (9.87 * math.sin(2*B) - 7.53 * math.cos(B) - 1.5 * math.sin(B)) / 60.0
+    local_noon = 12.0 - (lon_diff / 15.0) - eot_hours
+    sunrise_hrs = local_noon - h_hours
+    sunset_hrs = local_noon + h_hours
+
+    def format_pan_time(t):
+        if t < 0: t += 24.0
+        elif t >= 24.0: t -= 24.0
+        return format_time(t)
+
+    wd = curr_dt.weekday()
+    day_part = day_dur / 8.0
+
+    def get_kala(part_dict):
+        p = part_dict[wd]
+        s = sunrise_hrs + (p - 1) * day_part
+        return f"{format_pan_time(s)} - {format_pan_time(s + day_part)}"
+
+    muh_dur_day = day_dur / 15.0
+    muh_dur_night = night_dur / 15.0
+    abhijit_start = sunrise_hrs + 7 * muh_dur_day
+    abhijit = f"{format_pan_time(abhijit_start)} - {format_pan_time(abhijit_start + muh_dur_day)}"
+
+    dm_parts = {6: [(14, 'D')], 0: [(9, 'D'), (12, 'D')], 1: [(4, 'D'), (11, 'N')], 2: [(8, 'D')], 3: [(10, 'D'), (13, 'D')], 4: [(4, 'D'), (9, 'D')], 5: [(2, 'D')]}
+    dms = []
+    for p, dn in dm_parts[wd]:
+        ds = (sunrise_hrs + (p - 1) * muh_dur_day) if dn == 'D' else (sunset_hrs + (p - 1) * muh_dur_night)
+        dur = muh_dur_day if dn == 'D' else muh_dur_night
+        dms.append(f"{format_pan_time(ds)}-{format_pan_time(ds+dur)}")
+
+    nak_dur_hrs = 13.333333 / moon_speed * 24.0
+    v_start_ghati = VARJYAM_STARTS[int(moon_lon / 13.333333)]
+    entry_time = (curr_dt.hour + curr_dt.minute/60.0 + curr_dt.second/3600.0) - ((moon_lon % 13.333333) / moon_speed * 24.0)
+    v_time = entry_time + (v_start_ghati / 60.0) * nak_dur_hrs
+    v_dur = (4.0 / 60.0) * nak_dur_hrs
+    a_time = v_time + (24.0/60.0 * nak_dur_hrs)
+
+    return [
+        ("Sunrise", format_time(sunrise_hrs), "Sunset", format_time(sunset_hrs)),
+        ("Tithi", TITHIS[tithi_idx], "Rahu Kala", get_kala(RAHU_KALA_PARTS)),
+        ("Yoga", YOGAS[yoga_idx], "Yamaganda Kala", get_kala(YAMAGANDA_PARTS)),
+        ("Karana", k_name, "Gulika Kala", get_kala(GULIKA_PARTS)),
+        ("Day Duration", f"{int(day_dur)}h {int((day_dur%1)*60)}m", "Abhijit Muhurta", abhijit),
+        ("Night Duration", f"{int(night_dur)}h {int((night_dur%1)*60)}m", "Dur Muhurta", ", ".join(dms)),
+        ("Vishagatika (Varjyam)", f"{format_pan_time(v_time)} - {format_pan_time(v_time+v_dur)}", "Amrita Kala", f"{format_pan_time(a_time)} - {format_pan_time(a_time+v_dur)}")
+    ]
+
+
+# --- Vimshottari Dasha ---
+def get_precise_age(birth, event_date):
+    birth = datetime(birth.year, birth.month, birth.day)
+    if event_date <= birth: return "0y 0m 0d"
+
+    years = event_date.year - birth.year
+    months = event_date.month - birth.month
+    days = event_date.day - birth.day
+
+    if days < 0:
+        months -= 1
+        prev_month = event_date.month - 1 if event_date.month > 1 else 12
+        prev_year = event_date.year if event_date.month > 1 else event_date.year - 1
+        days += calendar.monthrange(prev_year, prev_month)[1]
+    if months < 0:
+        years -= 1
+        months += 12
+
+    return f"{years}y {months}m {days}d"
+
+# The timedelta-loop dashas below predate dasha.DashaTree and are kept only as the benchmark's reference.
+def calculate_mahadasha(moon_long, birth):
+    nak_idx = int(moon_long / NAK_W)
+    rem_frac = 1 - (moon_long % NAK_W) / NAK_W
+    lord = LORD_ORDER[nak_idx % 9]
+    used_days = DASHA_YEARS[lord] * (1 - rem_frac) * 365.25
+    curr_start = birth - timedelta(days=used_days)
+    periods = []
+    for i in range(9):
+        l = LORD_ORDER[(nak_idx + i) % 9]
+        end_date = curr_start + timedelta(days=DASHA_YEARS[l] * 365.25)
+        periods.append((l, curr_start, end_date))
+        curr_start = end_date
+    return periods
+
+def calculate_antardasha(lord, start):
+    periods = []
+    for i in range(9):
+        al = LORD_ORDER[(LORD_ORDER.index(lord) + i) % 9]
+        a_dur = (DASHA_YEARS[lord] * DASHA_YEARS[al]) / 120.0
+        a_end = start + timedelta(days=a_dur * 365.25)
+        periods.append((f"{lord}-{al}", start, a_end))
+        start = a_end
+    return periods
+
+def calculate_pratyantar(ml, al, start):
+    periods = []
+    for i in range(9):
+        pl = LORD_ORDER[(LORD_ORDER.index(al) + i) % 9]
+        p_dur = (DASHA_YEARS[ml] * DASHA_YEARS[al] * DASHA_YEARS[pl]) / 14400.0
+        p_end = start + timedelta(days=p_dur * 365.25)
+        periods.append((f"{al}-{pl}", start, p_end))
+        start = p_end
+    return periods
+
+
+# --- Chart computation ---
+def local_to_jd(curr_dt, tz):
+    utc_dt = curr_dt - timedelta(hours=tz)
+    return swe.julday(utc_dt.year, utc_dt.month, utc_dt.day, utc_dt.hour + utc_dt.minute/60.0 + utc_dt.second/3600.0)
+
+def jd_to_local(jd, tz):
+    y, m, d, h = swe.revjul(jd)
+    return datetime(y, m, d) + timedelta(hours=h + tz)
+
+def chart_objs(outer=False):
+    return OBJS + OUTER_OBJS if outer else list(OBJS)
+
+def _body(name, lon, speed, sun_lon, vargas):
+    n_idx, pada = nakshatra_pada(lon)
+    return {"name": name, "lon": lon, "speed": speed, "status": get_planet_status(name, lon, speed, sun_lon),
+            "dignity": get_dignity_color(name, lon), "sign": int(lon/30), "nakshatra": n_idx, "pada": pada,
+            "vargas": [get_divisional_sign(lon, d) for d in VARGAS] if vargas else None}
+
+def compute_chart(curr_dt, tz, lat, lon, options=None):
+    opts = dict(DEFAULT_OPTIONS, **(options or {}))
+    jd = local_to_jd(curr_dt, tz)
+    with PROFILER.stage("ephemeris"):
+        EPHEMERIS.set_sid_mode(swe.SIDM_LAHIRI)
+        sun_lon = EPHEMERIS.calc_ut(jd, 0, FLAGS)[0][0]
+        ascmc = EPHEMERIS.houses_ex(jd, lat, lon, b'A', FLAGS)[1]
+        positions = [(name, [ascmc[0], 0, 0, 0] if name == "ASC" else EPHEMERIS.calc_ut(jd, p_id, FLAGS)[0]) for name, p_id in chart_objs(opts["outer"])]
+    with PROFILER.stage("bodies"):
+        bodies, moon_long, moon_speed = [], 0.0, 0.0
+        for name, res in positions:
+            bodies.append(_body(name, res[0], res[3], sun_lon, opts["vargas"]))
+            if name == "Moo": moon_long, moon_speed = res[0], res[3]
+            if name == "Rah": bodies.append(_body("Ket", (res[0] + 180) % 360, res[3], sun_lon, opts["vargas"]))
+    chart = {"jd": jd, "asc": ascmc[0], "bodies": bodies}
+    if opts["panchang"]:
+        with PROFILER.stage("panchang"): chart["panchang"] = get_panchang_data(sun_lon, moon_long, moon_speed, jd, curr_dt, lat, lon, tz)
+    if opts["dashas"]:
+        from dasha import DashaTree  # dasha imports this module
+        with PROFILER.stage("dashas"): chart["dashas"] = [(p.name, f"{p.start_dt:%Y-%m-%d}", f"{p.end_dt:%Y-%m-%d}") for p in DashaTree(moon_long, curr_dt).mahas]
+    return chart
+
+def transit_positions(jd, objs, tables=None):
+    EPHEMERIS.set_sid_mode(swe.SIDM_LAHIRI)
+    out = []
+    for n, pid in objs:
+        if n == "ASC": continue
+        table = tables.get(n) if tables else None
+        r = float(table(jd)) if table is not None and table.covers(jd) else EPHEMERIS.calc_ut(jd, pid, FLAGS)[0][0]
+        out.append((n, r))
+        if n == "Rah": out.append(("Ket", (r + 180) % 360))
+    return out
+
+def transit_tables(jd_start, jd_end, objs):
+    EPHEMERIS.set_sid_mode(swe.SIDM_LAHIRI)
+    return {n: EPHEMERIS.daily_table(pid, jd_start, jd_end, FLAGS) for n, pid in objs if n != "ASC"}
+
+def parse_record(rec):
+    if isinstance(rec, dict):
+        dt = datetime(*[int(rec.get(k, 0)) for k in ("year", "month", "day", "hour", "minute", "second")])
+        return dt, float(rec["tz"]), float(rec["lat"]), float(rec["lon"])
+    return rec
+
+def compute_many(records, options=None):
+    from shodashvarga import shodashvarga
+    opts = dict(DEFAULT_OPTIONS, **(options or {}))
+    results = []
+    for rec in records:
+        curr_dt, tz, lat, lon = parse_record(rec)
+        results.append(compute_chart(curr_dt, tz, lat, lon, dict(opts, vargas=False)))
+    if opts["vargas"] and results:
+        bodies = [b for chart in results for b in chart["bodies"]]
+        for b, row in zip(bodies, shodashvarga([b["lon"] for b in bodies]).tolist()): b["vargas"] = row
+    return results
@@ -0,0 +1,156 @@
+import argparse
+import os
+import re
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+
+import chart_engine as eng
+import chart_render
+import tzdb
+from batch_cli import chunked, read_records
+
+TITLES = {1: "RASHI (D1)", **{d: label for label, d in eng.D_CHARTS.items()}}
+
+
+# --- Rendering ---
+def file_stem(name, i):
+    return re.sub(r"[^\w.-]+", "_", str(name or "")).strip("_.") or f"chart{i:06d}"
+
+def unique_stems(chunk, start, used):
+    # Names that sanitize alike ("A B", "A_B") would write the same file, so later ones get their row number.
+    stems = []
+    for i, rec in enumerate(chunk, start):
+        stem = file_stem(rec.get("name"), i)
+        if stem in used: stem = f"{stem}_{i:06d}"
+        used.add(stem); stems.append(stem)
+    return stems
+
+def render_chart(chart, d_val, style, transits=None, drishti=False):
+    # One varga of a computed chart as SVG, laid out exactly as in the app (D1 with DMS, vargas without).
+    bodies = chart["bodies"]
+    if d_val == 1: placements, asc_idx = chart_render.natal_placements(bodies), int(chart["asc"] / 30)
+    else: placements, asc_idx = chart_render.varga_placements(bodies, d_val), eng.get_divisional_sign(chart["asc"], d_val)
+    t = chart_render.transit_placements(transits, d_val) if transits else [[] for _ in range(12)]
+    return chart_render.SvgChartRenderer().draw(placements, t, asc_idx, TITLES[d_val], d_val == 1, style == "north", drishti)
+
+
+# --- Worker side: a chunk of records in, files on disk ---
+def export_chunk(chunk, stems, opts):
+    # SVGs are written here rather than shipped back; only counts, error and warning lines return.
+    written, errors = 0, []
+    good, idx = [], []
+    # Zone names in "tz" resolve as in `main.py batch`; clock-change times are read as standard time.
+    flags, unknown = tzdb.resolve_records(chunk)
+    warnings = [f"{chunk[i].get('name')}: {tzdb.FLAG_NAMES[f]} local time, resolved as UTC{chunk[i]['tz']:+g}" for i, f in flags.items()]
+    for i in unknown: errors.append(f"{chunk[i].get('name')}: bad record: unknown time zone {chunk[i]['tz']!r}")
+    for i, rec in enumerate(chunk):
+        if i in unknown: continue
+        try: good.append(eng.parse_record(rec)); idx.append(i)
+        except Exception as e: errors.append(f"{rec.get('name')}: bad record: {e}")
+    options = {"outer": opts["outer"], "panchang": False, "dashas": False}
+    try: charts = eng.compute_many(good, options)
+    except Exception:
+        charts = []
+        for r in good:
+            try: charts.append(eng.compute_many([r], options)[0])
+            except Exception as e: charts.append(e)
+    for i, chart in zip(idx, charts):
+        stem = stems[i]
+        if isinstance(chart, Exception): errors.append(f"{chunk[i].get('name')}: {chart}"); continue
+        try:
+            for d in opts["vargas"]:
+                svg = render_chart(chart, d, opts["style"], opts["transits"], opts["drishti"])
+                path = os.path.join(opts["out_dir"], f"{stem}_D{d}")
+                if opts["png"]:
+                    with open(path + ".png", "wb") as f: f.write(chart_render.svg_to_png(svg, opts["scale"]))
+                else:
+                    with open(path + ".svg", "w", encoding="utf-8") as f: f.write(svg)
+                written += 1
+        except (OSError, RuntimeError) as e: errors.append(f"{chunk[i].get('name')}: {e}")
+    return written, errors, warnings
+
+
+# --- Driver ---
+def run(records, opts, workers, chunk_size):
+    written, errors, n, used = 0, [], 0, set()
+    max_pending = max(2, workers * 2)
+
+    def collect(fut):
+        nonlocal written
+        w, errs, warns = fut.result()
+        written += w; errors.extend(errs)
+        for e in warns: print("warning: " + e, file=sys.stderr)
+        for e in errs: print(e, file=sys.stderr)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunked(records, chunk_size):
+            pending.append(pool.submit(export_chunk, chunk, unique_stems(chunk, n, used), opts)); n += len(chunk)
+            while len(pending) >= max_pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done: pending.remove(fut); collect(fut)
+        for fut in pending: collect(fut)
+    return n, written, errors
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="main.py export", description="Render charts of stored profiles or birth records to SVG (or PNG) files without the GUI.")
+    ap.add_argument("names", nargs="*", help="profiles to export")
+    ap.add_argument("--all", action="store_true", help="every profile in the store")
+    ap.add_argument("--input", help="CSV or JSONL birth records instead of the store")
+    ap.add_argument("--db", default="astro_profiles.db")
+    ap.add_argument("-o", "--out-dir", default="charts")
+    ap.add_argument("--vargas", default="1,9", help="charts per profile, e.g. 1,9,10")
+    ap.add_argument("--style", choices=["south", "north"], default="south")
+    ap.add_argument("--drishti", action="store_true", help="draw aspect lines")
+    ap.add_argument("--transits", nargs="?", const="now", help="overlay transits for a date (Y-M-D[THH:MM] UTC; default: now)")
+    ap.add_argument("--outer", action="store_true", help="include Uranus, Neptune and Pluto")
+    ap.add_argument("--png", action="store_true", help="write PNG instead of SVG (needs cairosvg)")
+    ap.add_argument("--scale", type=float, default=1.0, help="PNG scale factor")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--chunk-size", type=int, default=100, help="records per worker task")
+    args = ap.parse_args(argv)
+    if not (args.all or args.names or args.input): ap.error("give profile names, --all or --input")
+    try: vargas = [int(d) for d in args.vargas.upper().replace("D", "").split(",")]
+    except ValueError: ap.error(f"bad --vargas {args.vargas!r}")
+    if any(d not in eng.VARGAS for d in vargas): ap.error(f"--vargas must be among {', '.join(map(str, eng.VARGAS))}")
+    if args.png:
+        try: chart_render.svg_to_png(chart_render.SvgChartRenderer().frame(False, 0))
+        except RuntimeError as e: ap.error(str(e))
+
+    transits = None
+    if args.transits:
+        at = datetime.utcnow() if args.transits == "now" else datetime.fromisoformat(args.transits)
+        transits = eng.transit_positions(eng.local_to_jd(at, 0), eng.chart_objs(args.outer))
+    opts = {"vargas": vargas, "style": args.style, "drishti": args.drishti, "transits": transits, "outer": args.outer,
+            "png": args.png, "scale": args.scale, "out_dir": args.out_dir}
+    os.makedirs(args.out_dir, exist_ok=True)
+
+    store = fin = None
+    missing = []
+    if args.input:
+        fin = open(args.input, newline="", encoding="utf-8")
+        records = read_records(fin, "csv" if args.input.lower().endswith(".csv") else "jsonl")
+    else:
+        from profile_store import open_store
+        store = open_store(args.db)
+        if args.all: records = store.iter_profiles()
+        else:
+            records = [r for r in map(store.get, args.names) if r is not None]
+            missing = [n for n in args.names if store.get(n) is None]
+            for name in missing: print(f"no profile named {name!r}", file=sys.stderr)
+    t0 = time.perf_counter()
+    try: n, written, errors = run(records, opts, max(1, args.workers), max(1, args.chunk_size))
+    finally:
+        if fin: fin.close()
+        if store: store.close()
+    elapsed = time.perf_counter() - t0
+    errors += missing
+    print(f"{n} profiles, {written} charts ({len(errors)} errors) in {elapsed:.2f}s - {written / elapsed if elapsed else 0:.0f} charts/s -> {args.out_dir}", file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
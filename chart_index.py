@@ -0,0 +1,277 @@
+import argparse
+import os
+import re
+import sys
+
+import numpy as np
+
+import chart_engine as eng
+
+BODIES = ["ASC", "Sun", "Moo", "Mar", "Mer", "Jup", "Ven", "Sat", "Rah", "Ket", "Ura", "Nep", "Plu"]
+ALIASES = {"lagna": "ASC", "asc": "ASC", **{n.lower(): n for n in BODIES},
+           **{full: n for full, n in [("moon", "Moo"), ("mars", "Mar"), ("mercury", "Mer"), ("jupiter", "Jup"), ("venus", "Ven"),
+                                      ("saturn", "Sat"), ("rahu", "Rah"), ("ketu", "Ket"), ("uranus", "Ura"), ("neptune", "Nep"), ("pluto", "Plu")]}}
+DIGNITY = {"green": 1, "red": -1}  # get_dignity_color: exalted, debilitated; anything else is 0
+DIGNITY_WORDS = {"exalted": 1, "debilitated": -1, "neutral": 0}
+CHUNK = 1000
+
+
+# --- Columnar store ---
+# One row per profile and one column block per attribute, each (rows, bodies) and a few bytes wide;
+# about 350 bytes a chart. Deleted rows are filled from the last row, so the columns stay dense.
+class ChartIndex:
+    COLUMNS = {"lon": np.float32, "nak": np.int8, "pada": np.int8, "retro": np.bool_, "combust": np.bool_, "dignity": np.int8}
+
+    def __init__(self, path):
+        self.path = path
+        self.names, self.rows, self.n = [], {}, 0
+        self.dirty = False
+        self._alloc(1024)
+        if os.path.exists(path):
+            with np.load(path) as z:
+                names = z["names"].tolist()
+                self._alloc(max(1024, len(names)))
+                for k in ("key", "vargas", *self.COLUMNS): getattr(self, k)[:len(names)] = z[k]
+            self.names, self.n = names, len(names)
+            self.rows = {name: i for i, name in enumerate(self.names)}
+
+    @classmethod
+    def for_store(cls, store):
+        return cls(os.path.splitext(store.path)[0] + ".positions.npz")
+
+    def _alloc(self, cap):
+        # (Re)size every column to cap rows, keeping the first n.
+        def grow(old, shape, dtype):
+            new = np.zeros((cap,) + shape, dtype=dtype)
+            if old is not None: new[:self.n] = old[:self.n]
+            return new
+        b = len(BODIES)
+        self.key = grow(getattr(self, "key", None), (3,), np.float64)  # jd, lat, lon: a change in any of them means a new chart
+        self.vargas = grow(getattr(self, "vargas", None), (b, len(eng.VARGAS)), np.int8)
+        for k, dtype in self.COLUMNS.items(): setattr(self, k, grow(getattr(self, k, None), (b,), dtype))
+        self.cap = cap
+
+    def __len__(self): return self.n
+
+    def nbytes(self):
+        return sum(getattr(self, k)[:self.n].nbytes for k in ("key", "vargas", *self.COLUMNS))
+
+    # --- Writes ---
+    def _put(self, name, key, chart):
+        i = self.rows.get(name)
+        if i is None:
+            if self.n >= self.cap: self._alloc(self.cap * 2)
+            i = self.rows[name] = self.n; self.names.append(name); self.n += 1
+        self.key[i] = key
+        for j, b in enumerate(chart["bodies"]):
+            self.lon[i, j], self.nak[i, j], self.pada[i, j] = b["lon"], b["nakshatra"], b["pada"]
+            self.retro[i, j], self.combust[i, j] = "↓" in b["status"], "*" in b["status"]
+            self.dignity[i, j] = DIGNITY.get(b["dignity"], 0)
+            self.vargas[i, j] = b["vargas"]
+        self.dirty = True
+
+    def update(self, data):
+        # Called after a profile is saved.
+        try: rec = eng.parse_record(data)
+        except (KeyError, TypeError, ValueError): return self.remove(data.get("name"))
+        self._put(data["name"], _key(rec), eng.compute_many([rec], {"outer": True, "panchang": False, "dashas": False})[0])
+
+    def remove(self, name):
+        i = self.rows.pop(name, None)
+        if i is None: return False
+        last = self.n - 1
+        if i != last:
+            for k in ("key", "vargas", *self.COLUMNS):
+                col = getattr(self, k); col[i] = col[last]
+            self.names[i] = self.names[last]; self.rows[self.names[i]] = i
+        self.names.pop(); self.n -= 1
+        self.dirty = True
+        return True
+
+    def refresh(self, store, workers=1):
+        # Brings the index in line with the store, computing only new or changed charts.
+        seen, todo = set(), []
+        for d in store.iter_profiles():
+            try: rec = eng.parse_record(d)
+            except (KeyError, TypeError, ValueError): continue
+            name, key = d["name"], _key(rec)
+            seen.add(name)
+            i = self.rows.get(name)
+            if i is None or tuple(self.key[i]) != key: todo.append((name, key, rec))
+        for name in [n for n in self.names if n not in seen]: self.remove(name)
+        todo.sort(key=lambda t: t[1][0])  # nearby dates share ephemeris file reads
+        chunks = [todo[s:s + CHUNK] for s in range(0, len(todo), CHUNK)]
+        if workers > 1 and len(chunks) > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for chunk, charts in zip(chunks, pool.map(_compute, [[r for _, _, r in c] for c in chunks])):
+                    for (name, key, _), chart in zip(chunk, charts): self._put(name, key, chart)
+        else:
+            for chunk in chunks:
+                for (name, key, _), chart in zip(chunk, _compute([r for _, _, r in chunk])): self._put(name, key, chart)
+        self.flush()
+        return len(todo)
+
+    def flush(self):
+        if not self.dirty: return
+        tmp = self.path + ".tmp.npz"
+        np.savez(tmp, names=np.array(self.names, dtype=str), **{k: getattr(self, k)[:self.n] for k in ("key", "vargas", *self.COLUMNS)})
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+    # --- Reads ---
+    def column(self, body, attr="sign", varga=1):
+        j = BODIES.index(body)
+        if attr == "sign": return self.vargas[:self.n, j, eng.VARGAS.index(varga)]
+        if attr == "dignity" and varga != 1:
+            if body not in eng.DIGNITIES: return np.zeros(self.n, dtype=np.int8)
+            s, ex = self.vargas[:self.n, j, eng.VARGAS.index(varga)], eng.DIGNITIES[body][0]
+            return np.where(s == ex, 1, np.where(s == (ex + 6) % 12, -1, 0)).astype(np.int8)
+        if varga != 1: raise QueryError(f"{attr} is only indexed for D1")
+        if attr == "deg": return self.lon[:self.n, j] % 30
+        return getattr(self, attr)[:self.n, j]
+
+    def query(self, expr):
+        return sorted(self.names[i] for i in np.flatnonzero(self.mask(expr)))
+
+    def mask(self, expr):
+        return Query(expr, self).parse()
+
+def _key(rec):
+    dt, tz, lat, lon = rec
+    return (eng.local_to_jd(dt, tz), lat, lon)
+
+def _compute(recs):
+    return eng.compute_many(recs, {"outer": True, "panchang": False, "dashas": False})
+
+
+# --- Query language ---
+# Predicates on <body>[.D<n>][.<attribute>], combined with and / or / not and parentheses:
+#   Moo.nak = Rohini and Jup.D9.dignity = exalted
+#   Sat.combust and Sat.sign = Capricorn
+#   Mar.D9 in (Aries, Scorpio) and not Mar.retro
+#   Moo.deg >= 10 and Moo.deg < 20
+# Attributes: sign (the default), nak, pada, lon, deg, retro, combust, dignity. Sign and nakshatra
+# names match case-insensitively and by unique prefix; quote names containing spaces or use no spaces.
+class QueryError(ValueError): pass
+
+TOKEN = re.compile(r"\s*(?:(\"[^\"]*\"|'[^']*')|(<=|>=|!=|==|=|<|>|\(|\)|,)|([A-Za-z_][\w.]*|-?\d+(?:\.\d+)?))")
+ATTRS = ("sign", "nak", "pada", "lon", "deg", "retro", "combust", "dignity")
+OPS = {"=": np.equal, "==": np.equal, "!=": np.not_equal, "<": np.less, "<=": np.less_equal, ">": np.greater, ">=": np.greater_equal}
+
+def _lookup(word, names, what):
+    key = word.lower().replace(" ", "").replace("_", "")
+    norm = [n.lower().replace(" ", "") for n in names]
+    if key in norm: return norm.index(key)
+    hits = [i for i, n in enumerate(norm) if n.startswith(key)]
+    if len(hits) == 1: return hits[0]
+    raise QueryError(f"unknown {what} {word!r}" if not hits else f"ambiguous {what} {word!r}: " + ", ".join(names[i] for i in hits))
+
+class Query:
+    def __init__(self, text, index):
+        self.index, self.tokens, self.pos = index, [], 0
+        text = text.strip()
+        while self.pos < len(text):
+            m = TOKEN.match(text, self.pos)
+            if not m or m.end() == self.pos: raise QueryError(f"cannot parse at {text[self.pos:]!r}")
+            self.tokens.append(m.group(1)[1:-1] if m.group(1) else m.group(2) or m.group(3)); self.pos = m.end()
+        self.pos = 0
+
+    def peek(self): return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def take(self, expected=None):
+        tok = self.peek()
+        if tok is None or (expected and tok.lower() != expected): raise QueryError(f"expected {expected or 'more input'}, got {tok!r}")
+        self.pos += 1
+        return tok
+
+    def parse(self):
+        if not self.tokens: return np.ones(self.index.n, dtype=bool)
+        mask = self.expr()
+        if self.peek() is not None: raise QueryError(f"unexpected {self.peek()!r}")
+        return mask
+
+    def expr(self):
+        mask = self.term()
+        while (self.peek() or "").lower() == "or": self.take(); mask = mask | self.term()
+        return mask
+
+    def term(self):
+        mask = self.factor()
+        while (self.peek() or "").lower() == "and": self.take(); mask = mask & self.factor()
+        return mask
+
+    def factor(self):
+        tok = self.peek()
+        if tok is None: raise QueryError("query ends early")
+        if tok.lower() == "not": self.take(); return ~self.factor()
+        if tok == "(":
+            self.take(); mask = self.expr(); self.take(")")
+            return mask
+        return self.predicate()
+
+    def predicate(self):
+        body, varga, attr = self.field(self.take())
+        col = self.index.column(body, attr, varga)
+        op = self.peek()
+        if attr in ("retro", "combust") and op not in OPS: return col.copy()
+        if op is not None and op.lower() == "in":
+            self.take(); self.take("(")
+            values = [self.value(attr, self.take())]
+            while self.peek() == ",": self.take(); values.append(self.value(attr, self.take()))
+            self.take(")")
+            return np.isin(col, values)
+        if op not in OPS: raise QueryError(f"expected a comparison after {body}{'.D%d' % varga if varga != 1 else ''}.{attr}, got {op!r}")
+        self.take()
+        return OPS[op](col, self.value(attr, self.take()))
+
+    def field(self, tok):
+        parts = tok.split(".")
+        body = ALIASES.get(parts[0].lower())
+        if body is None: raise QueryError(f"unknown body {parts[0]!r}")
+        varga, attr = 1, "sign"
+        for p in parts[1:]:
+            if re.fullmatch(r"[dD]\d+", p):
+                varga = int(p[1:])
+                if varga not in eng.VARGAS: raise QueryError(f"unknown varga {p}")
+            elif p.lower() in ATTRS: attr = p.lower()
+            else: raise QueryError(f"unknown attribute {p!r}; one of {', '.join(ATTRS)}")
+        return body, varga, attr
+
+    def value(self, attr, tok):
+        if attr in ("lon", "deg"):
+            try: return float(tok)
+            except ValueError: raise QueryError(f"{attr} takes a number, got {tok!r}") from None
+        if attr in ("retro", "combust"): return tok.lower() in ("true", "1", "yes")
+        if attr == "dignity":
+            if tok.lower() not in DIGNITY_WORDS: raise QueryError(f"dignity is one of {', '.join(DIGNITY_WORDS)}")
+            return DIGNITY_WORDS[tok.lower()]
+        if tok.isdigit():  # 1-based, as printed in the tables
+            return int(tok) if attr == "pada" else int(tok) - 1
+        if attr == "sign": return _lookup(tok, eng.SIGNS, "sign")
+        if attr == "nak": return _lookup(tok, eng.NAKSHATRAS, "nakshatra")
+        raise QueryError(f"{attr} takes a number, got {tok!r}")
+
+
+def main(argv=None):
+    from profile_store import open_store
+    ap = argparse.ArgumentParser(prog="main.py query", description="Query the position index of all stored profiles, e.g. \"Moo.nak = Rohini and Jup.D9.dignity = exalted\".")
+    ap.add_argument("expr")
+    ap.add_argument("--db", default="astro_profiles.db")
+    ap.add_argument("--count", action="store_true", help="print only the number of matching profiles")
+    ap.add_argument("--workers", type=int, default=1, help="processes used to compute missing charts")
+    args = ap.parse_args(argv)
+
+    store = open_store(args.db)
+    index = ChartIndex.for_store(store)
+    computed = index.refresh(store, args.workers)
+    if computed: print(f"{computed} charts indexed", file=sys.stderr)
+    try: names = index.query(args.expr)
+    except QueryError as e: print(f"query error: {e}", file=sys.stderr); return 2
+    if args.count: print(len(names))
+    else: print("\n".join(names))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,200 @@
+from functools import lru_cache
+from xml.sax.saxutils import escape
+
+import chart_engine as eng
+
+# --- Chart layout (shared by every rendering backend) ---
+SIZE = 500
+CELL = 125
+SOUTH_GRID = {11:(0,0), 0:(1,0), 1:(2,0), 2:(3,0), 10:(0,1), 3:(3,1), 9:(0,2), 4:(3,2), 8:(0,3), 7:(1,3), 6:(2,3), 5:(3,3)}
+NORTH_CENTERS = [(250,125), (125,62.5), (62.5,125), (125,250), (62.5,375), (125,437.5), (250,375), (375,437.5), (437.5,375), (375,250), (437.5,125), (375,62.5)]
+NORTH_LINES = [(0, 0, 500, 500), (500, 0, 0, 500), (250, 0, 500, 250), (500, 250, 250, 500), (250, 500, 0, 250), (0, 250, 250, 0)]
+ASPECTS = {"Mar":[3,6,7], "Jup":[4,6,8], "Sat":[2,6,9], "Rah":[4,6,8], "Ket":[4,6,8], "Sun":[6], "Moo":[6], "Ven":[6], "Mer":[6]}
+ASPECT_COLORS = {"Mar":"red", "Jup":"#DAA520", "Sat":"blue", "Rah":"brown", "Ket":"brown", "Sun":"orange", "Moo":"gray", "Ven":"magenta", "Mer":"green"}
+ASC_FILL = "#f1f8e9"
+TITLE_FONT = ("Arial", 12, "bold")
+NAME_FONT = ("Arial", 8, "bold")
+DMS_FONT = ("Arial", 7)
+SIGN_NO_FONT = ("Arial", 8)
+
+
+def natal_placements(bodies):
+    # Per-sign lists of (label, DMS, dignity colour): D1 shows every body's DMS, a varga only the lagna's.
+    p = [[] for _ in range(12)]
+    for b in bodies: p[b["sign"]].append((f"{b['name']}{b['status']}", eng.format_dms(b["lon"]), b["dignity"]))
+    return p
+
+def varga_placements(bodies, d_val):
+    p, d_pos = [[] for _ in range(12)], eng.VARGAS.index(d_val)
+    for b in bodies: p[b["vargas"][d_pos]].append((f"{b['name']}{b['status']}", eng.format_dms(b["lon"]) if b["name"] == "ASC" else "", b["dignity"]))
+    return p
+
+def transit_placements(positions, d_val=1):
+    p = [[] for _ in range(12)]
+    for n, lon in positions: p[eng.get_divisional_sign(lon, d_val)].append((f"T-{n}", "", "darkorange"))
+    return p
+
+def get_sign_center(is_n, s_idx, a_idx):
+    if not is_n:
+        c, r = SOUTH_GRID[s_idx]
+        return (c*CELL + 62.5, r*CELL + 62.5)
+    return NORTH_CENTERS[(s_idx - a_idx) % 12]
+
+def cell_fills(asc_idx):
+    return ["white" if i != asc_idx else ASC_FILL for i in range(12)]
+
+def sign_numbers(asc_idx):
+    return [(cx, cy - 30, str(si + 1)) for si in range(12) for cx, cy in [get_sign_center(True, si, asc_idx)]]
+
+def label_specs(placements, transits, asc_idx, is_n, show_dms):
+    # (x, y, text, font, fill) for every planet/transit label and its DMS line.
+    specs = []
+    for si in range(12):
+        cx, cy = get_sign_center(is_n, si, asc_idx)
+        for j, (n, d, col) in enumerate(placements[si] + transits[si]):
+            y_off = (cy - 45 + (j*14)) if is_n else (SOUTH_GRID[si][1]*CELL + 15 + (j*(22 if show_dms else 16)))
+            specs.append((cx, y_off, n, NAME_FONT, col))
+            if d and show_dms: specs.append((cx, y_off + 10, d, DMS_FONT, "#555555"))
+    return specs
+
+def drishti_lines(placements, asc_idx, is_n):
+    # (x1, y1, x2, y2, colour) for every aspect cast from an occupied sign, without duplicates.
+    lines = []
+    for si in range(12):
+        for n, _, _ in placements[si]:
+            bn = n[:3]
+            for off in ASPECTS.get(bn, []):
+                x1, y1 = get_sign_center(is_n, si, asc_idx); x2, y2 = get_sign_center(is_n, (si+off)%12, asc_idx)
+                line = (x1, y1, x2, y2, ASPECT_COLORS.get(bn, "#eee"))
+                if line not in lines: lines.append(line)
+    return lines
+
+
+# --- Retained-mode Tk backend ---
+# Static layers are built once per style and shown/hidden; labels come from a pool of
+# text items that are moved and re-texted; aspect lines are diffed against the last frame.
+class TkChartRenderer:
+    def __init__(self, can):
+        self.can = can
+        self.style = None
+        self.static = {}
+        self.cells, self.fills = [], []
+        self.title = self.title_text = None
+        self.sign_nos, self.sign_no_specs = [], None
+        self.labels, self.label_specs = [], []
+        self.lines = {}
+        self.created = 0
+        self.frame_created = 0
+
+    def _create(self, kind, *args, **kw):
+        self.created += 1; self.frame_created += 1
+        return getattr(self.can, "create_" + kind)(*args, **kw)
+
+    def _show(self, ids, visible):
+        for i in ids: self.can.itemconfig(i, state="normal" if visible else "hidden")
+
+    def _build_static(self, is_n):
+        key = "north" if is_n else "south"
+        if key not in self.static:
+            if is_n:
+                ids = [self._create("rectangle", 0, 0, SIZE, SIZE, fill="white", outline="black", tags=("static",))]
+                ids += [self._create("line", *ln, tags=("static",)) for ln in NORTH_LINES]
+            else:
+                self.cells = [self._create("rectangle", c*CELL, r*CELL, (c+1)*CELL, (r+1)*CELL, fill="white", outline="#cccccc", tags=("static",))
+                              for c, r in (SOUTH_GRID[i] for i in range(12))]
+                self.fills = ["white"] * 12
+                ids = list(self.cells)
+            self.static[key] = ids
+            self.can.tag_lower("static")
+        if self.style != key:
+            for k, ids in self.static.items(): self._show(ids, k == key)
+            self._show(self.sign_nos, is_n)
+            self.style = key
+
+    def draw(self, placements, transits, asc_idx, title, show_dms=False, is_n=False, drishti=False):
+        self.frame_created = 0
+        can = self.can
+        self._build_static(is_n)
+        if not is_n:
+            for i, fill in enumerate(cell_fills(asc_idx)):
+                if self.fills[i] != fill: can.itemconfig(self.cells[i], fill=fill); self.fills[i] = fill
+
+        if self.title is None: self.title = self._create("text", SIZE/2, SIZE/2, text=title, font=TITLE_FONT, fill="darkblue")
+        elif self.title_text != title: can.itemconfig(self.title, text=title)
+        self.title_text = title
+
+        want = {ln: None for ln in drishti_lines(placements, asc_idx, is_n)} if drishti else {}
+        for ln in [ln for ln in self.lines if ln not in want]: can.delete(self.lines.pop(ln))
+        added = False
+        for ln in want:
+            if ln not in self.lines:
+                self.lines[ln] = self._create("line", *ln[:4], fill=ln[4], dash=(2, 2), tags=("drishti",)); added = True
+
+        if is_n:
+            specs = sign_numbers(asc_idx)
+            if not self.sign_nos:
+                self.sign_nos = [self._create("text", x, y, text=t, font=SIGN_NO_FONT, fill="gray", tags=("signno",)) for x, y, t in specs]
+            elif specs != self.sign_no_specs:
+                for i, (x, y, t) in enumerate(specs): can.coords(self.sign_nos[i], x, y); can.itemconfig(self.sign_nos[i], text=t)
+            self.sign_no_specs = specs
+
+        specs = label_specs(placements, transits, asc_idx, is_n, show_dms)
+        for i, spec in enumerate(specs):
+            x, y, text, font, fill = spec
+            if i < len(self.labels):
+                old = self.label_specs[i]
+                if old is None: can.itemconfig(self.labels[i], state="normal")
+                if old is None or old[:2] != spec[:2]: can.coords(self.labels[i], x, y)
+                if old is None or old[2:] != spec[2:]: can.itemconfig(self.labels[i], text=text, font=font, fill=fill)
+                self.label_specs[i] = spec
+            else:
+                self.labels.append(self._create("text", x, y, text=text, font=font, fill=fill, tags=("label",))); self.label_specs.append(spec)
+        for i in range(len(specs), len(self.labels)):
+            if self.label_specs[i] is not None: can.itemconfig(self.labels[i], state="hidden"); self.label_specs[i] = None
+        if added: can.tag_raise("label")
+        return self.frame_created
+
+
+# --- Headless SVG backend ---
+# A chart's frame (grid or diamond, lagna cell, house sign numbers) depends only on the style and
+# the lagna sign, so each of the 24 frames is rendered once per process and every chart adds
+# only its title, aspect lines and labels. Tk font sizes are points; SVG sizes are pixels at 96 dpi.
+@lru_cache(maxsize=None)
+def _font(font):
+    family, size, *style = font
+    return f'font-family="{family}" font-size="{size * 4 / 3:.4g}"' + (' font-weight="bold"' if "bold" in style else "")
+
+def _svg_text(x, y, text, font, fill):
+    return f'<text x="{x:g}" y="{y:g}" {_font(font)} fill="{fill}" text-anchor="middle" dominant-baseline="central">{escape(text)}</text>'
+
+class SvgChartRenderer:
+    frames = {}
+
+    def frame(self, is_n, asc_idx):
+        svg = self.frames.get((is_n, asc_idx))
+        if svg is None:
+            parts = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{SIZE}" height="{SIZE}" viewBox="0 0 {SIZE} {SIZE}">']
+            if is_n:
+                parts.append(f'<rect x="0" y="0" width="{SIZE}" height="{SIZE}" fill="white" stroke="black"/>')
+                parts += [f'<line x1="{x1:g}" y1="{y1:g}" x2="{x2:g}" y2="{y2:g}" stroke="black"/>' for x1, y1, x2, y2 in NORTH_LINES]
+                parts += [_svg_text(x, y, t, SIGN_NO_FONT, "gray") for x, y, t in sign_numbers(asc_idx)]
+            else:
+                parts += [f'<rect x="{c*CELL}" y="{r*CELL}" width="{CELL}" height="{CELL}" fill="{fill}" stroke="#cccccc"/>'
+                          for fill, (c, r) in zip(cell_fills(asc_idx), (SOUTH_GRID[i] for i in range(12)))]
+            svg = self.frames[is_n, asc_idx] = "\n".join(parts)
+        return svg
+
+    def draw(self, placements, transits, asc_idx, title, show_dms=False, is_n=False, drishti=False):
+        # Same arguments as TkChartRenderer.draw; returns the SVG document.
+        out = [self.frame(is_n, asc_idx), _svg_text(SIZE/2, SIZE/2, title, TITLE_FONT, "darkblue")]
+        if drishti:
+            out += [f'<line x1="{x1:g}" y1="{y1:g}" x2="{x2:g}" y2="{y2:g}" stroke="{col}" stroke-dasharray="2,2"/>'
+                    for x1, y1, x2, y2, col in drishti_lines(placements, asc_idx, is_n)]
+        out += [_svg_text(*spec) for spec in label_specs(placements, transits, asc_idx, is_n, show_dms)]
+        out.append("</svg>\n")
+        return "\n".join(out)
+
+def svg_to_png(svg, scale=1.0):
+    try: import cairosvg
+    except ImportError: raise RuntimeError("PNG output needs cairosvg (pip install cairosvg)") from None
+    return cairosvg.svg2png(bytestring=svg.encode("utf-8"), scale=scale)
@@ -0,0 +1,122 @@
+from bisect import bisect_right
+from datetime import datetime, timedelta
+
+from chart_engine import LORD_ORDER, DASHA_YEARS, NAK_W
+
+LEVELS = ("Mahadasha", "Antardasha", "Pratyantar", "Sookshma", "Prana")
+YEAR = 365.25
+CYCLE = 120.0
+YEARS = [DASHA_YEARS[l] for l in LORD_ORDER]
+# CUM[i][k]: fraction of a period elapsed before its k-th sub-period, when the sub-periods start at lord i.
+CUM = [[sum(YEARS[(i + j) % 9] for j in range(k)) / CYCLE for k in range(10)] for i in range(9)]
+
+
+# --- Interval tree ---
+# Times are float days from the birth instant. Every period splits into nine sub-periods in the
+# Vimshottari proportions, starting from its own lord; children are only built when first asked for.
+class Period:
+    __slots__ = ("tree", "lord", "level", "start", "end", "parent", "_children", "_starts")
+
+    def __init__(self, tree, lord, level, start, end, parent=None):
+        self.tree, self.lord, self.level, self.start, self.end, self.parent = tree, lord, level, start, end, parent
+        self._children = self._starts = None
+
+    @property
+    def name(self): return LORD_ORDER[self.lord]
+
+    @property
+    def label(self):
+        # Matches the Treeview labels: the Maha lord alone, otherwise "<parent lord>-<lord>".
+        return self.name if self.level == 0 else f"{self.parent.name}-{self.name}"
+
+    @property
+    def lords(self):
+        p, out = self, []
+        while p.level >= 0: out.append(p.name); p = p.parent
+        return out[::-1]
+
+    @property
+    def start_dt(self): return self.tree.to_datetime(self.start)
+
+    @property
+    def end_dt(self): return self.tree.to_datetime(self.end)
+
+    @property
+    def children(self):
+        if self._children is None:
+            if self.level + 1 >= self.tree.depth: self._children = []
+            else:
+                dur, cum = self.end - self.start, CUM[self.lord]
+                self._children = [Period(self.tree, (self.lord + k) % 9, self.level + 1, self.start + dur*cum[k],
+                                         self.end if k == 8 else self.start + dur*cum[k+1], self) for k in range(9)]
+            self._starts = [c.start for c in self._children]
+        return self._children
+
+    def child_at(self, t):
+        kids = self.children
+        if not kids or not self.start <= t < self.end: return None
+        return kids[max(0, bisect_right(self._starts, t) - 1)]
+
+    def __repr__(self):
+        return f"<{LEVELS[self.level]} {'-'.join(self.lords)} {self.start_dt:%Y-%m-%d} - {self.end_dt:%Y-%m-%d}>"
+
+
+class DashaTree:
+    def __init__(self, moon_long, birth, depth=5):
+        self.birth, self.depth = birth, depth
+        first = int(moon_long / NAK_W) % 9
+        self.start = -YEARS[first] * ((moon_long % NAK_W) / NAK_W) * YEAR
+        # The 120-year cycle is the root (level -1); its children are the nine Mahadashas.
+        self.root = Period(self, first, -1, self.start, self.start + CYCLE*YEAR)
+
+    def to_days(self, when):
+        return (when - self.birth).total_seconds() / 86400.0 if isinstance(when, datetime) else float(when)
+
+    def to_datetime(self, days):
+        return self.birth + timedelta(days=days)
+
+    def periods(self, *lords):
+        # Sub-periods under a path of lords, e.g. periods() -> Mahas, periods("Rahu") -> its Antars.
+        node = self.root
+        for name in lords:
+            node = next((c for c in node.children if c.name == name), None)
+            if node is None: raise KeyError("-".join(lords))
+        return node.children
+
+    @property
+    def mahas(self):
+        return self.root.children
+
+    def at(self, when, depth=None):
+        # Running period at every level, Maha first; empty outside the 120-year cycle.
+        t, out, node = self.to_days(when), [], self.root
+        for _ in range(depth or self.depth):
+            node = node.child_at(t)
+            if node is None: break
+            out.append(node)
+        return out
+
+    def at_many(self, whens, depth=None):
+        # Lord indices (into LORD_ORDER) running at each timestamp, shape (n, depth); -1 outside the cycle.
+        # Accepts datetimes, numpy datetime64 values or float days from birth.
+        import numpy as np
+        depth = depth or self.depth
+        t = np.asarray(whens)
+        if t.dtype.kind == "M": t = (t.astype("datetime64[us]") - np.datetime64(self.birth, "us")) / np.timedelta64(1, "D")
+        elif t.dtype == object: t = np.array([self.to_days(w) for w in t.ravel()]).reshape(t.shape)
+        t = t.astype(float).ravel()
+        cum = np.array(CUM)
+        out = np.full((t.size, depth), -1, dtype=np.int8)
+        start, dur = np.full(t.size, self.start), np.full(t.size, CYCLE*YEAR)
+        inside = (t >= start) & (t < start + dur)
+        lord = np.full(t.size, self.root.lord)
+        for level in range(depth):
+            c = cum[lord]                                  # (n, 10) boundaries of this level's sub-periods
+            frac = np.clip((t - start) / dur, 0.0, np.nextafter(1.0, 0))
+            k = np.clip((frac[:, None] >= c[:, 1:9]).sum(1), 0, 8)
+            sub = (lord + k) % 9
+            start = start + dur * c[np.arange(t.size), k]
+            dur = dur * np.array(YEARS)[sub] / CYCLE
+            out[inside, level] = sub[inside]
+            lord = sub
+        return out.reshape(np.shape(whens) + (depth,)) if np.ndim(whens) else out[0]
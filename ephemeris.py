@@ -0,0 +1,92 @@
+import math
+import threading
+from collections import OrderedDict
+
+import swisseph as swe
+
+
+# --- Memoizing access layer over swe.calc_ut / swe.houses_ex ---
+class Ephemeris:
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.hits = self.misses = 0
+        self.sid_mode = None
+        self._cache = OrderedDict()
+        self._lock = threading.RLock()
+
+    def set_sid_mode(self, mode):
+        with self._lock:
+            if mode != self.sid_mode:
+                swe.set_sid_mode(mode, 0, 0); self.sid_mode = mode
+
+    def _key(self, kind, jd, arg, flags):
+        return (kind, jd, arg, flags, self.sid_mode if flags & swe.FLG_SIDEREAL else None)
+
+    def _lookup(self, key, compute):
+        with self._lock:
+            res = self._cache.get(key)
+            if res is not None:
+                self._cache.move_to_end(key); self.hits += 1
+                return res
+            self.misses += 1
+            res = compute()
+            self._cache[key] = res
+            if len(self._cache) > self.maxsize: self._cache.popitem(last=False)
+            return res
+
+    def calc_ut(self, jd, body, flags):
+        return self._lookup(self._key("calc", jd, body, flags), lambda: swe.calc_ut(jd, body, flags))
+
+    def houses_ex(self, jd, lat, lon, hsys, flags):
+        return self._lookup(self._key("houses", jd, (lat, lon, hsys), flags), lambda: swe.houses_ex(jd, lat, lon, hsys, flags))
+
+    def raw_calc_ut(self, jd, body, flags):
+        with self._lock: return swe.calc_ut(jd, body, flags)
+
+    def raw_houses_ex(self, jd, lat, lon, hsys, flags):
+        with self._lock: return swe.houses_ex(jd, lat, lon, hsys, flags)
+
+    def rise_trans(self, jd, body, rsmi, lat, lon, alt=0.0):
+        with self._lock: return swe.rise_trans(jd, body, rsmi, (lon, lat, alt))
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._cache), "hit_rate": self.hits / total if total else 0.0}
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear(); self.hits = self.misses = 0
+
+    def daily_table(self, body, jd_start, jd_end, flags, order=6):
+        return DailyTable(self, body, jd_start, jd_end, flags, order)
+
+
+# --- Precomputed daily positions with Lagrange interpolation for coarse queries ---
+class DailyTable:
+    def __init__(self, eph, body, jd_start, jd_end, flags, order=6):
+        import numpy as np
+        self.order = order
+        self.jd0 = math.floor(jd_start) - order
+        n = int(math.ceil(jd_end) - self.jd0) + order + 1
+        lons = np.array([eph.raw_calc_ut(self.jd0 + i, body, flags)[0][0] for i in range(n)])
+        self.lons = np.degrees(np.unwrap(np.radians(lons)))
+        self.jd_end = self.jd0 + n - 1
+
+    def __call__(self, jd):
+        import numpy as np
+        x = np.asarray(jd, dtype=np.float64) - self.jd0
+        i0 = np.clip(np.floor(x).astype(np.intp) - (self.order // 2 - 1), 0, len(self.lons) - self.order)
+        t = x - i0
+        res = np.zeros_like(t)
+        for j in range(self.order):
+            w = np.ones_like(t)
+            for k in range(self.order):
+                if k != j: w *= (t - k) / (j - k)
+            res += w * self.lons[i0 + j]
+        return res % 360
+
+    def covers(self, jd):
+        return self.jd0 + self.order <= jd <= self.jd_end - self.order
+
+
+EPHEMERIS = Ephemeris()
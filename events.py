@@ -0,0 +1,135 @@
+import swisseph as swe
+
+import chart_engine as eng
+from ephemeris import EPHEMERIS
+
+TOL = 0.5 / 86400.0  # half a second, in days
+EPS = 1e-7
+
+# (name, swe body id, longitude offset, coarse scan step in days, has stations)
+# The true node wobbles around its mean motion, so it is scanned finely and split at every
+# speed sign change, but those turnarounds are not reported as stations.
+BODIES = [("Sun", 0, 0, 2.0, False), ("Moo", 1, 0, 0.5, False), ("Mar", 4, 0, 1.0, True), ("Mer", 2, 0, 1.0, True),
+          ("Jup", 5, 0, 2.0, True), ("Ven", 3, 0, 1.0, True), ("Sat", 6, 0, 2.0, True), ("Rah", 11, 0, 0.5, True),
+          ("Ket", 11, 180, 0.5, True)]
+NODES = ("Rah", "Ket")
+OUTER_BODIES = [("Ura", swe.URANUS, 0, 4.0, True), ("Nep", swe.NEPTUNE, 0, 4.0, True), ("Plu", swe.PLUTO, 0, 4.0, True)]
+KINDS = ("ingress", "nakshatra", "station", "combust")
+
+
+# --- Boundary tables: longitudes where a state changes, with the state on either side ---
+def varga_boundaries(d):
+    if d == 30: cuts = {s*30 + c for s in range(12) for c in ((0, 5, 10, 18, 25) if s % 2 == 0 else (0, 5, 12, 20, 25))}
+    else: cuts = {k*30/d for k in range(12*d)}
+    out = []
+    for b in sorted(cuts):
+        lo, hi = eng.get_divisional_sign((b - EPS) % 360, d), eng.get_divisional_sign(b + EPS, d)
+        if lo != hi: out.append((b, lo, hi))
+    return out
+
+def pada_boundaries():
+    return [(k*eng.NAK_W/4, (k-1) % 108, k) for k in range(108)]
+
+
+# --- Root finding ---
+def solve(f, a, b, fa, fb, tol=TOL):
+    # Illinois regula falsi: secant steps that always keep the root bracketed.
+    side = 0
+    for _ in range(200):
+        if b - a <= tol: break
+        c = (a*fb - b*fa) / (fb - fa)
+        if not a < c < b: c = (a + b) / 2
+        fc = f(c)
+        if fc == 0: return c
+        if (fc < 0) == (fa < 0):
+            a, fa = c, fc
+            if side == -1: fb /= 2
+            side = -1
+        else:
+            b, fb = c, fc
+            if side == 1: fa /= 2
+            side = 1
+    return (a + b) / 2
+
+def bisect_state(state, a, b, sa, tol=TOL):
+    while b - a > tol:
+        m = (a + b) / 2
+        if state(m) == sa: a = m
+        else: b = m
+    return b
+
+
+# --- Scanner ---
+class EventFinder:
+    def __init__(self, vargas=(1,), kinds=KINDS, outer=False):
+        self.vargas, self.kinds = list(vargas), set(kinds)
+        self.bodies = BODIES + (OUTER_BODIES if outer else [])
+        self.tables = [("ingress", d, varga_boundaries(d)) for d in self.vargas] if "ingress" in self.kinds else []
+        if "nakshatra" in self.kinds: self.tables.append(("nakshatra", None, pada_boundaries()))
+
+    def _calc(self, jd, pid, off):
+        r = EPHEMERIS.raw_calc_ut(jd, pid, eng.FLAGS)[0]
+        return (r[0] + off) % 360, r[3]
+
+    def find(self, jd_start, jd_end, bodies=None):
+        EPHEMERIS.set_sid_mode(swe.SIDM_LAHIRI)
+        events = []
+        for name, pid, off, step, stations in self.bodies:
+            if bodies and name not in bodies: continue
+            events += self._scan_body(name, pid, off, step, stations, jd_start, jd_end)
+        events.sort(key=lambda e: e["jd"])
+        return events
+
+    def _scan_body(self, name, pid, off, step, stations, jd_start, jd_end):
+        events = []
+        lon_at = lambda t: self._calc(t, pid, off)[0]
+        speed_at = lambda t: self._calc(t, pid, off)[1]
+        t0 = jd_start; l0, v0 = self._calc(t0, pid, off)
+        combust = name in eng.COMBUST_LIMITS and "combust" in self.kinds
+        if combust:
+            is_combust = lambda t: "*" in eng.get_planet_status(name, *self._calc(t, pid, off), self._calc(t, 0, 0)[0])
+            c0 = is_combust(t0)
+        while t0 < jd_end:
+            t1 = min(t0 + step, jd_end); l1, v1 = self._calc(t1, pid, off)
+            legs = [(t0, l0, t1, l1)]
+            if stations and (v0 < 0) != (v1 < 0):
+                ts = solve(speed_at, t0, t1, v0, v1)
+                ls = lon_at(ts)
+                if "station" in self.kinds and name not in NODES:
+                    events.append({"jd": ts, "body": name, "kind": "station", "detail": "stationary retrograde" if v0 >= 0 else "stationary direct"})
+                legs = [(t0, l0, ts, ls), (ts, ls, t1, l1)]
+            for a, la, b, lb in legs: events += self._crossings(name, lon_at, a, la, b, lb)
+            if combust:
+                c1 = is_combust(t1)
+                if c1 != c0:
+                    tc = bisect_state(is_combust, t0, t1, c0)
+                    events.append({"jd": tc, "body": name, "kind": "combust", "detail": "combustion begins" if c1 else "combustion ends"})
+                c0 = c1
+            t0, l0, v0 = t1, l1, v1
+        return events
+
+    def _crossings(self, name, lon_at, a, la, b, lb):
+        events = []
+        delta = (lb - la + 180) % 360 - 180
+        if delta == 0: return events
+        for kind, d, table in self.tables:
+            for bound, before, after in table:
+                dist = (bound - la) % 360 if delta > 0 else (la - bound) % 360
+                if not 0 < dist <= abs(delta): continue
+                f = lambda t, B=bound: (lon_at(t) - B + 180) % 360 - 180
+                fa, fb = f(a), f(b)
+                if (fa < 0) == (fb < 0): continue
+                t = solve(f, a, b, fa, fb)
+                new = after if delta > 0 else before
+                if kind == "ingress":
+                    detail = f"enters {eng.SIGNS[new]}" + ("" if d == 1 else f" in D{d}")
+                    events.append({"jd": t, "body": name, "kind": "ingress", "varga": d, "sign": new, "detail": detail})
+                else:
+                    n_idx, pada = new // 4, new % 4 + 1
+                    events.append({"jd": t, "body": name, "kind": "nakshatra" if pada == 1 and delta > 0 or pada == 4 and delta < 0 else "pada",
+                                   "nakshatra": n_idx, "pada": pada, "detail": f"{eng.NAKSHATRAS[n_idx]} pada {pada}"})
+        return events
+
+
+def find_events(jd_start, jd_end, vargas=(1,), kinds=KINDS, bodies=None, outer=False):
+    return EventFinder(vargas, kinds, outer).find(jd_start, jd_end, bodies)
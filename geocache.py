@@ -0,0 +1,106 @@
+import os
+import sqlite3
+import sys
+import unicodedata
+from datetime import datetime
+from functools import lru_cache
+
+USER_AGENT = "vedic_astro_v1_9_15"
+GEONAMES_COLS = 19  # GeoNames cities*.txt dump: name at 1, ascii name at 2, lat/lon at 4/5, country at 8, population at 14, tz at 17
+
+
+def normalize(text):
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    return " ".join(text.lower().replace(",", " ").split())
+
+
+# --- Timezone lookups (memoized) ---
+_tz_finder = None
+
+def _finder():
+    global _tz_finder
+    if _tz_finder is None:
+        from timezonefinder import TimezoneFinder
+        _tz_finder = TimezoneFinder()
+    return _tz_finder
+
+@lru_cache(maxsize=65536)
+def timezone_at(lat, lon):
+    return _finder().timezone_at(lng=lon, lat=lat)
+
+@lru_cache(maxsize=65536)
+def utc_offset_hours(tz_name, y, m, d, hr=0, mn=0, sec=0):
+    import tzdb
+    return tzdb.offset_hours(tz_name, datetime(y, m, d, hr, mn, sec))[0]
+
+
+# --- Persistent cache + optional offline gazetteer ---
+class LocationResolver:
+    def __init__(self, path="geocode_cache.db", gazetteer="gazetteer.tsv"):
+        self.conn = sqlite3.connect(path)
+        self._geolocator = None
+        with self.conn:
+            self.conn.execute("CREATE TABLE IF NOT EXISTS places (key TEXT PRIMARY KEY, name TEXT, lat REAL, lon REAL, tz_name TEXT, source TEXT)")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS gazetteer (key TEXT NOT NULL, name TEXT, country TEXT, lat REAL, lon REAL, tz_name TEXT, population INTEGER)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS gazetteer_key ON gazetteer(key, population DESC)")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS meta (k TEXT PRIMARY KEY, v TEXT)")
+        if gazetteer and os.path.exists(gazetteer): self.load_gazetteer(gazetteer)
+
+    def load_gazetteer(self, path):
+        # (Re)imports a GeoNames cities dump only when the file changed since the last import.
+        import csv
+        stamp = f"{os.path.abspath(path)}:{os.path.getmtime(path)}"
+        if self.conn.execute("SELECT v FROM meta WHERE k = 'gazetteer'").fetchone() == (stamp,): return
+        csv.field_size_limit(min(sys.maxsize, 2**31 - 1))
+        with open(path, encoding="utf-8", newline="") as f, self.conn:
+            self.conn.execute("DELETE FROM gazetteer")
+            rows = []
+            for r in csv.reader(f, delimiter="\t", quoting=csv.QUOTE_NONE):
+                if len(r) < GEONAMES_COLS: continue
+                pop = int(r[14] or 0)
+                for key in {normalize(r[1]), normalize(r[2])}:
+                    if key: rows.append((key, r[1], r[8], float(r[4]), float(r[5]), r[17], pop))
+                if len(rows) >= 10000: self.conn.executemany("INSERT INTO gazetteer VALUES (?, ?, ?, ?, ?, ?, ?)", rows); rows = []
+            self.conn.executemany("INSERT INTO gazetteer VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('gazetteer', ?)", (stamp,))
+
+    def suggest(self, text, limit=10):
+        # Prefix matches by population; if none, the closest spellings among names sharing the first letters.
+        key = normalize(text)
+        if not key: return []
+        upper = key[:-1] + chr(ord(key[-1]) + 1)
+        rows = self.conn.execute("SELECT name, country, lat, lon, tz_name FROM gazetteer WHERE key >= ? AND key < ? ORDER BY population DESC LIMIT ?",
+                                 (key, upper, limit)).fetchall()
+        if rows or len(key) < 2: return rows
+        stem = key[:2]
+        cands = self.conn.execute("SELECT key, name, country, lat, lon, tz_name FROM gazetteer WHERE key >= ? AND key < ? ORDER BY population DESC LIMIT 5000",
+                                  (stem, stem[:-1] + chr(ord(stem[-1]) + 1))).fetchall()
+        import difflib
+        best = {}
+        for c in cands: best.setdefault(c[0], c[1:])
+        return [best[k] for k in difflib.get_close_matches(key, list(best), n=limit, cutoff=0.75)]
+
+    def _geolocate(self, query):
+        if self._geolocator is None:
+            from geopy.geocoders import Nominatim
+            self._geolocator = Nominatim(user_agent=USER_AGENT)
+        return self._geolocator.geocode(query)
+
+    def resolve(self, query):
+        key = normalize(query)
+        if not key: return None
+        row = self.conn.execute("SELECT name, lat, lon, tz_name, source FROM places WHERE key = ?", (key,)).fetchone()
+        if row: return dict(zip(("name", "lat", "lon", "tz_name", "source"), row))
+        hits = self.suggest(query, 1)
+        if hits:
+            name, country, lat, lon, tz_name = hits[0]
+            lat, lon = round(lat, 4), round(lon, 4)
+            place = {"name": f"{name}, {country}", "lat": lat, "lon": lon, "tz_name": tz_name or timezone_at(lat, lon), "source": "gazetteer"}
+        else:
+            loc = self._geolocate(query)
+            if not loc: return None
+            lat, lon = round(loc.latitude, 4), round(loc.longitude, 4)
+            place = {"name": loc.address, "lat": lat, "lon": lon, "tz_name": timezone_at(lat, lon), "source": "nominatim"}
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO places VALUES (?, ?, ?, ?, ?, ?)", (key, place["name"], place["lat"], place["lon"], place["tz_name"], place["source"]))
+        return place
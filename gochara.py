@@ -0,0 +1,161 @@
+import argparse
+import json
+import sys
+import threading
+import time
+from datetime import datetime
+
+import swisseph as swe
+
+import chart_engine as eng
+import events
+from chart_render import ASPECTS
+from ephemeris import EPHEMERIS
+
+TRANSITS = ["Sun", "Mar", "Mer", "Jup", "Ven", "Sat", "Rah", "Ket"]
+KINDS = ("house", "aspect", "sade_sati", "return")
+CHUNK = 1024.0  # days; ingresses are scanned per JD-aligned chunk, so every profile and span reuses them
+SADE_SATI = {11: "rising", 0: "peak", 1: "setting"}  # Saturn's sign counted from the natal Moon
+BODY = {b[0]: b for b in events.BODIES}
+
+
+def _nth(n):
+    return str(n) + {1: "st", 2: "nd", 3: "rd"}.get(n, "th")
+
+
+# --- Shared sign timelines ---
+# Every gochara state depends only on the transiting planet's sign, so a profile's report is pure
+# sign arithmetic over one list of ingresses per planet. Those come from the event finder's coarse
+# scan and root refinement and are cached, so a batch of profiles pays for the ephemeris once.
+class SignTimeline:
+    def __init__(self):
+        self.finder = events.EventFinder(vargas=(1,), kinds=("ingress",))
+        self._chunks, self._lock = {}, threading.Lock()
+
+    def _ingresses(self, body, k):
+        # The true node is the costliest body to compute; Ketu changes sign at the same instants as Rahu.
+        if body == "Ket": return [(jd, (s + 6) % 12) for jd, s in self._ingresses("Rah", k)]
+        with self._lock:
+            if (body, k) not in self._chunks:
+                self._chunks[body, k] = [(e["jd"], e["sign"]) for e in self.finder.find(k * CHUNK, (k + 1) * CHUNK, [body])]
+            return self._chunks[body, k]
+
+    def sign_at(self, body, jd):
+        _, pid, off, _, _ = BODY[body]
+        EPHEMERIS.set_sid_mode(swe.SIDM_LAHIRI)
+        return int((EPHEMERIS.raw_calc_ut(jd, pid, eng.FLAGS)[0][0] + off) % 360 / 30)
+
+    def segments(self, body, jd_start, jd_end):
+        # [(start, end, sign)] covering [jd_start, jd_end) without gaps.
+        out, t, sign = [], jd_start, self.sign_at(body, jd_start)
+        for k in range(int(jd_start // CHUNK), int(jd_end // CHUNK) + 1):
+            for jd, s in self._ingresses(body, k):
+                if jd_start < jd < jd_end: out.append((t, jd, sign)); t, sign = jd, s
+        out.append((t, jd_end, sign))
+        return out
+
+    def clear(self):
+        with self._lock: self._chunks.clear()
+
+TIMELINE = SignTimeline()
+
+
+# --- Per-profile report ---
+def natal_signs(rec):
+    dt, tz, lat, lon = eng.parse_record(rec)
+    chart = eng.compute_chart(dt, tz, lat, lon, {"vargas": False, "panchang": False, "dashas": False})
+    return dict({"ASC": int(chart["asc"] / 30)}, **{b["name"]: b["sign"] for b in chart["bodies"] if b["name"] != "ASC"})
+
+def _runs(segments, state):
+    # Consecutive segments with the same state merge into one interval; a None state is no interval.
+    runs = []
+    for a, b, s in segments:
+        v = state(s)
+        if runs and runs[-1][2] == v: runs[-1][1] = b
+        else: runs.append([a, b, v])
+    return [r for r in runs if r[2] is not None]
+
+def timeline(natal, jd_start, jd_end, bodies=TRANSITS, kinds=KINDS, cache=TIMELINE):
+    # Sorted (start, end, body, kind, detail) intervals; the first and last may be cut by the span.
+    rows, moon, lagna = [], natal["Moo"], natal["ASC"]
+    for body in bodies:
+        segs = cache.segments(body, jd_start, jd_end)
+        out = []
+        if "house" in kinds:
+            for ref, s0 in (("Moon", moon), ("Lagna", lagna)):
+                out += [(a, b, "house", f"{_nth(h)} house from {ref}") for a, b, h in _runs(segs, lambda s, s0=s0: (s - s0) % 12 + 1)]
+        if "aspect" in kinds:
+            for target, t in natal.items():
+                if target == "ASC": continue
+                aspect = lambda s, t=t: (t - s) % 12 + 1 if (t - s) % 12 in ASPECTS.get(body, ()) else None
+                out += [(a, b, "aspect", f"{_nth(n)} aspect on natal {target}") for a, b, n in _runs(segs, aspect)]
+        if "return" in kinds and body in natal:
+            out += [(a, b, "return", f"return to natal {eng.SIGNS[natal[body]]}") for a, b, _ in _runs(segs, lambda s: s == natal[body] or None)]
+        if "sade_sati" in kinds and body == "Sat":
+            out += [(a, b, "sade_sati", "Sade Sati") for a, b, _ in _runs(segs, lambda s: (s - moon) % 12 in SADE_SATI or None)]
+            out += [(a, b, "sade_sati", f"Sade Sati {p} phase") for a, b, p in _runs(segs, lambda s: SADE_SATI.get((s - moon) % 12))]
+        rows += [(a, b, body, kind, detail) for a, b, kind, detail in out]
+    rows.sort(key=lambda r: (r[0], r[1]))
+    return rows
+
+def rows_for(rec, years, start=None, bodies=TRANSITS, kinds=KINDS, cache=TIMELINE):
+    # The span starts at local midnight of `start` (default: today) in the profile's own time zone.
+    tz = float(rec["tz"])
+    jd0 = eng.local_to_jd(start or datetime.now().replace(hour=0, minute=0, second=0, microsecond=0), tz)
+    jd1 = jd0 + years * 365.25
+    for a, b, body, kind, detail in timeline(natal_signs(rec), jd0, jd1, bodies, kinds, cache):
+        yield {"name": rec.get("name", ""), "body": body, "kind": kind, "detail": detail,
+               "start": eng.jd_to_local(a, tz).isoformat(timespec="seconds"), "end": eng.jd_to_local(b, tz).isoformat(timespec="seconds"),
+               "days": round(b - a, 3), "open_start": a <= jd0, "open_end": b >= jd1}
+
+
+# --- Output ---
+def format_row(r, with_name=False):
+    # An interval already running when the span starts, or still running when it ends, is marked < or >.
+    start = ("<" if r["open_start"] else " ") + r["start"][:16].replace("T", " ")
+    end = r["end"][:16].replace("T", " ") + (">" if r["open_end"] else " ")
+    return (f"{r['name'][:20]:<21}" if with_name else "") + f"{start}  {end}  {r['days']:>8.1f}  {r['body']:<4} {r['detail']}"
+
+def main(argv=None):
+    from profile_store import open_store
+    ap = argparse.ArgumentParser(prog="main.py gochara", description="Gochara timeline: the intervals a profile spends with each transiting planet in each house "
+                                 "from the Moon and the lagna, aspecting natal planets, in Sade Sati and in sign returns.")
+    ap.add_argument("names", nargs="*", help="profiles to report on")
+    ap.add_argument("--all", action="store_true", help="every profile in the store")
+    ap.add_argument("--from", dest="start", default=datetime.now().strftime('%Y-%m-%d'), help="first day, Y-M-D (default: today)")
+    ap.add_argument("--years", type=float, default=30)
+    ap.add_argument("--bodies", default=",".join(TRANSITS), help="transiting planets, comma separated")
+    ap.add_argument("--kinds", default=",".join(KINDS), help="any of " + ", ".join(KINDS))
+    ap.add_argument("--format", choices=["table", "jsonl"], default="table")
+    ap.add_argument("--db", default="astro_profiles.db")
+    ap.add_argument("-o", "--output")
+    args = ap.parse_args(argv)
+    if not args.all and not args.names: ap.error("give profile names or --all")
+    bodies, kinds = args.bodies.split(","), args.kinds.split(",")
+    bad = [b for b in bodies if b not in BODY] + [k for k in kinds if k not in KINDS]
+    if bad: ap.error(f"unknown planet or kind {bad[0]!r}")
+    start = datetime.strptime(args.start, '%Y-%m-%d')
+
+    store = open_store(args.db)
+    recs = store.iter_profiles() if args.all else (store.get(n) or n for n in args.names)
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    t0, n, rows, errors = time.perf_counter(), 0, 0, 0
+    try:
+        for rec in recs:
+            if isinstance(rec, str): print(f"no profile named {rec!r}", file=sys.stderr); errors += 1; continue
+            n += 1
+            try:
+                for r in rows_for(rec, args.years, start, bodies, kinds):
+                    out.write((json.dumps(r, ensure_ascii=False) if args.format == "jsonl" else format_row(r, args.all or len(args.names) > 1)) + "\n"); rows += 1
+            except (KeyError, TypeError, ValueError, swe.Error) as e:
+                print(f"{rec.get('name', '?')}: {e}", file=sys.stderr); errors += 1
+            out.flush()
+    finally:
+        if out is not sys.stdout: out.close()
+        store.close()
+    print(f"{n} profiles, {rows} intervals, {errors} errors in {time.perf_counter() - t0:.1f}s", file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,34 @@
+import time
+_T_IMPORT = time.perf_counter()
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 import swisseph as swe
 from datetime import datetime, timedelta
 import calendar
-import math
+import sys
+import importlib
+import threading
 import json
-import os
-from geopy.geocoders import Nominatim
-from tkcalendar import DateEntry
-from timezonefinder import TimezoneFinder
-import pytz
+import chart_engine as eng
+import dasha
+import events
+import gochara
+import playback
+import rectify
+from scheduler import LatestWinsScheduler
+import chart_render
+from chart_render import TkChartRenderer
+from profile_store import open_default_store, PAGE_SIZE
+import geocache
+from perf import PROFILER
+IMPORT_MS = (time.perf_counter() - _T_IMPORT) * 1000.0
 
 class ProfessionalVedicAppV1:
-    def __init__(self, root):
+    def __init__(self, root, report_startup=False, perf=False, perf_log_s=0):
+        self.t_init = time.perf_counter()
+        self.startup = {"import_ms": round(IMPORT_MS, 1)}
+        self.report_startup = report_startup
+        self.perf_log_s = perf_log_s
         self.root = root
         self.root.title("Vedic Astrology Suite - V1.9.15 (Profile Management Update)")
         self.root.geometry("1400x1000")
@@ -36,39 +52,50 @@ class ProfessionalVedicAppV1:
         self.main_canvas.bind_all("<MouseWheel>", self._on_mousewheel)
         
         # State & Constants
-        self.profile_file = "astro_profiles.json"
+        self.store = open_default_store()
+        self.profile_page = 0
         self.lat, self.lon, self.tz = tk.DoubleVar(value=12.9716), tk.DoubleVar(value=77.5946), tk.DoubleVar(value=5.5)
-        self.geolocator = Nominatim(user_agent="vedic_astro_v1_9_15")
-        self.tz_finder = TimezoneFinder()
+        self.locations = geocache.LocationResolver()
         self._updating = False
-        self.all_profiles = []
+        self._chart_view = []
+        self._stages, self._tree_rows, self._drawn = {}, {}, {}
+        self._dasha_nodes = {}
+        self.items_created = 0
+        self.scheduler = None
+        self.cal = None
+        self._last_res = None
+        self.player, self.play_clock, self.playback_frame, self.playing = None, None, None, False
+        self.moon_index, self.match_scheduler = None, None
+        self.chart_index, self.chart_index_ready = None, False
         
         # Display Toggles
         self.north_style = tk.BooleanVar(value=False)
         self.show_transits = tk.BooleanVar(value=False)
         self.show_drishti = tk.BooleanVar(value=False)
         self.show_outer = tk.BooleanVar(value=False)
+        self.show_perf = tk.BooleanVar(value=perf)
 
-        self.nakshatras = ["Ashwini", "Bharani", "Krittika", "Rohini", "Mrigashira", "Ardra", "Punarvasu", "Pushya", "Ashlesha",
-                          "Magha", "Purva Phalguni", "Uttara Phalguni", "Hasta", "Chitra", "Swati", "Vishakha", "Anuradha", "Jyeshtha",
-                          "Moola", "Purva Ashadha", "Uttara Ashadha", "Shravana", "Dhanishta", "Shatabhisha", "Purva Bhadrapada", "Uttara Bhadrapada", "Revati"]
-        self.lord_order = ["Ketu", "Venus", "Sun", "Moon", "Mars", "Rahu", "Jupiter", "Saturn", "Mercury"]
-        self.dasha_years = {"Ketu": 7, "Venus": 20, "Sun": 6, "Moon": 10, "Mars": 7, "Rahu": 18, "Jupiter": 16, "Saturn": 19, "Mercury": 17}
-        self.signs = ["Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo", "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"]
-        
-        self.tithis = ["Pratipada (S)", "Dwitiya (S)", "Tritiya (S)", "Chaturthi (S)", "Panchami (S)", "Shashthi (S)", "Saptami (S)", "Ashtami (S)", "Navami (S)", "Dashami (S)", "Ekadashi (S)", "Dwadashi (S)", "Trayodashi (S)", "Chaturdashi (S)", "Purnima", 
-                       "Pratipada (K)", "Dwitiya (K)", "Tritiya (K)", "Chaturthi (K)", "Panchami (K)", "Shashthi (K)", "Saptami (K)", "Ashtami (K)", "Navami (K)", "Dashami (K)", "Ekadashi (K)", "Dwadashi (K)", "Trayodashi (K)", "Chaturdashi (K)", "Amavasya"]
-        self.yogas = ["Vishkambha", "Priti", "Ayushman", "Saubhagya", "Shobhana", "Atiganda", "Sukarma", "Dhriti", "Shula", "Ganda", "Vriddhi", "Dhruva", "Vyaghata", "Harshana", "Vajra", "Siddhi", "Vyatipata", "Variyana", "Parigha", "Shiva", "Siddha", "Sadhya", "Shubha", "Shukla", "Brahma", "Indra", "Vaidhriti"]
-        self.varjyam_starts = [50, 24, 30, 40, 14, 21, 30, 20, 32, 30, 20, 18, 21, 20, 14, 14, 10, 14, 20, 24, 20, 10, 10, 18, 16, 24, 30]
+        self.nakshatras = eng.NAKSHATRAS
+        self.lord_order = eng.LORD_ORDER
+        self.dasha_years = eng.DASHA_YEARS
+        self.signs = eng.SIGNS
+        self.tithis = eng.TITHIS
+        self.yogas = eng.YOGAS
+        self.varjyam_starts = eng.VARJYAM_STARTS
 
-        self.d_charts = {"D2 (Hora)": 2, "D3 (Drekkana)": 3, "D4 (Chaturthamsha)": 4, "D7 (Saptamsha)": 7, "D9 (Navamsha)": 9, "D10 (Dashamsha)": 10, "D12 (Dwadashamsha)": 12, "D16 (Shodashamsha)": 16, "D20 (Vimshamsha)": 20, "D24 (Chaturvimshamsha)": 24, "D27 (Saptavimshamsha)": 27, "D30 (Trimshamsha)": 30, "D40 (Khavedamsha)": 40, "D45 (Akshavedamsha)": 45, "D60 (Shastiamsha)": 60}
+        self.d_charts = eng.D_CHARTS
         self.selected_d_label = tk.StringVar(value="D9 (Navamsha)")
 
-        self.dignities = {"Sun": (0, 10), "Moo": (1, 3), "Mar": (9, 28), "Mer": (5, 15), "Jup": (3, 5), "Ven": (11, 27), "Sat": (6, 20)}
-        self.combust_limits = {"Moo": 12, "Mar": 17, "Mer": 14, "Jup": 11, "Ven": 10, "Sat": 15}
+        self.dignities = eng.DIGNITIES
+        self.combust_limits = eng.COMBUST_LIMITS
 
         self.setup_ui()
-        self.update_chart()
+        self.scheduler = LatestWinsScheduler(self.root, self.compute_view, self.render_chart, self.render_error)
+        self.update_chart(debounce_ms=0)
+        self.startup["init_ms"] = self._since_init()
+        if perf or perf_log_s: PROFILER.enable()
+        if perf: self.toggle_perf()
+        if perf_log_s: self.root.after(int(perf_log_s * 1000), self.log_perf)
 
     def _on_mousewheel(self, event):
         self.main_canvas.yview_scroll(int(-1*(event.delta/120)), "units")
@@ -104,9 +131,14 @@ class ProfessionalVedicAppV1:
         self.search_var.trace_add("write", self.filter_profiles)
         self.profile_cb = ttk.Combobox(prof_frame, textvariable=self.search_var, width=20)
         self.profile_cb.pack(side=tk.LEFT, padx=5)
+        tk.Button(prof_frame, text="◀", width=2, command=lambda: self.page_profiles(-1)).pack(side=tk.LEFT)
+        tk.Button(prof_frame, text="▶", width=2, command=lambda: self.page_profiles(1)).pack(side=tk.LEFT)
         self.load_profile_list()
         tk.Button(prof_frame, text="Load Selected", command=self.load_profile).pack(side=tk.LEFT, padx=5)
         tk.Button(prof_frame, text="Delete Profile", command=self.delete_profile, fg="red").pack(side=tk.LEFT, padx=5)
+        tk.Button(prof_frame, text="Match...", command=self.open_matcher).pack(side=tk.LEFT, padx=5)
+        tk.Button(prof_frame, text="Query...", command=self.open_query).pack(side=tk.LEFT, padx=5)
+        tk.Button(prof_frame, text="Gochara...", command=self.open_gochara).pack(side=tk.LEFT, padx=5)
         
         # --- Location Settings ---
         loc_frame = tk.LabelFrame(parent, text=" Location Settings ")
@@ -122,8 +154,8 @@ class ProfessionalVedicAppV1:
         # --- Time & Chart Selection (Included Seconds) ---
         time_frame = tk.LabelFrame(parent, text=" Birth Date, Time & Chart Selection ")
         time_frame.pack(fill="x", padx=20, pady=5)
-        self.cal = DateEntry(time_frame, width=12, background='darkblue', year=now.year, month=now.month, day=now.day)
-        self.cal.grid(row=0, column=0, padx=20, rowspan=2); self.cal.bind("<<DateEntrySelected>>", self.sync_cal_to_vars)
+        # The DateEntry (tkcalendar + babel) is built into this slot after the first chart is on screen.
+        self.cal_slot = tk.Frame(time_frame); self.cal_slot.grid(row=0, column=0, padx=20, rowspan=2)
         self.time_vars = {}
           
         units = [("Year", now.year), ("Month", now.month), ("Day", now.day), ("Hour", now.hour), ("Minute", now.minute), ("Second", now.second)]
@@ -139,18 +171,27 @@ class ProfessionalVedicAppV1:
         
         div_cb = ttk.Combobox(time_frame, textvariable=self.selected_d_label, values=list(self.d_charts.keys()), state="readonly", width=20)
         div_cb.grid(row=0, column=8, padx=20)
-        div_cb.bind("<<ComboboxSelected>>", lambda e: self.update_chart())
+        tk.Button(time_frame, text="Rectify...", command=self.open_rectifier).grid(row=0, column=9, padx=5)
+        div_cb.bind("<<ComboboxSelected>>", lambda e: (self.update_chart(), self.restart_playback()))
 
         view_frame = tk.LabelFrame(parent, text=" Display Options ")
         view_frame.pack(fill="x", padx=20, pady=5)
-        tk.Checkbutton(view_frame, text="North Indian Style", variable=self.north_style, command=self.update_chart).pack(side=tk.LEFT, padx=10)
+        tk.Checkbutton(view_frame, text="North Indian Style", variable=self.north_style, command=self.redraw_charts).pack(side=tk.LEFT, padx=10)
         tk.Checkbutton(view_frame, text="Transits", variable=self.show_transits, command=self.update_chart).pack(side=tk.LEFT, padx=10)
-        tk.Checkbutton(view_frame, text="Drishti", variable=self.show_drishti, command=self.update_chart).pack(side=tk.LEFT, padx=10)
-        tk.Checkbutton(view_frame, text="Outer Planets", variable=self.show_outer, command=self.update_chart).pack(side=tk.LEFT, padx=10)
+        tk.Checkbutton(view_frame, text="Drishti", variable=self.show_drishti, command=self.redraw_charts).pack(side=tk.LEFT, padx=10)
+        tk.Checkbutton(view_frame, text="Outer Planets", variable=self.show_outer, command=lambda: (self.update_chart(), self.restart_playback())).pack(side=tk.LEFT, padx=10)
+        tk.Checkbutton(view_frame, text="Perf Overlay", variable=self.show_perf, command=self.toggle_perf).pack(side=tk.LEFT, padx=10)
+        tk.Button(view_frame, text="Export Perf", command=self.export_perf).pack(side=tk.LEFT, padx=5)
+        self.status_var = tk.StringVar(value="")
+        tk.Label(view_frame, textvariable=self.status_var, font=("Arial", 8), fg="gray").pack(side=tk.RIGHT, padx=10)
+
+        self.setup_playback_ui(parent)
 
         chart_container = tk.Frame(parent); chart_container.pack(pady=5)
+        self.perf_label = tk.Label(chart_container, justify=tk.LEFT, anchor="nw", font=("Courier", 8), bg="#ffffe0", relief="solid", bd=1)
         self.canvas_d1 = tk.Canvas(chart_container, width=500, height=500, bg="white", highlightthickness=1); self.canvas_d1.pack(side=tk.LEFT, padx=20)
         self.canvas_div = tk.Canvas(chart_container, width=500, height=500, bg="white", highlightthickness=1); self.canvas_div.pack(side=tk.LEFT, padx=20)
+        self.renderers = {c: TkChartRenderer(c) for c in (self.canvas_d1, self.canvas_div)}
 
         table_frame = tk.LabelFrame(parent, text=" Planetary Positions ")
         table_frame.pack(fill="x", padx=20, pady=5)
@@ -169,12 +210,20 @@ class ProfessionalVedicAppV1:
         )
 
         self.setup_dasha_ui(parent)
+        self.setup_event_ui(parent)
 
     # --- Profile Logic ---
     def filter_profiles(self, *args):
-        search_term = self.search_var.get().lower()
-        filtered = [p for p in self.all_profiles if search_term in p.lower()]
-        self.profile_cb['values'] = filtered
+        self.profile_page = 0
+        self.show_profile_page()
+
+    def show_profile_page(self):
+        with PROFILER.stage("profile.search"): self.profile_cb['values'] = self.store.search(self.search_var.get(), PAGE_SIZE, self.profile_page * PAGE_SIZE)
+
+    def page_profiles(self, step):
+        if step > 0 and len(self.profile_cb['values']) < PAGE_SIZE: return
+        self.profile_page = max(0, self.profile_page + step)
+        self.show_profile_page()
 
     def save_profile(self):
         name = self.ent_name.get()
@@ -184,11 +233,8 @@ class ProfessionalVedicAppV1:
             "year": self.time_vars["Year"].get(), "month": self.time_vars["Month"].get(), "day": self.time_vars["Day"].get(),
             "hour": self.time_vars["Hour"].get(), "minute": self.time_vars["Minute"].get(), "second": self.time_vars["Second"].get()
         }
-        profiles = {}
-        if os.path.exists(self.profile_file):
-            with open(self.profile_file, 'r') as f: profiles = json.load(f)
-        profiles[name] = data
-        with open(self.profile_file, 'w') as f: json.dump(profiles, f)
+        with PROFILER.stage("profile.save"): self.store.put(data)
+        if self.chart_index_ready: self.chart_index.update(data)
         self.load_profile_list()
         messagebox.showinfo("Success", f"Profile '{name}' saved.")
 
@@ -197,120 +243,32 @@ class ProfessionalVedicAppV1:
         if not name: return
         if not messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete profile '{name}'?"):
             return
-        
-        if os.path.exists(self.profile_file):
-            with open(self.profile_file, 'r') as f:
-                profiles = json.load(f)
-            if name in profiles:
-                del profiles[name]
-                with open(self.profile_file, 'w') as f:
-                    json.dump(profiles, f)
-                self.load_profile_list()
-                self.search_var.set("") # Clear after delete
-                messagebox.showinfo("Success", f"Profile '{name}' deleted.")
+
+        with PROFILER.stage("profile.delete"): deleted = self.store.delete(name)
+        if self.chart_index_ready: self.chart_index.remove(name)
+        if deleted:
+            self.search_var.set("") # Clear after delete
+            messagebox.showinfo("Success", f"Profile '{name}' deleted.")
 
     def load_profile_list(self):
-        if os.path.exists(self.profile_file):
-            with open(self.profile_file, 'r') as f:
-                self.all_profiles = sorted(list(json.load(f).keys()))
-                self.profile_cb['values'] = self.all_profiles
+        self.filter_profiles()
 
     def load_profile(self):
         name = self.profile_cb.get()
         if not name: return
-        with open(self.profile_file, 'r') as f:
-            profiles = json.load(f)
-            if name not in profiles: return
-            d = profiles[name]
-            self.ent_name.delete(0, tk.END); self.ent_name.insert(0, d['name'])
-            self.ent_loc.delete(0, tk.END); self.ent_loc.insert(0, d['city'])
-            self.lat.set(d['lat']); self.lon.set(d['lon']); self.tz.set(d['tz'])
-            self._updating = True
-            for k in ["Year", "Month", "Day", "Hour", "Minute", "Second"]: 
-                val = d.get(k.lower(), "0")
-                self.time_vars[k].set(str(val))
-            self.cal.set_date(datetime(int(d['year']), int(d['month']), int(d['day'])))
-            self._updating = False
-            self.search_var.set("") # Clear search text after loading
-            self.update_chart()
-
-    def format_time(self, hrs_float):
-        h = int(hrs_float) % 24
-        m = int(round((hrs_float - int(hrs_float)) * 60))
-        if m == 60: h = (h + 1) % 24; m = 0
-        return f"{h:02d}:{m:02d}"
-
-    def get_panchang_data(self, sun_lon, moon_lon, moon_speed, jd, curr_dt):
-        tithi_idx = int((moon_lon - sun_lon) % 360 / 12)
-        yoga_idx = int((moon_lon + sun_lon) % 360 / 13.333333)
-        karana_idx = int((moon_lon - sun_lon) % 360 / 6)
-        k_name = "Kintughna" if karana_idx == 0 else "Shakuni" if karana_idx == 57 else "Chatushpada" if karana_idx == 58 else "Naga" if karana_idx == 59 else ["Bava", "Balava", "Kaulava", "Taitila", "Gara", "Vanija", "Vishti"][(karana_idx - 1) % 7]
-
-        sun_equ = swe.calc_ut(jd, swe.SUN, swe.FLG_SWIEPH | swe.FLG_EQUATORIAL)[0]
-        decl = sun_equ[1]
-        rad = math.pi / 180.0
-        lat_rad = self.lat.get() * rad
-        decl_rad = decl * rad
-        alt_rad = -0.833 * rad 
-        try:
-            cos_h = (math.sin(alt_rad) - math.sin(lat_rad) * math.sin(decl_rad)) / (math.cos(lat_rad) * math.cos(decl_rad))
-            cos_h = max(-1.0, min(1.0, cos_h))
-            h_hours = math.acos(cos_h) / rad / 15.0
-        except: h_hours = 6.0
-            
-        day_dur = 2.0 * h_hours
-        night_dur = 24.0 - day_dur
-        lon_diff = self.lon.get() - (self.tz.get() * 15.0)
-        B = 360.0/365.24 * (curr_dt.timetuple().tm_yday - 81) * rad
-        eot_hours = (9.87 * math.sin(2*B) - 7.53 * math.cos(B) - 1.5 * math.sin(B)) / 60.0
-        local_noon = 12.0 - (lon_diff / 15.0) - eot_hours
-        sunrise_hrs = local_noon - h_hours
-        sunset_hrs = local_noon + h_hours
-
-        def format_pan_time(t):
-            if t < 0: t += 24.0
-            elif t >= 24.0: t -= 24.0
-            return self.format_time(t)
-
-        wd = curr_dt.weekday()
-        day_part = day_dur / 8.0
-        rk_parts = {6: 8, 0: 2, 1: 7, 2: 5, 3: 6, 4: 4, 5: 3}
-        yk_parts = {6: 5, 0: 4, 1: 3, 2: 2, 3: 1, 4: 7, 5: 6}
-        gk_parts = {6: 7, 0: 6, 1: 5, 2: 4, 3: 3, 4: 2, 5: 1}
-        
-        def get_kala(part_dict):
-            p = part_dict[wd]
-            s = sunrise_hrs + (p - 1) * day_part
-            return f"{format_pan_time(s)} - {format_pan_time(s + day_part)}"
-
-        muh_dur_day = day_dur / 15.0
-        muh_dur_night = night_dur / 15.0
-        abhijit_start = sunrise_hrs + 7 * muh_dur_day
-        abhijit = f"{format_pan_time(abhijit_start)} - {format_pan_time(abhijit_start + muh_dur_day)}"
-        
-        dm_parts = {6: [(14, 'D')], 0: [(9, 'D'), (12, 'D')], 1: [(4, 'D'), (11, 'N')], 2: [(8, 'D')], 3: [(10, 'D'), (13, 'D')], 4: [(4, 'D'), (9, 'D')], 5: [(2, 'D')]}
-        dms = []
-        for p, dn in dm_parts[wd]:
-            ds = (sunrise_hrs + (p - 1) * muh_dur_day) if dn == 'D' else (sunset_hrs + (p - 1) * muh_dur_night)
-            dur = muh_dur_day if dn == 'D' else muh_dur_night
-            dms.append(f"{format_pan_time(ds)}-{format_pan_time(ds+dur)}")
-
-        nak_dur_hrs = 13.333333 / moon_speed * 24.0
-        v_start_ghati = self.varjyam_starts[int(moon_lon / 13.333333)]
-        entry_time = (curr_dt.hour + curr_dt.minute/60.0 + curr_dt.second/3600.0) - ((moon_lon % 13.333333) / moon_speed * 24.0)
-        v_time = entry_time + (v_start_ghati / 60.0) * nak_dur_hrs
-        v_dur = (4.0 / 60.0) * nak_dur_hrs
-        a_time = v_time + (24.0/60.0 * nak_dur_hrs)
-
-        return [
-            ("Sunrise", self.format_time(sunrise_hrs), "Sunset", self.format_time(sunset_hrs)),
-            ("Tithi", self.tithis[tithi_idx], "Rahu Kala", get_kala(rk_parts)),
-            ("Yoga", self.yogas[yoga_idx], "Yamaganda Kala", get_kala(yk_parts)),
-            ("Karana", k_name, "Gulika Kala", get_kala(gk_parts)),
-            ("Day Duration", f"{int(day_dur)}h {int((day_dur%1)*60)}m", "Abhijit Muhurta", abhijit),
-            ("Night Duration", f"{int(night_dur)}h {int((night_dur%1)*60)}m", "Dur Muhurta", ", ".join(dms)),
-            ("Vishagatika (Varjyam)", f"{format_pan_time(v_time)} - {format_pan_time(v_time+v_dur)}", "Amrita Kala", f"{format_pan_time(a_time)} - {format_pan_time(a_time+v_dur)}")
-        ]
+        with PROFILER.stage("profile.load"): d = self.store.get(name)
+        if d is None: return
+        self.ent_name.delete(0, tk.END); self.ent_name.insert(0, d['name'])
+        self.ent_loc.delete(0, tk.END); self.ent_loc.insert(0, d['city'])
+        self.lat.set(d['lat']); self.lon.set(d['lon']); self.tz.set(d['tz'])
+        self._updating = True
+        for k in ["Year", "Month", "Day", "Hour", "Minute", "Second"]:
+            val = d.get(k.lower(), "0")
+            self.time_vars[k].set(str(val))
+        self.set_cal_date(datetime(int(d['year']), int(d['month']), int(d['day'])))
+        self._updating = False
+        self.search_var.set("") # Clear search text after loading
+        self.update_chart()
 
     def validate_and_sync(self, label):
         if self._updating: return
@@ -341,223 +299,512 @@ class ProfessionalVedicAppV1:
             self._updating = True
             for k, val in zip(["Year", "Month", "Day", "Hour", "Minute", "Second"], [new_dt.year, new_dt.month, new_dt.day, new_dt.hour, new_dt.minute, new_dt.second]): 
                 self.time_vars[k].set(str(val))
-            self.cal.set_date(new_dt.date()); self._updating = False; self.update_chart()
+            self.set_cal_date(new_dt.date()); self._updating = False; self.update_chart()
         except: pass
 
-    def format_dms(self, deg_float):
-        d = int(deg_float % 30); m = int((deg_float * 60) % 60); s = int((deg_float * 3600) % 60)
-        return f"{d:02d}°{m:02d}'{s:02d}\""
-
-    def get_planet_status(self, name, lon, speed, sun_lon):
-        if name == "ASC": return ""
-        status = []
-        is_retro = (name in ["Rah", "Ket"]) or (name not in ["Sun", "Moo"] and speed < 0)
-        if is_retro: status.append("↓")
-        if name not in ["Sun", "Rah", "Ket", "Ura", "Nep", "Plu"]:
-            diff = abs(lon - sun_lon); diff = 360 - diff if diff > 180 else diff
-            limit = self.combust_limits.get(name, 15.0)
-            if is_retro: limit = 12.0 if name == "Mer" else 8.0 if name == "Ven" else limit
-            if diff <= limit: status.append("*")
-        return "".join(status)
-
-    def get_dignity_color(self, name, lon):
-        if name not in self.dignities: return "black"
-        sign_idx = int(lon/30); exalt_sign, _ = self.dignities[name]
-        if sign_idx == exalt_sign: return "green"
-        if sign_idx == (exalt_sign + 6) % 12: return "red"
-        return "black"
-
     def search_location(self):
         try:
-            loc = self.geolocator.geocode(self.ent_loc.get())
-            if loc: 
-                self.lat.set(round(loc.latitude, 4)); self.lon.set(round(loc.longitude, 4))
-                tz_name = self.tz_finder.timezone_at(lng=loc.longitude, lat=loc.latitude)
-                if tz_name:
-                    local_tz = pytz.timezone(tz_name)
-                    b_dt = datetime(int(self.time_vars["Year"].get()), int(self.time_vars["Month"].get()), int(self.time_vars["Day"].get()), int(self.time_vars["Hour"].get()), int(self.time_vars["Minute"].get()))
-                    self.tz.set(round(local_tz.utcoffset(b_dt).total_seconds() / 3600.0, 2))
+            with PROFILER.stage("geocode"): place = self.locations.resolve(self.ent_loc.get())
+            if place: 
+                self.lat.set(place["lat"]); self.lon.set(place["lon"])
+                if place["tz_name"]:
+                    import tzdb  # numpy stays out of startup
+                    dt = self.get_birth_dt()
+                    offset, flag = tzdb.offset_hours(place["tz_name"], dt)
+                    self.tz.set(round(offset, 4))
+                    if flag:
+                        why = "occurs twice (clocks were set back)" if flag == tzdb.AMBIGUOUS else "does not exist (clocks were set forward)"
+                        messagebox.showwarning("Birth Time", f"{dt:%Y-%m-%d %H:%M:%S} {why} in {place['tz_name']}. UTC{offset:+g} has been assumed; "
+                                               "correct the UTC offset if the record says otherwise.")
                 self.update_chart()
         except Exception as e: messagebox.showerror("Error", str(e))
 
-    def get_divisional_sign(self, lon, d_chart_val):
-        sign, rem = int(lon / 30), lon % 30
-        if d_chart_val == 2: return (4 if int(rem/15)==0 else 3) if sign%2==0 else (3 if int(rem/15)==0 else 4)
-        elif d_chart_val == 3: return (sign + int(rem/10)*4) % 12
-        elif d_chart_val == 4: return (sign + int(rem/7.5)*3) % 12
-        elif d_chart_val == 7: return (sign if sign%2==0 else (sign+6)%12 + int(rem/(30/7))) % 12
-        elif d_chart_val == 9: return int((lon*9)/30) % 12
-        elif d_chart_val == 10: return (sign if sign%2==0 else (sign+8)%12 + int(rem/3)) % 12
-        elif d_chart_val == 12: return (sign + int(rem/2.5)) % 12
-        elif d_chart_val == 16: return ((sign%3)*4 + int(rem/(30/16))) % 12
-        elif d_chart_val == 20: return ({0:0, 1:8, 2:4}[sign%3] + int(rem/1.5)) % 12
-        elif d_chart_val == 24: return ((4 if sign%2==0 else 3) + int(rem/1.25)) % 12
-        elif d_chart_val == 27: return ((sign%4)*3 + int(rem/(30/27))) % 12
-        elif d_chart_val == 30:
-            if sign%2==0: return 0 if rem<5 else 10 if rem<10 else 8 if rem<18 else 2 if rem<25 else 6
-            else: return 1 if rem<5 else 5 if rem<12 else 11 if rem<20 else 9 if rem<25 else 7
-        elif d_chart_val == 40: return ((0 if sign%2==0 else 6) + int(rem/0.75)) % 12
-        elif d_chart_val == 45: return ((sign%3)*4 + int(rem/(30/45))) % 12
-        elif d_chart_val == 60: return (sign + int(rem*2)) % 12
-        return sign
-
-    def update_chart(self):
-        try:
-            y, m, d, hr, mn, sc = [int(self.time_vars[k].get()) for k in ["Year", "Month", "Day", "Hour", "Minute", "Second"]]
-            curr_dt = datetime(y, m, d, hr, mn, sc)
-            utc_dt = curr_dt - timedelta(hours=self.tz.get())
-            jd = swe.julday(utc_dt.year, utc_dt.month, utc_dt.day, utc_dt.hour + utc_dt.minute/60.0 + utc_dt.second/3600.0)
-            swe.set_sid_mode(swe.SIDM_LAHIRI, 0, 0); flags = swe.FLG_SWIEPH | swe.FLG_SIDEREAL | swe.FLG_SPEED
-            for tree in [self.tree, self.panchang_tree, self.dasha_tree, self.antardasha_tree, self.pratyantar_tree]:
-                for row in tree.get_children(): tree.delete(row)
-            sun_lon = swe.calc_ut(jd, 0, flags)[0][0]
-            m_res = swe.calc_ut(jd, swe.MOON, flags)[0]; moon_long, moon_speed = m_res[0], m_res[3]
-            ascmc = swe.houses_ex(jd, self.lat.get(), self.lon.get(), b'A', flags)[1]
-            p_d1, p_div, t_d1, t_div = [[] for _ in range(12)], [[] for _ in range(12)], [[] for _ in range(12)], [[] for _ in range(12)]
-            d_val = self.d_charts[self.selected_d_label.get()]
-            for row_data in self.get_panchang_data(sun_lon, moon_long, moon_speed, jd, curr_dt): self.panchang_tree.insert("", "end", values=row_data)
-            objs = [("ASC", -1), ("Sun", 0), ("Moo", 1), ("Mar", 4), ("Mer", 2), ("Jup", 5), ("Ven", 3), ("Sat", 6), ("Rah", 11)]
-            if self.show_outer.get(): objs += [("Ura", swe.URANUS), ("Nep", swe.NEPTUNE), ("Plu", swe.PLUTO)]
-            for name, p_id in objs:
-                res = [ascmc[0], 0, 0, 0] if name == "ASC" else swe.calc_ut(jd, p_id, flags)[0]
-                lon, speed = res[0], res[3]; idx_d1, idx_div = int(lon/30), self.get_divisional_sign(lon, d_val)
-                st = self.get_planet_status(name, lon, speed, sun_lon); col = self.get_dignity_color(name, lon)
-                p_d1[idx_d1].append((f"{name}{st}", self.format_dms(lon), col))
-                p_div[idx_div].append((f"{name}{st}", self.format_dms(lon) if name == "ASC" else "", col))
-                n_idx = int(lon / (360/27))
-                self.tree.insert("", "end", values=(f"{name}{st}", self.format_dms(lon), self.signs[idx_d1], self.nakshatras[n_idx], int(((lon/(360/27))-n_idx)*4)+1, self.lord_order[n_idx%9], st))
-                if name == "Rah":
-                    k_lon = (lon + 180)%360; ks = self.get_planet_status("Ket", k_lon, speed, sun_lon)
-                    p_d1[int(k_lon/30)].append((f"Ket{ks}", self.format_dms(k_lon), "black"))
-                    p_div[self.get_divisional_sign(k_lon, d_val)].append((f"Ket{ks}", "", "black"))
-                    kn_idx = int(k_lon / (360/27))
-                    self.tree.insert("", "end", values=(f"Ket{ks}", self.format_dms(k_lon), self.signs[int(k_lon/30)], self.nakshatras[kn_idx], int(((k_lon/(360/27))-kn_idx)*4)+1, self.lord_order[kn_idx%9], ks))
-            
-            if self.show_transits.get():
-                jd_n = swe.julday(datetime.utcnow().year, datetime.utcnow().month, datetime.utcnow().day, datetime.utcnow().hour + datetime.utcnow().minute/60.0)
-                for n, pid in objs:
-                    if n == "ASC": continue
-                    r = swe.calc_ut(jd_n, pid, flags)[0][0]
-                    t_d1[int(r/30)].append((f"T-{n}", "", "darkorange"))
-                    t_div[self.get_divisional_sign(r, d_val)].append((f"T-{n}", "", "darkorange"))
-                    if n == "Rah":
-                        kr = (r + 180)%360
-                        t_d1[int(kr/30)].append(("T-Ket", "", "darkorange"))
-                        t_div[self.get_divisional_sign(kr, d_val)].append(("T-Ket", "", "darkorange"))
-
-            self.calculate_mahadasha(moon_long)
-            self.draw_chart(self.canvas_d1, p_d1, t_d1, int(ascmc[0]/30), "RASHI (D1)", show_dms=True)
-            self.draw_chart(self.canvas_div, p_div, t_div, self.get_divisional_sign(ascmc[0], d_val), self.selected_d_label.get(), show_dms=False)
-        except Exception as e: print(f"Update Error: {e}")
-
-    def get_sign_center(self, is_n, s_idx, a_idx):
-        if not is_n:
-            c, r = {11:(0,0), 0:(1,0), 1:(2,0), 2:(3,0), 10:(0,1), 3:(3,1), 9:(0,2), 4:(3,2), 8:(0,3), 7:(1,3), 6:(2,3), 5:(3,3)}[s_idx]
-            return (c*125 + 62.5, r*125 + 62.5)
-        h_idx = (s_idx - a_idx) % 12
-        return [(250,125), (125,62.5), (62.5,125), (125,250), (62.5,375), (125,437.5), (250,375), (375,437.5), (437.5,375), (375,250), (437.5,125), (375,62.5)][h_idx]
-
+    def get_birth_dt(self):
+        return datetime(*[int(self.time_vars[k].get()) for k in ["Year", "Month", "Day", "Hour", "Minute", "Second"]])
+
+    def update_chart(self, debounce_ms=None):
+        try: req = self.chart_request()
+        except Exception as e: self.render_error(e); return
+        self.scheduler.submit(req, debounce_ms)
+
+    def chart_request(self):
+        # Snapshot of the Tk inputs; the worker thread must never touch Tk variables.
+        return {"dt": self.get_birth_dt(), "tz": self.tz.get(), "lat": self.lat.get(), "lon": self.lon.get(), "outer": self.show_outer.get(),
+                "d_label": self.selected_d_label.get(), "d_val": self.d_charts[self.selected_d_label.get()], "transits": self.show_transits.get()}
+
+    def _stage(self, name, key, fn):
+        # Worker-side memo: a stage is recomputed only when its input key changes.
+        hit = self._stages.get(name)
+        if hit is not None and hit[0] == key: return hit[1]
+        val = fn(); self._stages[name] = (key, val)
+        return val
+
+    @PROFILER.timed("compute")
+    def compute_view(self, req):
+        d_val = req["d_val"]
+        core_key = (req["dt"], req["tz"], req["lat"], req["lon"], req["outer"])
+        core = self._stage("core", core_key, lambda: self._compute_core(req))
+        p_div, asc_div = self._stage("varga", (core_key, d_val), lambda: self._compute_varga(core, d_val))
+
+        t_d1, t_div = [[] for _ in range(12)], [[] for _ in range(12)]
+        if req["transits"]:
+            now = datetime.utcnow()
+            jd_n = swe.julday(now.year, now.month, now.day, now.hour + now.minute/60.0)
+            t_d1, t_div = self._stage("transits", (jd_n, req["outer"], d_val), lambda: self._compute_transits(jd_n, req["outer"], d_val))
+
+        view = [("d1", core["p_d1"], t_d1, core["asc_d1"], "RASHI (D1)", True), ("div", p_div, t_div, asc_div, req["d_label"], False)]
+        return {"rows": core["rows"], "panchang": core["panchang"], "dashas": core["dashas"], "dasha_tree": core["dasha_tree"], "view": view}
+
+    @staticmethod
+    def _compute_core(req):
+        chart = eng.compute_chart(req["dt"], req["tz"], req["lat"], req["lon"], {"outer": req["outer"], "dashas": False})
+        p_d1, rows = chart_render.natal_placements(chart["bodies"]), []
+        for b in chart["bodies"]:
+            name, lon, st = b["name"], b["lon"], b["status"]
+            n_idx = b["nakshatra"]
+            rows.append((f"{name}{st}", eng.format_dms(lon), eng.SIGNS[b["sign"]], eng.NAKSHATRAS[n_idx], b["pada"], eng.LORD_ORDER[n_idx%9], st))
+        with PROFILER.stage("dashas"):
+            tree = dasha.DashaTree(next(b["lon"] for b in chart["bodies"] if b["name"] == "Moo"), req["dt"])
+            dashas = ProfessionalVedicAppV1._dasha_rows(req["dt"], tree.mahas)
+        return {"chart": chart, "p_d1": p_d1, "rows": rows, "panchang": chart["panchang"], "dashas": dashas, "dasha_tree": tree, "asc_d1": int(chart["asc"]/30)}
+
+    @staticmethod
+    def _dasha_rows(birth, periods):
+        return [(p.label, f"{p.start_dt:%Y-%m-%d}", f"{p.end_dt:%Y-%m-%d}", eng.get_precise_age(birth, p.start_dt)) for p in periods]
+
+    @staticmethod
+    @PROFILER.timed("varga")
+    def _compute_varga(core, d_val):
+        return chart_render.varga_placements(core["chart"]["bodies"], d_val), eng.get_divisional_sign(core["chart"]["asc"], d_val)
+
+    @staticmethod
+    @PROFILER.timed("transits")
+    def _compute_transits(jd_n, outer, d_val):
+        positions = eng.transit_positions(jd_n, eng.chart_objs(outer))
+        return chart_render.transit_placements(positions), chart_render.transit_placements(positions, d_val)
+
+    @PROFILER.timed("treeview")
+    def _fill_tree(self, tree, rows):
+        # Update rows in place; only changed rows touch the widget. Returns True if anything changed.
+        shown = self._tree_rows.get(tree, [])
+        if shown == rows: return False
+        iids = tree.get_children()
+        for i, row in enumerate(rows):
+            if i < len(iids):
+                if i >= len(shown) or shown[i] != row: tree.item(iids[i], values=row)
+            else: tree.insert("", "end", values=row)
+        if len(iids) > len(rows): tree.delete(*iids[len(rows):])
+        self._tree_rows[tree] = list(rows)
+        return True
+
+    @PROFILER.timed("render")
+    def render_chart(self, res):
+        t0 = time.perf_counter()
+        self._last_res = res
+        self._fill_tree(self.tree, res["rows"])
+        canvases = {"d1": self.canvas_d1, "div": self.canvas_div}
+        self._chart_view = [(canvases[key],) + tuple(rest) for key, *rest in res["view"]]
+        self.redraw_charts(force=False)
+        if self.cal is not None: self.render_panels(res)
+        elif "first_chart_ms" not in self.startup:
+            # First paint: let the charts reach the screen, then fill the secondary panels.
+            self.startup["first_chart_ms"] = self._since_init()
+            self.root.after_idle(self.finish_startup)
+        self.show_timing((time.perf_counter() - t0) * 1000.0)
+
+    def render_error(self, e):
+        print(f"Update Error: {e}")
+        # A failed first compute must not hold back the panels and the calendar (or a --startup-timings exit).
+        if self.cal is None and "first_chart_ms" not in self.startup:
+            self.startup["first_chart_ms"] = self._since_init()
+            self.root.after_idle(self.finish_startup)
+
+    def render_panels(self, res):
+        if res is None: return
+        self._fill_tree(self.panchang_tree, res["panchang"])
+        self._dasha_nodes[0] = res["dasha_tree"].mahas
+        if self._fill_tree(self.dasha_tree, res["dashas"]): self.show_dasha_level(1, [])
+
+    def finish_startup(self):
+        self.root.update_idletasks()
+        self.render_panels(self._last_res)
+        self.startup["panels_ms"] = self._since_init()
+        self.build_calendar()
+        self.startup["ready_ms"] = self._since_init()
+        self.status_var.set("Startup: " + ", ".join(f"{k[:-3]} {v:.0f} ms" for k, v in self.startup.items()))
+        if self.report_startup:
+            print(json.dumps(self.startup), flush=True)
+            self.root.after(0, self.root.destroy)
+
+    def build_calendar(self):
+        from tkcalendar import DateEntry
+        y, m, d = (int(self.time_vars[k].get()) for k in ["Year", "Month", "Day"])
+        self.cal = DateEntry(self.cal_slot, width=12, background='darkblue', year=y, month=m, day=d)
+        self.cal.pack(); self.cal.bind("<<DateEntrySelected>>", self.sync_cal_to_vars)
+
+    def set_cal_date(self, d):
+        if self.cal is not None: self.cal.set_date(d)
+
+    def _since_init(self):
+        return round((time.perf_counter() - self.t_init) * 1000.0, 1)
+
+    def show_timing(self, render_ms):
+        stats = self.scheduler.latency_stats() if self.scheduler else None
+        msg = f"Render {render_ms:.0f} ms, {self.items_created} canvas items created"
+        if stats: msg += f" | input to paint {stats['last']:.0f} ms (p95 {stats['p95']:.0f}, max {stats['max']:.0f})"
+        self.status_var.set(msg)
+
+    def toggle_perf(self):
+        # The overlay sits over the top-left corner of the charts and refreshes twice a second.
+        on = self.show_perf.get()
+        PROFILER.enable(on or bool(self.perf_log_s))
+        if on: self.perf_label.place(x=22, y=2); self.perf_label.lift(); self.refresh_perf()
+        else: self.perf_label.place_forget()
+
+    def refresh_perf(self):
+        if not self.show_perf.get(): return
+        self.perf_label.config(text="\n".join(PROFILER.lines()) or "no samples yet")
+        self.root.after(500, self.refresh_perf)
+
+    def export_perf(self):
+        path = filedialog.asksaveasfilename(defaultextension=".json", initialfile="perf_stats.json", filetypes=[("JSON", "*.json")])
+        if path: PROFILER.export_json(path)
+
+    def log_perf(self):
+        if PROFILER.enabled: print(PROFILER.log_line(), file=sys.stderr, flush=True)
+        self.root.after(int(self.perf_log_s * 1000), self.log_perf)
+
+    def redraw_charts(self, force=True):
+        # Display-only toggles redraw the last computed placements without touching the ephemeris;
+        # after a recompute, a canvas whose placements did not change is left alone.
+        self.items_created = 0
+        for can, placements, transits, asc_idx, title, show_dms in self._chart_view:
+            if self.playback_frame is not None: transits = self.playback_frame["t_d1" if can is self.canvas_d1 else "t_div"]
+            args = (placements, transits, asc_idx, title, show_dms, self.north_style.get(), self.show_drishti.get())
+            if not force and self._drawn.get(can) == args: continue
+            self._drawn[can] = args
+            self.items_created += self.draw_chart(can, placements, transits, asc_idx, title, show_dms=show_dms)
+
+    @PROFILER.timed("draw_chart")
     def draw_chart(self, can, placements, transits, asc_idx, title, show_dms=False):
-        can.delete("all"); is_n = self.north_style.get()
-        if not is_n:
-            grid = {11:(0,0), 0:(1,0), 1:(2,0), 2:(3,0), 10:(0,1), 3:(3,1), 9:(0,2), 4:(3,2), 8:(0,3), 7:(1,3), 6:(2,3), 5:(3,3)}
-            for i in range(12):
-                c, r = grid[i]; can.create_rectangle(c*125, r*125, (c+1)*125, (r+1)*125, fill="#f1f8e9" if i == asc_idx else "white", outline="#cccccc")
-        else:
-            can.create_rectangle(0, 0, 500, 500, fill="white", outline="black")
-            can.create_line(0, 0, 500, 500); can.create_line(500, 0, 0, 500); can.create_line(250, 0, 500, 250); can.create_line(500, 250, 250, 500); can.create_line(250, 500, 0, 250); can.create_line(0, 250, 250, 0)
-        can.create_text(250, 250, text=title, font=("Arial", 12, "bold"), fill="darkblue")
-        if self.show_drishti.get():
-            am = {"Mar":[3,6,7], "Jup":[4,6,8], "Sat":[2,6,9], "Rah":[4,6,8], "Ket":[4,6,8], "Sun":[6], "Moo":[6], "Ven":[6], "Mer":[6]}
-            dc = {"Mar":"red", "Jup":"#DAA520", "Sat":"blue", "Rah":"brown", "Ket":"brown", "Sun":"orange", "Moo":"gray", "Ven":"magenta", "Mer":"green"}
-            for si in range(12):
-                for n, _, _ in placements[si]:
-                    bn = n[:3]
-                    if bn in am:
-                        for off in am[bn]:
-                            ts = (si+off)%12; x1, y1 = self.get_sign_center(is_n, si, asc_idx); x2, y2 = self.get_sign_center(is_n, ts, asc_idx)
-                            can.create_line(x1, y1, x2, y2, fill=dc.get(bn, "#eee"), dash=(2, 2))
-        for si in range(12):
-            cx, cy = self.get_sign_center(is_n, si, asc_idx)
-            if is_n: can.create_text(cx, cy-30, text=str(si+1), font=("Arial", 8), fill="gray")
-            items = placements[si] + transits[si]
-            for j, (n, d, col) in enumerate(items):
-                y_off = (cy - 45 + (j*14)) if is_n else ({11:0,0:0,1:0,2:0,10:1,3:1,9:2,4:2,8:3,7:3,6:3,5:3}[si]*125 + 15 + (j*(22 if show_dms else 16)))
-                can.create_text(cx, y_off, text=n, font=("Arial", 8, "bold"), fill=col)
-                if d and show_dms: can.create_text(cx, y_off + 10, text=d, font=("Arial", 7), fill="#555555")
+        return self.renderers[can].draw(placements, transits, asc_idx, title, show_dms, self.north_style.get(), self.show_drishti.get())
+
+    DASHA_TREES = ["dasha_tree", "antardasha_tree", "pratyantar_tree", "sookshma_tree", "prana_tree"]
 
     def setup_dasha_ui(self, parent):
-        for name, tree_attr in [("Mahadasha", "dasha_tree"), ("Antardasha", "antardasha_tree"), ("Pratyantar", "pratyantar_tree")]:
+        for level, (name, tree_attr) in enumerate(zip(dasha.LEVELS, self.DASHA_TREES)):
             frame = tk.LabelFrame(parent, text=f" {name} "); frame.pack(fill="x", padx=20, pady=5)
             cols = ("Planet", "Start Date", "End Date", "Age (Y-M-D)")
             tree = self._create_scrollable_tree(frame, cols, 5, [150]*len(cols))
+            tree.bind("<<TreeviewSelect>>", lambda e, lvl=level: self.on_dasha_select(lvl))
             setattr(self, tree_attr, tree)
-        self.dasha_tree.bind("<<TreeviewSelect>>", self.on_mahadasha_select)
-        self.antardasha_tree.bind("<<TreeviewSelect>>", self.on_antardasha_select)
 
-    def get_precise_age(self, event_date):
+    def setup_event_ui(self, parent):
+        frame = tk.LabelFrame(parent, text=" Event Finder "); frame.pack(fill="x", padx=20, pady=5)
+        ctl = tk.Frame(frame); ctl.pack(fill="x", pady=2)
+        tk.Label(ctl, text="From (Y-M-D):").pack(side=tk.LEFT, padx=5)
+        self.ev_from = tk.Entry(ctl, width=11); self.ev_from.insert(0, datetime.now().strftime('%Y-%m-%d')); self.ev_from.pack(side=tk.LEFT)
+        tk.Label(ctl, text="Days:").pack(side=tk.LEFT, padx=(10, 0))
+        self.ev_days = tk.IntVar(value=30); tk.Entry(ctl, textvariable=self.ev_days, width=6).pack(side=tk.LEFT)
+        tk.Label(ctl, text="Planet:").pack(side=tk.LEFT, padx=(10, 0))
+        self.ev_body = tk.StringVar(value="All")
+        ttk.Combobox(ctl, textvariable=self.ev_body, values=["All"] + [b[0] for b in events.BODIES + events.OUTER_BODIES], state="readonly", width=6).pack(side=tk.LEFT)
+        tk.Label(ctl, text="Varga:").pack(side=tk.LEFT, padx=(10, 0))
+        self.ev_varga = tk.StringVar(value="D1 (Rashi)")
+        ttk.Combobox(ctl, textvariable=self.ev_varga, values=["D1 (Rashi)"] + list(self.d_charts.keys()), state="readonly", width=20).pack(side=tk.LEFT)
+        tk.Button(ctl, text="Find Events", command=self.find_events).pack(side=tk.LEFT, padx=10)
+        self.event_tree = self._create_scrollable_tree(frame, ("Date & Time", "Planet", "Event", "Type"), 8, [180, 100, 320, 120])
+
+    def find_events(self):
         try:
-            birth = datetime(int(self.time_vars["Year"].get()), int(self.time_vars["Month"].get()), int(self.time_vars["Day"].get()))
-            if event_date <= birth: return "0y 0m 0d"
-            
-            years = event_date.year - birth.year
-            months = event_date.month - birth.month
-            days = event_date.day - birth.day
-
-            if days < 0:
-                months -= 1
-                prev_month = event_date.month - 1 if event_date.month > 1 else 12
-                prev_year = event_date.year if event_date.month > 1 else event_date.year - 1
-                days += calendar.monthrange(prev_year, prev_month)[1]
-            if months < 0:
-                years -= 1
-                months += 12
-            
-            return f"{years}y {months}m {days}d"
-        except: return "0y 0m 0d"
-
-    def calculate_mahadasha(self, moon_long):
-        nak_w = 360/27; nak_idx = int(moon_long / nak_w)
-        rem_frac = 1 - (moon_long % nak_w) / nak_w
-        lord = self.lord_order[nak_idx % 9]
-        total_yrs = self.dasha_years[lord]
-        birth = datetime(int(self.time_vars["Year"].get()), int(self.time_vars["Month"].get()), int(self.time_vars["Day"].get()), int(self.time_vars["Hour"].get()), int(self.time_vars["Minute"].get()), int(self.time_vars["Second"].get()))
-        
-        used_days = total_yrs * (1 - rem_frac) * 365.25
-        curr_start = birth - timedelta(days=used_days)
+            start = datetime.strptime(self.ev_from.get(), '%Y-%m-%d')
+            tz = self.tz.get(); jd0 = eng.local_to_jd(start, tz)
+            d_val = self.d_charts.get(self.ev_varga.get(), 1)
+            body = self.ev_body.get()
+            found = events.find_events(jd0, jd0 + max(1, self.ev_days.get()), vargas=sorted({1, d_val}), bodies=None if body == "All" else [body],
+                                      outer=self.show_outer.get() or body in {b[0] for b in events.OUTER_BODIES})  # an outer planet picked by name is searched even with Outer Planets off
+            for row in self.event_tree.get_children(): self.event_tree.delete(row)
+            for ev in found:
+                self.event_tree.insert("", "end", values=(eng.jd_to_local(ev["jd"], tz).strftime('%Y-%m-%d %H:%M:%S'), ev["body"], ev["detail"], ev["kind"].title()))
+        except Exception as e: messagebox.showerror("Error", str(e))
 
-        for i in range(9):
-            l = self.lord_order[(nak_idx + i) % 9]
-            end_date = curr_start + timedelta(days=self.dasha_years[l] * 365.25)
-            self.dasha_tree.insert("", "end", values=(l, curr_start.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d'), self.get_precise_age(curr_start)))
-            curr_start = end_date
+    # --- Transit Playback ---
+    # A producer thread fills a bounded ring with precomputed transit frames; the Tk loop takes
+    # whichever frame is due on each tick, skipping any it is too slow to paint.
+    def setup_playback_ui(self, parent):
+        frame = tk.LabelFrame(parent, text=" Transit Playback "); frame.pack(fill="x", padx=20, pady=5)
+        tk.Label(frame, text="From (Y-M-D):").pack(side=tk.LEFT, padx=5)
+        self.pb_from = tk.Entry(frame, width=11); self.pb_from.insert(0, datetime.now().strftime('%Y-%m-%d')); self.pb_from.pack(side=tk.LEFT)
+        tk.Label(frame, text="Step:").pack(side=tk.LEFT, padx=(10, 0))
+        self.pb_rate = tk.StringVar(value="1 week")
+        rate_cb = ttk.Combobox(frame, textvariable=self.pb_rate, values=list(playback.RATES), state="readonly", width=8); rate_cb.pack(side=tk.LEFT)
+        rate_cb.bind("<<ComboboxSelected>>", lambda e: self.restart_playback())
+        tk.Label(frame, text="FPS:").pack(side=tk.LEFT, padx=(10, 0))
+        self.pb_fps = tk.IntVar(value=24)
+        fps_cb = ttk.Combobox(frame, textvariable=self.pb_fps, values=[5, 10, 15, 24, 30, 60], state="readonly", width=4); fps_cb.pack(side=tk.LEFT)
+        fps_cb.bind("<<ComboboxSelected>>", lambda e: self.play_clock and self.play_clock.restart(self.playback_frame["index"] if self.playback_frame else 0, self.pb_fps.get()))
+        self.pb_button = tk.Button(frame, text="Play", width=6, command=self.toggle_playback); self.pb_button.pack(side=tk.LEFT, padx=(10, 2))
+        tk.Button(frame, text="Stop", width=6, command=self.stop_playback).pack(side=tk.LEFT, padx=2)
+        self.pb_status = tk.StringVar(value="")
+        tk.Label(frame, textvariable=self.pb_status, font=("Arial", 8), fg="gray").pack(side=tk.LEFT, padx=10)
+
+    def start_player(self, jd_start):
+        if self.player: self.player.stop()
+        self.player = playback.TransitProducer(jd_start, playback.RATES[self.pb_rate.get()], eng.chart_objs(self.show_outer.get()), self.d_charts[self.selected_d_label.get()])
+        self.play_clock = playback.PlaybackClock(self.pb_fps.get())
+
+    def toggle_playback(self):
+        if self.playing:
+            self.playing = False; self.pb_button.config(text="Play"); return
+        try:
+            if self.player is None: self.start_player(eng.local_to_jd(datetime.strptime(self.pb_from.get(), '%Y-%m-%d'), self.tz.get()))
+            else: self.play_clock.restart(self.playback_frame["index"] + 1 if self.playback_frame else 0, self.pb_fps.get())
+        except Exception as e: messagebox.showerror("Error", str(e)); return
+        self.playing = True; self.pb_button.config(text="Pause")
+        self.playback_tick()
+
+    def restart_playback(self):
+        # Step, varga or body set changed: recompute frames from the one on screen.
+        if self.player is None: return
+        jd = self.playback_frame["jd"] if self.playback_frame else self.player.jd_start
+        self.start_player(jd)
+        if not self.playing and self.playback_frame: self.playback_frame = None; self.redraw_charts(force=False)
+
+    def stop_playback(self):
+        if self.player: self.player.stop()
+        self.player = self.play_clock = self.playback_frame = None
+        self.playing = False; self.pb_button.config(text="Play"); self.pb_status.set("")
+        self.redraw_charts(force=False)
+
+    def playback_tick(self):
+        if not self.playing or self.player is None: return
+        if self.player.error: messagebox.showerror("Error", str(self.player.error)); self.stop_playback(); return
+        with PROFILER.stage("playback.frame"):
+            frame, dropped = self.player.ring.take_until(self.play_clock.due())
+            if frame is not None:
+                self.playback_frame = frame
+                self.redraw_charts(force=False)
+                self.play_clock.painted_frame(dropped)
+        if self.playback_frame:
+            when = eng.jd_to_local(self.playback_frame["jd"], self.tz.get()).strftime('%Y-%m-%d %H:%M')
+            c = self.play_clock
+            self.pb_status.set(f"{when}  |  {c.achieved_fps()}/{c.fps} fps  |  dropped {c.dropped}  |  buffered {len(self.player.ring)}")
+        self.root.after(max(1, int(1000 / self.play_clock.fps)), self.playback_tick)
+
+    def open_rectifier(self):
+        win = tk.Toplevel(self.root); win.title("Birth Time Rectification")
+        ctl = tk.Frame(win); ctl.pack(fill="x", pady=2)
+        tk.Label(ctl, text="Window +/- minutes:").pack(side=tk.LEFT, padx=5)
+        minutes = tk.IntVar(value=30); tk.Entry(ctl, textvariable=minutes, width=5).pack(side=tk.LEFT)
+        moon = tk.BooleanVar(value=True); tk.Checkbutton(ctl, text="Moon padas", variable=moon).pack(side=tk.LEFT, padx=10)
+        tk.Button(ctl, text="Find", command=lambda: self.find_rectification(minutes.get(), moon.get())).pack(side=tk.LEFT, padx=10)
+        tk.Label(ctl, text="Double-click an interval to set the birth time to its middle.", fg="gray").pack(side=tk.LEFT, padx=10)
+        cols = ("From", "To", "Length", "Lagna D1", "Lagna Varga", "Moon", "All Vargas (D1 ... D60)", "Change at Start")
+        self.rect_tree = self._create_scrollable_tree(win, cols, 24, [70, 70, 60, 90, 150, 150, 420, 420])
+        self.rect_tree.bind("<Double-1>", self.apply_rectification)
+        self.rect_intervals = []
+        self.find_rectification(minutes.get(), moon.get())
+
+    def find_rectification(self, minutes, moon_padas):
+        try:
+            tz, d_label = self.tz.get(), self.selected_d_label.get()
+            d_val = self.d_charts[d_label]
+            self.rect_intervals = rectify.rectify(self.get_birth_dt(), tz, self.lat.get(), self.lon.get(), max(1, minutes), moon_padas=moon_padas)
+            for row in self.rect_tree.get_children(): self.rect_tree.delete(row)
+            self.rect_tree.heading("Lagna Varga", text=f"Lagna {d_label.split()[0]}")
+            for iv in self.rect_intervals:
+                secs = (iv["end"] - iv["start"]) * 86400.0
+                nak, pada = iv["moon"]
+                self.rect_tree.insert("", "end", values=(eng.jd_to_local(iv["start"], tz).strftime('%H:%M:%S'), eng.jd_to_local(iv["end"], tz).strftime('%H:%M:%S'),
+                    f"{int(secs // 60)}m {int(secs % 60):02d}s", eng.SIGNS[iv["signs"][1]], eng.SIGNS[iv["signs"][d_val]], f"{eng.NAKSHATRAS[nak]} {pada}",
+                    " ".join(eng.SIGNS[iv["signs"][d]][:3] for d in eng.VARGAS), "; ".join(iv["changes"])))
+        except Exception as e: messagebox.showerror("Error", str(e))
 
-    def on_mahadasha_select(self, e):
-        sel = self.dasha_tree.selection()
+    def apply_rectification(self, e):
+        sel = self.rect_tree.selection()
         if not sel: return
-        lord, start_str, _, _ = self.dasha_tree.item(sel[0], "values")
-        curr_a = datetime.strptime(start_str, '%Y-%m-%d')
-        for t in [self.antardasha_tree, self.pratyantar_tree]:
-            for row in t.get_children(): t.delete(row)
-        for i in range(9):
-            al = self.lord_order[(self.lord_order.index(lord) + i) % 9]
-            a_dur = (self.dasha_years[lord] * self.dasha_years[al]) / 120.0
-            a_end = curr_a + timedelta(days=a_dur * 365.25)
-            self.antardasha_tree.insert("", "end", values=(f"{lord}-{al}", curr_a.strftime('%Y-%m-%d'), a_end.strftime('%Y-%m-%d'), self.get_precise_age(curr_a)))
-            curr_a = a_end
-
-    def on_antardasha_select(self, e):
-        sel = self.antardasha_tree.selection()
+        iv = self.rect_intervals[self.rect_tree.index(sel[0])]
+        mid = eng.jd_to_local((iv["start"] + iv["end"]) / 2, self.tz.get())
+        mid = mid.replace(microsecond=0)
+        self._updating = True
+        for k, val in zip(["Year", "Month", "Day", "Hour", "Minute", "Second"], [mid.year, mid.month, mid.day, mid.hour, mid.minute, mid.second]):
+            self.time_vars[k].set(str(val))
+        self.set_cal_date(mid.date()); self._updating = False; self.update_chart()
+
+    def open_matcher(self):
+        import matching  # numpy stays out of startup
+        win = tk.Toplevel(self.root); win.title("Ashtakoota Matching")
+        ctl = tk.Frame(win); ctl.pack(fill="x", pady=2)
+        tk.Label(ctl, text="Current chart is the:").pack(side=tk.LEFT, padx=5)
+        role = tk.StringVar(value="boy")
+        ttk.Combobox(ctl, textvariable=role, values=["boy", "girl"], state="readonly", width=6).pack(side=tk.LEFT)
+        tk.Label(ctl, text="Top:").pack(side=tk.LEFT, padx=(10, 0))
+        top = tk.IntVar(value=50); tk.Entry(ctl, textvariable=top, width=5).pack(side=tk.LEFT)
+        tk.Button(ctl, text="Find", command=lambda: self.find_matches(matching.GENDERS[role.get()], top.get())).pack(side=tk.LEFT, padx=10)
+        self.match_status = tk.StringVar(value="")
+        tk.Label(ctl, textvariable=self.match_status, fg="gray").pack(side=tk.LEFT, padx=10)
+        cols = ("Name", "Total", *matching.KOOTAS, "Moon")
+        self.match_tree = self._create_scrollable_tree(win, cols, 24, [180, 60] + [80] * len(matching.KOOTAS) + [160])
+        if self.match_scheduler is None:
+            self.match_scheduler = LatestWinsScheduler(self.root, self.compute_matches, self.render_matches, self.render_match_error, metric="match.input_to_paint")
+        self.find_matches(matching.BOY, top.get())
+
+    def open_query(self):
+        import chart_index  # numpy stays out of startup
+        win = tk.Toplevel(self.root); win.title("Chart Query")
+        ctl = tk.Frame(win); ctl.pack(fill="x", pady=2)
+        self.query_var = tk.StringVar(value="Moo.nak = Rohini and Jup.D9.dignity = exalted")
+        ent = tk.Entry(ctl, textvariable=self.query_var, width=80); ent.pack(side=tk.LEFT, padx=5)
+        ent.bind("<Return>", lambda e: self.run_query())
+        tk.Button(ctl, text="Run", command=self.run_query).pack(side=tk.LEFT, padx=5)
+        self.query_status = tk.StringVar(value="")
+        tk.Label(ctl, textvariable=self.query_status, fg="gray").pack(side=tk.LEFT, padx=10)
+        tk.Label(win, text="Attributes: sign (default), nak, pada, lon, deg, retro, combust, dignity; e.g. Sat.combust and Sat.sign = Capricorn, Mar.D9 in (Aries, Scorpio). "
+                 "Double-click a row to load the profile.", fg="gray", font=("Arial", 8)).pack(anchor="w", padx=5)
+        self.query_tree = self._create_scrollable_tree(win, ("Name", "Lagna", "Moon", "Nakshatra"), 24, [220, 110, 110, 160])
+        self.query_tree.bind("<Double-1>", self.load_query_result)
+        # Saving the index is deferred to the window closing; anything lost is redone by the next refresh.
+        win.protocol("WM_DELETE_WINDOW", lambda: (self.chart_index_ready and self.chart_index.flush(), win.destroy()))
+        if self.chart_index is None:
+            self.chart_index = chart_index.ChartIndex.for_store(self.store)
+            self.query_status.set("Indexing profiles...")
+            # The first build computes every chart, so it runs off the Tk thread; the SQLite
+            # connection belongs to this thread, so the worker reads through its own store.
+            def build():
+                from profile_store import open_store
+                store = open_store(self.store.path)
+                try: self._index_error = None; self.chart_index.refresh(store)
+                except Exception as e: self._index_error = e
+                finally: store.close()
+            self._index_thread = threading.Thread(target=build, daemon=True); self._index_thread.start()
+        self.root.after(100, self._poll_index)
+
+    def _poll_index(self):
+        if self._index_thread.is_alive(): self.root.after(100, self._poll_index); return
+        if self._index_error: self.query_status.set(f"Indexing failed: {self._index_error}"); self.chart_index = None; return
+        self.chart_index_ready = True
+        self.run_query()
+
+    def run_query(self):
+        if not self.chart_index_ready: return
+        from chart_index import QueryError
+        try:
+            t0 = time.perf_counter()
+            with PROFILER.stage("query"): names = self.chart_index.query(self.query_var.get())
+            ms = (time.perf_counter() - t0) * 1000
+        except QueryError as e: self.query_status.set(f"Error: {e}"); return
+        idx = self.chart_index
+        lagna, moon, nak, pada = idx.column("ASC"), idx.column("Moo"), idx.column("Moo", "nak"), idx.column("Moo", "pada")
+        for row in self.query_tree.get_children(): self.query_tree.delete(row)
+        for name in names[:PAGE_SIZE * 5]:
+            i = idx.rows[name]
+            self.query_tree.insert("", "end", values=(name, eng.SIGNS[lagna[i]], eng.SIGNS[moon[i]], f"{eng.NAKSHATRAS[nak[i]]} {pada[i]}"))
+        shown = "" if len(names) <= PAGE_SIZE * 5 else f", first {PAGE_SIZE * 5} shown"
+        self.query_status.set(f"{len(names)} of {len(idx)} profiles match ({ms:.1f} ms{shown})")
+
+    def load_query_result(self, e):
+        sel = self.query_tree.selection()
         if not sel: return
-        dashas, start_str, _, _ = self.antardasha_tree.item(sel[0], "values")
-        ml, al = dashas.split("-"); curr_p = datetime.strptime(start_str, '%Y-%m-%d')
-        for row in self.pratyantar_tree.get_children(): self.pratyantar_tree.delete(row)
-        for i in range(9):
-            pl = self.lord_order[(self.lord_order.index(al) + i) % 9]
-            p_dur = (self.dasha_years[ml] * self.dasha_years[al] * self.dasha_years[pl]) / 14400.0
-            p_end = curr_p + timedelta(days=p_dur * 365.25)
-            self.pratyantar_tree.insert("", "end", values=(f"{al}-{pl}", curr_p.strftime('%Y-%m-%d'), p_end.strftime('%Y-%m-%d'), self.get_precise_age(curr_p)))
-            curr_p = p_end
+        self.search_var.set(self.query_tree.item(sel[0], "values")[0])
+        self.load_profile()
+
+    def open_gochara(self):
+        win = tk.Toplevel(self.root); win.title("Gochara Timeline")
+        ctl = tk.Frame(win); ctl.pack(fill="x", pady=2)
+        tk.Label(ctl, text="From (Y-M-D):").pack(side=tk.LEFT, padx=5)
+        self.go_from = tk.Entry(ctl, width=11); self.go_from.insert(0, datetime.now().strftime('%Y-%m-%d')); self.go_from.pack(side=tk.LEFT)
+        tk.Label(ctl, text="Years:").pack(side=tk.LEFT, padx=(10, 0))
+        self.go_years = tk.IntVar(value=30); tk.Entry(ctl, textvariable=self.go_years, width=4).pack(side=tk.LEFT)
+        tk.Label(ctl, text="Planet:").pack(side=tk.LEFT, padx=(10, 0))
+        self.go_body = tk.StringVar(value="All")
+        ttk.Combobox(ctl, textvariable=self.go_body, values=["All"] + gochara.TRANSITS, state="readonly", width=5).pack(side=tk.LEFT)
+        tk.Label(ctl, text="Show:").pack(side=tk.LEFT, padx=(10, 0))
+        self.go_kind = tk.StringVar(value="All")
+        ttk.Combobox(ctl, textvariable=self.go_kind, values=["All", *gochara.KINDS], state="readonly", width=10).pack(side=tk.LEFT)
+        tk.Button(ctl, text="Generate", command=self.run_gochara).pack(side=tk.LEFT, padx=10)
+        self.go_status = tk.StringVar(value="")
+        tk.Label(ctl, textvariable=self.go_status, fg="gray").pack(side=tk.LEFT, padx=10)
+        self.go_tree = self._create_scrollable_tree(win, ("Start", "End", "Days", "Planet", "Detail"), 24, [140, 140, 70, 60, 260])
+        self._go_thread = None
+
+    def run_gochara(self):
+        if self._go_thread and self._go_thread.is_alive(): return
+        try:
+            start = datetime.strptime(self.go_from.get(), '%Y-%m-%d')
+            dt, years = self.get_birth_dt(), max(1, self.go_years.get())
+        except Exception as e: messagebox.showerror("Error", str(e)); return
+        rec = {"name": self.ent_name.get(), "tz": self.tz.get(), "lat": self.lat.get(), "lon": self.lon.get(),
+               **{k: getattr(dt, k) for k in ("year", "month", "day", "hour", "minute", "second")}}
+        bodies = gochara.TRANSITS if self.go_body.get() == "All" else [self.go_body.get()]
+        kinds = gochara.KINDS if self.go_kind.get() == "All" else [self.go_kind.get()]
+        self.go_status.set("Computing transits...")
+        # Ingress scans for a new span take seconds (the true node dominates); later runs reuse them.
+        def work():
+            t0 = time.perf_counter()
+            try: self._go_result = (list(gochara.rows_for(rec, years, start, bodies, kinds)), time.perf_counter() - t0)
+            except Exception as e: self._go_result = e
+        self._go_thread = threading.Thread(target=work, daemon=True); self._go_thread.start()
+        self.root.after(100, self._poll_gochara)
+
+    def _poll_gochara(self):
+        if self._go_thread.is_alive(): self.root.after(100, self._poll_gochara); return
+        if isinstance(self._go_result, Exception): self.go_status.set(f"Error: {self._go_result}"); return
+        rows, secs = self._go_result
+        for row in self.go_tree.get_children(): self.go_tree.delete(row)
+        for r in rows:
+            start = ("< " if r["open_start"] else "") + r["start"][:16].replace("T", " ")
+            end = r["end"][:16].replace("T", " ") + (" >" if r["open_end"] else "")
+            self.go_tree.insert("", "end", values=(start, end, f"{r['days']:.1f}", r["body"], r["detail"]))
+        self.go_status.set(f"{len(rows)} intervals in {secs:.1f} s")
+
+    # Refreshing the index reads every stored profile, so it and the scoring run on the match
+    # scheduler's worker; the Tk thread only reads the inputs and fills the table.
+    def find_matches(self, role, top):
+        try: jd = eng.local_to_jd(self.get_birth_dt(), self.tz.get())
+        except Exception as e: messagebox.showerror("Error", str(e)); return
+        self.match_status.set("Scoring profiles...")
+        self.match_scheduler.submit({"jd": jd, "role": role, "top": max(1, top), "exclude": [self.ent_name.get()]}, 0)
+
+    def compute_matches(self, req):
+        import matching
+        from profile_store import open_store
+        t0 = time.perf_counter()
+        # The SQLite connection belongs to the Tk thread, so the worker reads through its own store.
+        store = open_store(self.store.path)
+        try:
+            if self.moon_index is None: self.moon_index = matching.MoonIndex.for_store(store)
+            with PROFILER.stage("match.index"): self.moon_index.refresh(store)
+        finally: store.close()
+        moon = matching.moon_longitude(req["jd"])
+        with PROFILER.stage("match.score"): found = matching.match(moon, self.moon_index, req["role"], req["top"], exclude=req["exclude"])
+        return found, len(self.moon_index.names), (time.perf_counter() - t0) * 1000
+
+    def render_matches(self, res):
+        found, n, ms = res
+        if not self.match_tree.winfo_exists(): return
+        for row in self.match_tree.get_children(): self.match_tree.delete(row)
+        for m in found:
+            self.match_tree.insert("", "end", values=(m["name"], f"{m['total']:g}", *(f"{v:g}" for v in m["kootas"].values()), m["moon"]))
+        self.match_status.set(f"{n} profiles scored in {ms:.0f} ms")
+
+    def render_match_error(self, e):
+        if self.match_tree.winfo_exists(): self.match_status.set(f"Error: {e}")
+
+    def show_dasha_level(self, level, periods):
+        # Fill one dasha level from tree nodes and clear every level below it.
+        for lvl in range(level, len(self.DASHA_TREES)):
+            tree = getattr(self, self.DASHA_TREES[lvl])
+            for row in tree.get_children(): tree.delete(row)
+            self._tree_rows.pop(tree, None); self._dasha_nodes[lvl] = []
+        self._dasha_nodes[level] = periods
+        tree = getattr(self, self.DASHA_TREES[level])
+        for row in self._dasha_rows(periods[0].tree.birth, periods) if periods else []: tree.insert("", "end", values=row)
+
+    def on_dasha_select(self, level):
+        tree = getattr(self, self.DASHA_TREES[level])
+        sel = tree.selection()
+        if not sel or level + 1 >= len(self.DASHA_TREES): return
+        self.show_dasha_level(level + 1, self._dasha_nodes[level][tree.index(sel[0])].children)
 
     def sync_cal_to_vars(self, e=None):
         if self._updating: return
@@ -570,9 +817,14 @@ class ProfessionalVedicAppV1:
         try:
             if label in ["Year", "Month", "Day"]:
                 y, m, d = [int(self.time_vars[k].get()) for k in ["Year", "Month", "Day"]]
-                self._updating = True; self.cal.set_date(datetime(y, m, d)); self._updating = False
+                self._updating = True; self.set_cal_date(datetime(y, m, d)); self._updating = False
             self.update_chart()
         except: pass
 
+COMMANDS = {"batch": "batch_cli", "panchang": "panchang", "serve": "server", "match": "matching", "query": "chart_index", "gochara": "gochara", "export": "chart_export"}
+
 if __name__ == "__main__":
-    root = tk.Tk(); app = ProfessionalVedicAppV1(root); root.mainloop()
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        sys.exit(importlib.import_module(COMMANDS[sys.argv[1]]).main(sys.argv[2:]))
+    perf_log_s = float(sys.argv[sys.argv.index("--perf-log") + 1]) if "--perf-log" in sys.argv[:-1] else 0
+    root = tk.Tk(); app = ProfessionalVedicAppV1(root, report_startup="--startup-timings" in sys.argv, perf="--perf" in sys.argv, perf_log_s=perf_log_s); root.mainloop()
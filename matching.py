@@ -0,0 +1,231 @@
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+import swisseph as swe
+
+import chart_engine as eng
+from ephemeris import EPHEMERIS
+
+KOOTAS = ("Varna", "Vashya", "Tara", "Yoni", "Graha Maitri", "Gana", "Bhakoot", "Nadi")
+MAX_POINTS = (1, 2, 3, 4, 5, 6, 7, 8)  # 36 in all
+# Every koota depends only on the Moon's nakshatra, sign and half-sign; pada (3 deg 20') and
+# half-sign (15 deg) boundaries all fall on a 1 deg 40' grid, so 216 cells cover every case.
+CELL = 5 / 3
+CELLS = 216
+BOY, GIRL = 1, 2
+GENDERS = {"m": BOY, "male": BOY, "boy": BOY, "f": GIRL, "female": GIRL, "girl": GIRL}
+
+
+# --- Koota tables ---
+VARNA = [2, 1, 0, 3, 2, 1, 0, 3, 2, 1, 0, 3]  # by sign: Brahmin 3, Kshatriya 2, Vaishya 1, Shudra 0
+# Vashya group by half-sign: Chatushpada, Manava, Jalachara, Vanachara, Keeta
+VASHYA = [0, 0, 0, 0, 1, 1, 2, 2, 3, 3, 1, 1, 1, 1, 4, 4, 1, 0, 0, 2, 1, 1, 2, 2]
+VASHYA_POINTS = [[2, 1, 1, 0.5, 1], [1, 2, 0.5, 0, 1], [1, 0.5, 2, 1, 1], [0.5, 0, 1, 2, 0], [1, 1, 1, 0, 2]]
+# Yoni animal by nakshatra: Horse, Elephant, Sheep, Serpent, Dog, Cat, Rat, Cow, Buffalo, Tiger, Deer, Monkey, Mongoose, Lion
+YONI = [0, 1, 2, 3, 3, 4, 5, 2, 5, 6, 6, 7, 8, 9, 8, 9, 10, 10, 4, 11, 12, 11, 13, 0, 13, 7, 1]
+YONI_POINTS = [
+    [4, 2, 2, 3, 2, 2, 2, 1, 0, 1, 3, 3, 2, 1], [2, 4, 3, 3, 2, 2, 2, 2, 3, 1, 2, 3, 2, 0],
+    [2, 3, 4, 2, 1, 2, 1, 3, 3, 1, 2, 0, 3, 1], [3, 3, 2, 4, 2, 1, 1, 1, 1, 2, 2, 2, 0, 2],
+    [2, 2, 1, 2, 4, 2, 1, 2, 2, 1, 0, 2, 1, 1], [2, 2, 2, 1, 2, 4, 0, 2, 2, 1, 3, 3, 2, 1],
+    [2, 2, 1, 1, 1, 0, 4, 2, 2, 2, 2, 2, 1, 2], [1, 2, 3, 1, 2, 2, 2, 4, 3, 0, 3, 2, 2, 1],
+    [0, 3, 3, 1, 2, 2, 2, 3, 4, 1, 2, 2, 2, 1], [1, 1, 1, 2, 1, 1, 2, 0, 1, 4, 1, 1, 2, 1],
+    [3, 2, 2, 2, 0, 3, 2, 3, 2, 1, 4, 2, 2, 1], [3, 3, 0, 2, 2, 3, 2, 2, 2, 1, 2, 4, 3, 2],
+    [2, 2, 3, 0, 1, 2, 1, 2, 2, 2, 2, 3, 4, 2], [1, 0, 1, 2, 1, 1, 2, 1, 1, 1, 1, 2, 2, 4]]
+# Sign lords and natural friendships (2 friend, 1 neutral, 0 enemy): Sun, Moon, Mars, Mercury, Jupiter, Venus, Saturn
+SIGN_LORD = [2, 5, 3, 1, 0, 3, 5, 2, 4, 6, 6, 4]
+FRIENDSHIP = [[2, 2, 2, 1, 2, 0, 0], [2, 2, 1, 2, 1, 1, 1], [2, 2, 2, 0, 2, 1, 1], [2, 0, 1, 2, 1, 2, 1],
+              [2, 2, 2, 0, 2, 0, 1], [0, 0, 1, 2, 1, 2, 2], [0, 0, 0, 2, 1, 2, 2]]
+MAITRI_POINTS = {(2, 2): 5, (2, 1): 4, (1, 1): 3, (2, 0): 1, (1, 0): 0.5, (0, 0): 0}
+GANA = [0, 1, 2, 1, 0, 1, 0, 0, 2, 2, 1, 1, 0, 2, 0, 2, 0, 2, 2, 1, 1, 0, 2, 2, 1, 1, 0]  # Deva, Manushya, Rakshasa
+GANA_POINTS = [[6, 6, 1], [5, 6, 0], [1, 0, 6]]  # boy's gana (row) against the girl's
+NADI = [(0, 1, 2, 2, 1, 0)[n % 6] for n in range(27)]  # Adi, Madhya, Antya
+
+def _maitri(a, b):
+    if a == b: return 5
+    x, y = FRIENDSHIP[a][b], FRIENDSHIP[b][a]
+    return MAITRI_POINTS[max(x, y), min(x, y)]
+
+def _tara(frm, to):
+    return 0 if (to - frm) % 27 % 9 + 1 in (3, 5, 7) else 1.5
+
+@lru_cache(maxsize=None)
+def koota_table():
+    # points[boy_cell, girl_cell, koota], float32, shape (216, 216, 8).
+    c = np.arange(CELLS)
+    nak, sign, half = c // 8, c // 18, c // 9
+    b, g = np.meshgrid(c, c, indexing="ij")
+    nb, ng, sb, sg = nak[b], nak[g], sign[b], sign[g]
+    out = np.empty((CELLS, CELLS, 8), dtype=np.float32)
+    out[..., 0] = np.array(VARNA)[sb] >= np.array(VARNA)[sg]
+    out[..., 1] = np.array(VASHYA_POINTS)[np.array(VASHYA)[half[b]], np.array(VASHYA)[half[g]]]
+    tara = np.array([[_tara(i, j) for j in range(27)] for i in range(27)])
+    out[..., 2] = tara[ng, nb] + tara[nb, ng]
+    out[..., 3] = np.array(YONI_POINTS)[np.array(YONI)[nb], np.array(YONI)[ng]]
+    out[..., 4] = np.array([[_maitri(i, j) for j in range(7)] for i in range(7)])[np.array(SIGN_LORD)[sb], np.array(SIGN_LORD)[sg]]
+    out[..., 5] = np.array(GANA_POINTS)[np.array(GANA)[nb], np.array(GANA)[ng]]
+    out[..., 6] = np.where(np.isin((sb - sg) % 12 + 1, (2, 12, 5, 9, 6, 8)), 0, 7)
+    out[..., 7] = np.where(np.array(NADI)[nb] == np.array(NADI)[ng], 0, 8)
+    return out
+
+def moon_cell(lon):
+    return np.clip((np.asarray(lon, dtype=float) % 360 / CELL).astype(np.int16), 0, CELLS - 1)
+
+def score(boy_lon, girl_lon):
+    # Koota points for one pair (or broadcast arrays of pairs), shape (..., 8).
+    return koota_table()[moon_cell(boy_lon), moon_cell(girl_lon)]
+
+def moon_longitude(jd):
+    EPHEMERIS.set_sid_mode(swe.SIDM_LAHIRI)
+    return EPHEMERIS.raw_calc_ut(jd, swe.MOON, eng.FLAGS)[0][0]
+
+
+# --- Cached Moon positions of every stored profile ---
+# Kept next to the profile database; a refresh only computes the Moon for profiles that are new
+# or whose birth instant changed.
+class MoonIndex:
+    def __init__(self, path):
+        self.path = path
+        self.names, self.jds, self.moons, self.genders = np.array([], dtype=str), np.empty(0), np.empty(0), np.empty(0, dtype=np.int8)
+        if os.path.exists(path):
+            with np.load(path) as z: self.names, self.jds, self.moons, self.genders = z["names"], z["jds"], z["moons"], z["genders"]
+        self._cells = None
+
+    @classmethod
+    def for_store(cls, store):
+        return cls(os.path.splitext(store.path)[0] + ".moon.npz")
+
+    @property
+    def cells(self):
+        if self._cells is None: self._cells = moon_cell(self.moons)
+        return self._cells
+
+    def refresh(self, store):
+        cached = {n: (jd, m) for n, jd, m in zip(self.names.tolist(), self.jds.tolist(), self.moons.tolist())}
+        names, jds, moons, genders, computed = [], [], [], [], 0
+        for d in store.iter_profiles():
+            try: dt, tz, _, _ = eng.parse_record(d)
+            except (KeyError, TypeError, ValueError): continue
+            jd = eng.local_to_jd(dt, tz)
+            hit = cached.get(d["name"])
+            if hit is not None and hit[0] == jd: moon = hit[1]
+            else: moon = moon_longitude(jd); computed += 1
+            names.append(d["name"]); jds.append(jd); moons.append(moon); genders.append(GENDERS.get(str(d.get("gender", "")).lower(), 0))
+        if computed or len(names) != len(self.names):
+            self.names, self.jds, self.moons, self.genders = np.array(names, dtype=str), np.array(jds), np.array(moons), np.array(genders, dtype=np.int8)
+            self._cells = None
+            self.save()
+        return computed
+
+    def save(self):
+        tmp = self.path + ".tmp.npz"
+        np.savez(tmp, names=self.names, jds=self.jds, moons=self.moons, genders=self.genders)
+        os.replace(tmp, self.path)
+
+
+# --- Matching ---
+def match(client_moon, index, role=BOY, top=20, exclude=()):
+    # Scores the client against every indexed profile in one gather; best totals first, then by name.
+    table = koota_table()
+    c = moon_cell(client_moon)
+    points = table[c, index.cells] if role == BOY else table[index.cells, c]
+    total = points.sum(axis=1)
+    keep = index.genders != role
+    if exclude: keep &= ~np.isin(index.names, list(exclude))
+    idx = np.flatnonzero(keep)
+    idx = idx[np.argsort(-total[idx], kind="stable")[:top]]
+    return [_result(index, i, total[i], points[i]) for i in idx]
+
+def _result(index, i, total, points):
+    nak, pada = eng.nakshatra_pada(float(index.moons[i]))
+    return {"name": str(index.names[i]), "total": float(total), "kootas": dict(zip(KOOTAS, points.tolist())),
+            "moon": f"{eng.NAKSHATRAS[nak]} {pada}", "rashi": eng.SIGNS[int(index.moons[i] // 30)]}
+
+
+# --- All pairs, for offline reports ---
+# Candidates are grouped by Moon cell, so a client's top K is read off the best-scoring cells
+# instead of scoring every pair.
+_ALL = {}
+
+def _init_all(names, cells, genders, default_role):
+    table = koota_table()
+    members = [np.flatnonzero(cells == c) for c in range(CELLS)]
+    _ALL.update(names=names, cells=cells, genders=genders, default_role=default_role, members=members,
+                as_boy=table.sum(axis=2), order_boy=np.argsort(-table.sum(axis=2), axis=1, kind="stable"),
+                order_girl=np.argsort(-table.sum(axis=2).T, axis=1, kind="stable"))
+
+def _top_for(i, top, min_score):
+    a = _ALL
+    role = a["genders"][i] or a["default_role"]
+    c = a["cells"][i]
+    order, totals = (a["order_boy"][c], a["as_boy"][c]) if role == BOY else (a["order_girl"][c], a["as_boy"][:, c])
+    out, k = [], 0
+    while len(out) < top and k < CELLS and totals[order[k]] >= min_score:
+        # Cells with equal totals are merged so ties come out in name order, as in match().
+        group = [order[k]]; k += 1
+        while k < CELLS and totals[order[k]] == totals[group[0]]: group.append(order[k]); k += 1
+        for j in np.sort(np.concatenate([a["members"][cell] for cell in group])):
+            if j == i or a["genders"][j] == role: continue
+            out.append((int(j), int(a["cells"][j])))
+            if len(out) >= top: break
+    table = koota_table()
+    return {"name": str(a["names"][i]), "role": "boy" if role == BOY else "girl",
+            "matches": [{"name": str(a["names"][j]), "total": float(totals[cell]),
+                         "kootas": (table[c, cell] if role == BOY else table[cell, c]).tolist()} for j, cell in out]}
+
+def _top_chunk(start, stop, top, min_score):
+    return [json.dumps(_top_for(i, top, min_score), ensure_ascii=False) for i in range(start, stop)]
+
+def all_pairs(index, out, top=10, min_score=0, workers=None, default_role=BOY, chunk=2000):
+    n = len(index.names)
+    args = (index.names, index.cells, index.genders, default_role)
+    spans = [(s, min(n, s + chunk)) for s in range(0, n, chunk)]
+    if workers == 1:
+        _init_all(*args)
+        for s, e in spans: out.write("\n".join(_top_chunk(s, e, top, min_score)) + "\n")
+        return n
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_all, initargs=args) as pool:
+        for lines in pool.map(_top_chunk, *zip(*spans), [top] * len(spans), [min_score] * len(spans)):
+            if lines: out.write("\n".join(lines) + "\n")
+    return n
+
+
+def main(argv=None):
+    from profile_store import open_store
+    ap = argparse.ArgumentParser(prog="main.py match", description="Ashtakoota (Guna Milan) matching against the profile store.")
+    ap.add_argument("name", nargs="?", help="profile to match; omit with --all")
+    ap.add_argument("--all", action="store_true", help="top matches for every profile, as JSONL")
+    ap.add_argument("--as", dest="role", choices=("boy", "girl"), default="boy", help="role of the client (with --all: of profiles without a gender)")
+    ap.add_argument("--top", type=int, default=20)
+    ap.add_argument("--min-score", type=float, default=0, help="with --all, leave out matches below this total")
+    ap.add_argument("--db", default="astro_profiles.db")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("-o", "--output", help="output file for --all (default: stdout)")
+    args = ap.parse_args(argv)
+    if not args.all and not args.name: ap.error("give a profile name or --all")
+
+    store = open_store(args.db)
+    index = MoonIndex.for_store(store)
+    computed = index.refresh(store)
+    print(f"{len(index.names)} profiles indexed ({computed} Moon positions computed)", file=sys.stderr)
+    role = GENDERS[args.role]
+    if args.all:
+        out = open(args.output, "w") if args.output else sys.stdout
+        try: all_pairs(index, out, args.top, args.min_score, args.workers, role)
+        finally:
+            if out is not sys.stdout: out.close()
+        return 0
+    d = store.get(args.name)
+    if d is None: print(f"no profile named {args.name!r}", file=sys.stderr); return 1
+    dt, tz, _, _ = eng.parse_record(d)
+    for m in match(moon_longitude(eng.local_to_jd(dt, tz)), index, GENDERS.get(str(d.get("gender", "")).lower(), role), args.top, exclude=[args.name]):
+        print(f"{m['total']:5.1f}/36  {m['name']:<30} {m['moon']:<22} " + "  ".join(f"{k} {v:g}" for k, v in m["kootas"].items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
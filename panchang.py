@@ -0,0 +1,155 @@
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+import swisseph as swe
+
+import chart_engine as eng
+from ephemeris import EPHEMERIS
+
+SAMPLE_STEP = 0.25  # days between the shared Sun/Moon samples used to bracket transitions
+NEWTON_STEPS = 3
+
+# name -> (angle from sidereal Sun/Moon longitudes, its rate, width in degrees, count, label)
+ELEMENTS = {
+    "tithi":     (lambda s, m: m - s, lambda vs, vm: vm - vs, 12.0, 30, lambda i: eng.TITHIS[i]),
+    "karana":    (lambda s, m: m - s, lambda vs, vm: vm - vs, 6.0, 60, eng.karana_name),
+    "nakshatra": (lambda s, m: m, lambda vs, vm: vm, eng.NAK_W, 27, lambda i: eng.NAKSHATRAS[i]),
+    "yoga":      (lambda s, m: s + m, lambda vs, vm: vm + vs, eng.NAK_W, 27, lambda i: eng.YOGAS[i]),
+}
+KALAS = {"rahu_kala": eng.RAHU_KALA_PARTS, "yamaganda": eng.YAMAGANDA_PARTS, "gulika": eng.GULIKA_PARTS}
+
+
+# --- Location-independent transitions (shared by every city) ---
+def _exact(jd):
+    s = EPHEMERIS.raw_calc_ut(jd, swe.SUN, eng.FLAGS)[0]
+    m = EPHEMERIS.raw_calc_ut(jd, swe.MOON, eng.FLAGS)[0]
+    return s[0], m[0], s[3], m[3]
+
+def transitions(jd_start, jd_end):
+    # For each element: (boundary jds, index running after each boundary), found on interpolated
+    # samples and polished with Newton steps on exact positions.
+    import numpy as np
+    EPHEMERIS.set_sid_mode(swe.SIDM_LAHIRI)
+    t = np.arange(jd_start - 1, jd_end + 1 + SAMPLE_STEP, SAMPLE_STEP)
+    sun = EPHEMERIS.daily_table(swe.SUN, t[0], t[-1], eng.FLAGS)(t)
+    moon = EPHEMERIS.daily_table(swe.MOON, t[0], t[-1], eng.FLAGS)(t)
+    out = {}
+    for name, (angle, rate, width, count, _) in ELEMENTS.items():
+        v = np.degrees(np.unwrap(np.radians(angle(sun, moon) % 360)))
+        ks = np.arange(np.floor(v[0] / width) + 1, np.floor(v[-1] / width) + 1)
+        i = np.clip(np.searchsorted(v, ks * width) - 1, 0, len(t) - 2)
+        guess = t[i] + (ks * width - v[i]) / (v[i+1] - v[i]) * SAMPLE_STEP
+        roots = []
+        for jd, k in zip(guess.tolist(), ks.tolist()):
+            for _ in range(NEWTON_STEPS):
+                s, m, vs, vm = _exact(jd)
+                jd -= ((angle(s, m) - k * width + 180) % 360 - 180) / rate(vs, vm)
+            roots.append(jd)
+        out[name] = (np.array(roots), (ks.astype(int) % count))
+    return out
+
+
+# --- Per-city calendar ---
+def _tz_offset(tz, day):
+    # CSV and JSONL give "5.5" as a string; only a value that is not a number is a zone name.
+    try: return float(tz)
+    except ValueError:
+        from geocache import utc_offset_hours
+        return utc_offset_hours(str(tz).strip(), day.year, day.month, day.day, 12)
+
+def _rise_set(jd, lat, lon, rsmi):
+    res, tret = EPHEMERIS.rise_trans(jd, swe.SUN, rsmi, lat, lon)
+    return tret[0] if res == 0 else None
+
+def city_days(city, start, days, trans):
+    import numpy as np
+    fmt = lambda jd, tz: None if jd is None else eng.jd_to_local(jd, tz).strftime('%Y-%m-%d %H:%M:%S')
+    lat, lon = float(city["lat"]), float(city["lon"])
+    rows, next_rise = [], None
+    for n in range(days):
+        day = start + timedelta(days=n)
+        tz = _tz_offset(city["tz"], day)
+        midnight = eng.local_to_jd(day, tz)
+        rise = next_rise if next_rise is not None and next_rise >= midnight else _rise_set(midnight, lat, lon, swe.CALC_RISE)
+        sset = _rise_set(rise if rise is not None else midnight, lat, lon, swe.CALC_SET)
+        next_rise = _rise_set(sset if sset is not None else midnight + 1, lat, lon, swe.CALC_RISE)
+        row = {"city": city.get("name"), "date": day.strftime('%Y-%m-%d'), "weekday": day.strftime('%A'), "utc_offset": tz,
+               "sunrise": fmt(rise, tz), "sunset": fmt(sset, tz), "next_sunrise": fmt(next_rise, tz)}
+        # Every element period overlapping the Vedic day (sunrise to next sunrise), with exact start and end.
+        lo = rise if rise is not None else midnight
+        hi = next_rise if next_rise is not None else midnight + 1
+        for name, (bounds, idx) in trans.items():
+            a, b = int(np.searchsorted(bounds, lo, "right")) - 1, int(np.searchsorted(bounds, hi))
+            label = ELEMENTS[name][4]
+            row[name] = [{"name": label(int(idx[j])), "start": fmt(bounds[j], tz), "end": fmt(bounds[j+1], tz) if j + 1 < len(bounds) else None}
+                         for j in range(max(a, 0), min(b, len(bounds)))]
+        if rise is not None and sset is not None:
+            part = (sset - rise) / 8.0
+            for name, parts in KALAS.items():
+                s = rise + (parts[day.weekday()] - 1) * part
+                row[name] = [fmt(s, tz), fmt(s + part, tz)]
+            row["day_duration_h"] = round((sset - rise) * 24.0, 4)
+        rows.append(row)
+    return rows
+
+def _city_job(args):
+    city, start, days, trans = args
+    try: return [json.dumps(r, ensure_ascii=False) for r in city_days(city, start, days, trans)], 0
+    except Exception as e: return [json.dumps({"city": city.get("name"), "error": str(e)})], 1
+
+def generate(cities, start, days, workers=1):
+    # Yields JSON lines city by city, in input order. Transitions are computed once for the whole run.
+    pad = 2
+    jd0 = eng.local_to_jd(start, 0) - pad
+    trans = transitions(jd0, jd0 + days + 2*pad)
+    jobs = ((c, start, days, trans) for c in cities)
+    if workers <= 1:
+        for job in jobs: yield _city_job(job)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for res in pool.map(_city_job, jobs): yield res
+
+
+# --- Command line ---
+def parse_city(text):
+    name, lat, lon, tz = [p.strip() for p in text.rsplit(",", 3)]
+    try: tz = float(tz)
+    except ValueError: pass
+    return {"name": name, "lat": float(lat), "lon": float(lon), "tz": tz}
+
+def main(argv=None):
+    from batch_cli import read_records
+    ap = argparse.ArgumentParser(prog="main.py panchang", description="Day-by-day panchang for a date range and a list of cities (JSON lines).")
+    ap.add_argument("input", nargs="?", help="CSV or JSONL with name, lat, lon, tz (UTC offset hours or a timezone name)")
+    ap.add_argument("--city", action="append", default=[], type=parse_city, help='"Name,lat,lon,tz"; may be repeated')
+    ap.add_argument("--format", choices=["csv", "jsonl"])
+    ap.add_argument("--from", dest="start", default=datetime.now().strftime('%Y-%m-%d'), help="first date, Y-M-D")
+    ap.add_argument("--days", type=int, default=365)
+    ap.add_argument("-o", "--output")
+    ap.add_argument("--workers", type=int, default=1)
+    args = ap.parse_args(argv)
+
+    cities = list(args.city)
+    if args.input:
+        fmt = args.format or ("csv" if args.input.lower().endswith(".csv") else "jsonl")
+        with open(args.input, newline="", encoding="utf-8") as f: cities += list(read_records(f, fmt))
+    if not cities: ap.error("give an input file or at least one --city")
+    start = datetime.strptime(args.start, '%Y-%m-%d')
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    t0, n, errors = time.perf_counter(), 0, 0
+    try:
+        for lines, errs in generate(cities, start, args.days, args.workers):
+            out.write("\n".join(lines) + "\n"); n += len(lines); errors += errs
+    finally:
+        if out is not sys.stdout: out.close()
+    print(f"{len(cities)} cities, {n} rows, {errors} errors in {time.perf_counter() - t0:.1f}s", file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+import json
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from functools import wraps
+
+_NULL = nullcontext()
+
+
+# --- Per-stage timing ---
+# Disabled by default; stage() then hands back a shared no-op context and timed() wrappers fall
+# straight through, so instrumented code pays one attribute check per call.
+class _Stage:
+    __slots__ = ("prof", "name", "t0")
+
+    def __init__(self, prof, name): self.prof, self.name = prof, name
+
+    def __enter__(self): self.t0 = time.perf_counter(); return self
+
+    def __exit__(self, *exc): self.prof.record(self.name, (time.perf_counter() - self.t0) * 1000.0)
+
+
+class Profiler:
+    def __init__(self, window=1000):
+        self.enabled = False
+        self.window = window
+        self._lock = threading.Lock()
+        self._stats = {}  # name -> [count, total_ms, max_ms, recent samples]
+
+    def enable(self, on=True): self.enabled = on
+
+    def stage(self, name):
+        return _Stage(self, name) if self.enabled else _NULL
+
+    def timed(self, name):
+        def deco(fn):
+            @wraps(fn)
+            def wrapper(*a, **kw):
+                if not self.enabled: return fn(*a, **kw)
+                with _Stage(self, name): return fn(*a, **kw)
+            return wrapper
+        return deco
+
+    def record(self, name, ms):
+        with self._lock:
+            st = self._stats.get(name)
+            if st is None: st = self._stats[name] = [0, 0.0, 0.0, deque(maxlen=self.window)]
+            st[0] += 1; st[1] += ms; st[2] = max(st[2], ms); st[3].append(ms)
+
+    def reset(self):
+        with self._lock: self._stats.clear()
+
+    def summary(self):
+        # p50/p95 over the most recent `window` samples; count, mean and max over all of them.
+        with self._lock: items = [(k, v[0], v[1], v[2], sorted(v[3])) for k, v in self._stats.items()]
+        out = {}
+        for name, count, total, mx, s in sorted(items):
+            out[name] = {"count": count, "mean_ms": total / count, "p50_ms": s[len(s) // 2],
+                         "p95_ms": s[min(len(s) - 1, int(len(s) * 0.95))], "max_ms": mx}
+        return out
+
+    def lines(self):
+        return [f"{k:<18} {v['count']:>6}  p50 {v['p50_ms']:7.2f}  p95 {v['p95_ms']:7.2f}  max {v['max_ms']:7.2f} ms" for k, v in self.summary().items()]
+
+    def log_line(self):
+        return "perf " + " | ".join(f"{k} n={v['count']} p50={v['p50_ms']:.1f} p95={v['p95_ms']:.1f} max={v['max_ms']:.1f}" for k, v in self.summary().items())
+
+    def export_json(self, path):
+        with open(path, "w") as f: json.dump({"time": time.time(), "stages": self.summary()}, f, indent=2)
+
+
+PROFILER = Profiler()
@@ -0,0 +1,128 @@
+import threading
+import time
+
+import swisseph as swe
+
+import chart_engine as eng
+from ephemeris import EPHEMERIS
+
+# Frame step choices for the playback controls, in days.
+RATES = {"1 hour": 1/24, "6 hours": 0.25, "1 day": 1.0, "1 week": 7.0, "1 month": 30.436875, "1 year": 365.25}
+CHUNK = 64  # frames computed per batch by the producer
+
+
+# --- Bounded ring buffer of precomputed frames ---
+# The producer blocks while the ring is full; the consumer may skip ahead, discarding the
+# frames it has no time to show.
+class FrameRing:
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self._buf = [None] * capacity
+        self._head = self._size = 0
+        self._cond = threading.Condition()
+        self.closed = False
+
+    def put_many(self, frames):
+        with self._cond:
+            for f in frames:
+                while self._size >= self.capacity and not self.closed: self._cond.wait()
+                if self.closed: return False
+                self._buf[(self._head + self._size) % self.capacity] = f; self._size += 1
+            return True
+
+    def take_until(self, index):
+        # Newest frame with frame["index"] <= index, dropping every older one; (frame, dropped).
+        with self._cond:
+            frame, dropped = None, 0
+            while self._size and self._buf[self._head]["index"] <= index:
+                if frame is not None: dropped += 1
+                frame = self._buf[self._head]; self._buf[self._head] = None
+                self._head = (self._head + 1) % self.capacity; self._size -= 1
+            if frame is not None: self._cond.notify_all()
+            return frame, dropped
+
+    def __len__(self): return self._size
+
+    def close(self):
+        with self._cond: self.closed = True; self._cond.notify_all()
+
+
+# --- Producer: transit longitudes and their D1/varga placements, frame by frame ---
+def frame_placements(jds, objs, d_val):
+    import numpy as np
+    from shodashvarga import varga_signs
+    EPHEMERIS.set_sid_mode(swe.SIDM_LAHIRI)
+    names, lons = [], []
+    if jds[-1] - jds[0] + 14 < len(jds):
+        # Short steps: interpolating daily tables takes fewer ephemeris calls than one per frame.
+        tables = eng.transit_tables(jds[0], jds[-1], objs)
+        for n, _ in objs:
+            if n == "ASC": continue
+            names.append(n); lons.append(tables[n](jds))
+    else:
+        for n, pid in objs:
+            if n == "ASC": continue
+            names.append(n); lons.append(np.array([EPHEMERIS.raw_calc_ut(jd, pid, eng.FLAGS)[0][0] for jd in jds]))
+    if "Rah" in names: names.append("Ket"); lons.append((lons[names.index("Rah")] + 180) % 360)
+    lons = np.array(lons)
+    d1, div = (lons // 30).astype(int) % 12, varga_signs(lons, d_val)
+    frames = []
+    for j in range(len(jds)):
+        t_d1, t_div = [[] for _ in range(12)], [[] for _ in range(12)]
+        for i, n in enumerate(names):
+            t_d1[d1[i, j]].append((f"T-{n}", "", "darkorange")); t_div[div[i, j]].append((f"T-{n}", "", "darkorange"))
+        frames.append((t_d1, t_div))
+    return frames
+
+class TransitProducer:
+    def __init__(self, jd_start, step, objs, d_val, capacity=256, first_index=0):
+        self.jd_start, self.step, self.objs, self.d_val = jd_start, step, objs, d_val
+        self.ring = FrameRing(capacity)
+        self.error = None
+        self._next = first_index
+        self._thread = threading.Thread(target=self._run, name="transit-producer", daemon=True)
+        self._thread.start()
+
+    def jd_at(self, index):
+        return self.jd_start + index * self.step
+
+    def _run(self):
+        import numpy as np
+        try:
+            while not self.ring.closed:
+                idx = np.arange(self._next, self._next + CHUNK)
+                jds = self.jd_start + idx * self.step
+                frames = [{"index": int(i), "jd": float(jd), "t_d1": a, "t_div": b} for i, jd, (a, b) in zip(idx, jds, frame_placements(jds, self.objs, self.d_val))]
+                if not self.ring.put_many(frames): break
+                self._next += CHUNK
+        except Exception as e: self.error = e
+
+    def stop(self):
+        self.ring.close()
+
+
+# --- Consumer clock ---
+# The frame due now follows from wall time since play started, so a slow paint makes the next
+# tick skip frames instead of falling behind.
+class PlaybackClock:
+    def __init__(self, fps):
+        self.fps = fps
+        self.base_index, self.t_base = 0, time.perf_counter()
+        self.painted = self.dropped = 0
+        self._paint_times = []
+
+    def restart(self, index, fps=None):
+        self.fps = fps or self.fps
+        self.base_index, self.t_base = index, time.perf_counter()
+
+    def due(self):
+        return self.base_index + int((time.perf_counter() - self.t_base) * self.fps)
+
+    def painted_frame(self, dropped):
+        now = time.perf_counter()
+        self.painted += 1; self.dropped += dropped
+        self._paint_times.append(now)
+        while self._paint_times and now - self._paint_times[0] > 1.0: self._paint_times.pop(0)
+
+    def achieved_fps(self):
+        return len(self._paint_times)
@@ -0,0 +1,170 @@
+import json
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+
+PAGE_SIZE = 200
+GRAM = 3
+
+
+def _grams(text):
+    return {text[i:i+GRAM] for i in range(len(text) - GRAM + 1)}
+
+def _like_escape(text):
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+# --- Storage backends ---
+# Every backend stores profile dicts (the fields save_profile writes) keyed by name and
+# answers paged name searches: prefix matches first, then substring matches.
+class ProfileStore(ABC):
+    @abstractmethod
+    def get(self, name): ...
+    @abstractmethod
+    def put(self, data): ...
+    @abstractmethod
+    def delete(self, name): ...
+    @abstractmethod
+    def search(self, term="", limit=PAGE_SIZE, offset=0): ...
+    @abstractmethod
+    def count(self): ...
+    @abstractmethod
+    def bulk_import(self, profiles): ...
+    @abstractmethod
+    def iter_profiles(self): ...
+    def close(self): pass
+
+
+class SQLiteProfileStore(ProfileStore):
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA cache_size=-65536")
+        with self.conn:
+            self.conn.execute("CREATE TABLE IF NOT EXISTS profiles (name TEXT PRIMARY KEY, name_lc TEXT NOT NULL, data TEXT NOT NULL)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS profiles_name_lc ON profiles(name_lc)")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS name_grams (gram TEXT NOT NULL, name TEXT NOT NULL, PRIMARY KEY (gram, name)) WITHOUT ROWID")
+
+    def get(self, name):
+        row = self.conn.execute("SELECT data FROM profiles WHERE name = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _write_many(self, cur, chunk):
+        # A name's trigrams never change, so re-saving a profile only replaces its data row.
+        cur.executemany("INSERT OR REPLACE INTO profiles (name, name_lc, data) VALUES (?, ?, ?)", [(d["name"], d["name"].lower(), json.dumps(d)) for d in chunk])
+        cur.executemany("INSERT OR IGNORE INTO name_grams (gram, name) VALUES (?, ?)", sorted((g, d["name"]) for d in chunk for g in _grams(d["name"].lower())))
+
+    def put(self, data):
+        with self.conn: self._write_many(self.conn.cursor(), [data])
+
+    def delete(self, name):
+        with self.conn:
+            self.conn.executemany("DELETE FROM name_grams WHERE gram = ? AND name = ?", [(g, name) for g in _grams(name.lower())])
+            return self.conn.execute("DELETE FROM profiles WHERE name = ?", (name,)).rowcount > 0
+
+    def bulk_import(self, profiles, batch=5000):
+        n, chunk = 0, []
+        with self.conn:
+            cur = self.conn.cursor()
+            for data in profiles:
+                chunk.append(data)
+                if len(chunk) >= batch: self._write_many(cur, chunk); n += len(chunk); chunk = []
+            if chunk: self._write_many(cur, chunk); n += len(chunk)
+        return n
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+
+    def search(self, term="", limit=PAGE_SIZE, offset=0):
+        term = term.lower()
+        if not term:
+            return [r[0] for r in self.conn.execute("SELECT name FROM profiles ORDER BY name_lc, name LIMIT ? OFFSET ?", (limit, offset))]
+        # Prefix matches come from an index range scan on name_lc.
+        upper = term[:-1] + chr(ord(term[-1]) + 1)
+        n_prefix = self.conn.execute("SELECT COUNT(*) FROM profiles WHERE name_lc >= ? AND name_lc < ?", (term, upper)).fetchone()[0]
+        out = []
+        if offset < n_prefix:
+            out = [r[0] for r in self.conn.execute("SELECT name FROM profiles WHERE name_lc >= ? AND name_lc < ? ORDER BY name_lc, name LIMIT ? OFFSET ?",
+                                                   (term, upper, limit, offset))]
+        if len(out) >= limit: return out
+        # Substring matches: candidates share every trigram of the term; short terms fall back to LIKE.
+        sub_offset = max(0, offset - n_prefix)
+        if len(term) >= GRAM:
+            grams = sorted(_grams(term))
+            sql = (f"SELECT p.name FROM profiles p JOIN (SELECT name FROM name_grams WHERE gram IN ({','.join('?' * len(grams))}) "
+                   f"GROUP BY name HAVING COUNT(*) = ?) g ON g.name = p.name "
+                   "WHERE instr(p.name_lc, ?) > 1 ORDER BY p.name_lc, p.name LIMIT ? OFFSET ?")
+            args = (*grams, len(grams), term, limit - len(out), sub_offset)
+        else:
+            sql = "SELECT name FROM profiles WHERE name_lc LIKE ? ESCAPE '\\' AND instr(name_lc, ?) > 1 ORDER BY name_lc, name LIMIT ? OFFSET ?"
+            args = (f"%{_like_escape(term)}%", term, limit - len(out), sub_offset)
+        return out + [r[0] for r in self.conn.execute(sql, args)]
+
+    def iter_profiles(self):
+        for (data,) in self.conn.execute("SELECT data FROM profiles ORDER BY name"): yield json.loads(data)
+
+    def close(self):
+        self.conn.close()
+
+
+class JsonProfileStore(ProfileStore):
+    # Legacy astro_profiles.json format: one JSON object keyed by profile name.
+    def __init__(self, path):
+        self.path = path
+        self.profiles = {}
+        if os.path.exists(path):
+            with open(path, 'r') as f: self.profiles = json.load(f)
+
+    def _flush(self):
+        import tempfile
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)), suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w') as f: json.dump(self.profiles, f); f.flush(); os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+        except BaseException:
+            if os.path.exists(tmp): os.remove(tmp)
+            raise
+
+    def get(self, name):
+        return self.profiles.get(name)
+
+    def put(self, data):
+        self.profiles[data["name"]] = data; self._flush()
+
+    def delete(self, name):
+        if name not in self.profiles: return False
+        del self.profiles[name]; self._flush()
+        return True
+
+    def bulk_import(self, profiles):
+        n = 0
+        for data in profiles: self.profiles[data["name"]] = data; n += 1
+        self._flush()
+        return n
+
+    def count(self):
+        return len(self.profiles)
+
+    def search(self, term="", limit=PAGE_SIZE, offset=0):
+        term = term.lower()
+        names = sorted(self.profiles, key=lambda n: (n.lower(), n))
+        if term:
+            names = [n for n in names if n.lower().startswith(term)] + [n for n in names if term in n.lower()[1:] and not n.lower().startswith(term)]
+        return names[offset:offset + limit]
+
+    def iter_profiles(self):
+        for name in sorted(self.profiles): yield self.profiles[name]
+
+
+def open_store(path):
+    return JsonProfileStore(path) if path.lower().endswith(".json") else SQLiteProfileStore(path)
+
+def open_default_store(db_path="astro_profiles.db", legacy_json="astro_profiles.json"):
+    # First run on a new database imports the legacy JSON file, if there is one.
+    fresh = not os.path.exists(db_path)
+    store = SQLiteProfileStore(db_path)
+    if fresh and os.path.exists(legacy_json):
+        store.bulk_import(JsonProfileStore(legacy_json).iter_profiles())
+    return store
@@ -0,0 +1,91 @@
+from bisect import bisect_right
+
+import swisseph as swe
+
+import chart_engine as eng
+import events
+from ephemeris import EPHEMERIS
+
+SCAN_STEP = 2 / 1440.0  # days between ascendant samples; the lagna moves well under a sign in this time
+
+
+# --- Boundary table: every varga boundary longitude, merged so each is root-found only once ---
+def boundary_table(vargas=eng.VARGAS):
+    table = {}
+    for d in vargas:
+        for lon, before, after in events.varga_boundaries(d): table.setdefault(round(lon, 9), []).append((d, before, after))
+    lons = sorted(table)
+    return lons, [table[l] for l in lons]
+
+def _between(lons, a, b):
+    # Indices of boundary longitudes in (a, b], walking forward from a across 0 Aries if needed.
+    if a <= b: return range(bisect_right(lons, a), bisect_right(lons, b))
+    return list(range(bisect_right(lons, a), len(lons))) + list(range(0, bisect_right(lons, b)))
+
+
+# --- Scanner ---
+class Rectifier:
+    def __init__(self, lat, lon, vargas=eng.VARGAS):
+        self.lat, self.lon, self.vargas = lat, lon, list(vargas)
+        self.lons, self.changes = boundary_table(self.vargas)
+
+    def ascendant(self, jd):
+        return EPHEMERIS.raw_houses_ex(jd, self.lat, self.lon, b'A', eng.FLAGS)[1][0]
+
+    def lagna_events(self, jd_start, jd_end):
+        # Bracket on a coarse grid, then root-find each boundary the ascendant passes; the cost
+        # grows with the number of boundaries crossed, not with the length of the window.
+        EPHEMERIS.set_sid_mode(swe.SIDM_LAHIRI)
+        out = []
+        t0, l0 = jd_start, self.ascendant(jd_start)
+        while t0 < jd_end:
+            t1 = min(t0 + SCAN_STEP, jd_end); l1 = self.ascendant(t1)
+            delta = (l1 - l0 + 180) % 360 - 180
+            if delta > 0: idx = _between(self.lons, l0, l1)
+            elif delta < 0: idx = reversed(_between(self.lons, l1, l0))  # near the poles the lagna can run backwards briefly
+            else: idx = ()
+            for i in idx:
+                bound = self.lons[i]
+                f = lambda t, B=bound: (self.ascendant(t) - B + 180) % 360 - 180
+                fa, fb = f(t0), f(t1)
+                if (fa < 0) == (fb < 0): continue
+                t = events.solve(f, t0, t1, fa, fb)
+                for d, before, after in self.changes[i]:
+                    new = after if delta > 0 else before
+                    out.append({"jd": t, "body": "ASC", "kind": "lagna", "varga": d, "sign": new,
+                                "detail": f"Lagna enters {eng.SIGNS[new]}" + ("" if d == 1 else f" in D{d}")})
+            t0, l0 = t1, l1
+        out.sort(key=lambda e: (e["jd"], self.vargas.index(e["varga"])))
+        return out
+
+    def find(self, jd_start, jd_end, moon_padas=True):
+        evs = self.lagna_events(jd_start, jd_end)
+        if moon_padas: evs += events.EventFinder(kinds=("nakshatra",)).find(jd_start, jd_end, ["Moo"])
+        evs.sort(key=lambda e: e["jd"])
+        return evs
+
+    def intervals(self, jd_start, jd_end, moon_padas=True):
+        # Candidate birth-time intervals: spans in which no lagna varga sign (and no Moon pada) changes.
+        # Each carries the lagna sign in every varga, the Moon's nakshatra/pada and what changed at its start.
+        evs = self.find(jd_start, jd_end, moon_padas)
+        asc = self.ascendant(jd_start)
+        signs = {d: eng.get_divisional_sign(asc, d) for d in self.vargas}
+        moon = eng.nakshatra_pada(EPHEMERIS.raw_calc_ut(jd_start, swe.MOON, eng.FLAGS)[0][0])
+        out, start, changed, i = [], jd_start, [], 0
+        while True:
+            end = evs[i]["jd"] if i < len(evs) else jd_end
+            if end > start: out.append({"start": start, "end": end, "signs": dict(signs), "moon": moon, "changes": changed})
+            if i >= len(evs): break
+            changed, start = [], end
+            while i < len(evs) and evs[i]["jd"] - end <= events.TOL:
+                e = evs[i]
+                if e["kind"] == "lagna": signs[e["varga"]] = e["sign"]
+                else: moon = (e["nakshatra"], e["pada"])
+                changed.append(e["detail"] if e["kind"] == "lagna" else f"Moon {e['detail']}")
+                i += 1
+        return out
+
+
+def rectify(curr_dt, tz, lat, lon, minutes=30, vargas=eng.VARGAS, moon_padas=True):
+    jd = eng.local_to_jd(curr_dt, tz)
+    return Rectifier(lat, lon, vargas).intervals(jd - minutes / 1440.0, jd + minutes / 1440.0, moon_padas)
@@ -0,0 +1,74 @@
+import queue
+import threading
+import time
+
+from perf import PROFILER
+
+
+# --- Latest-wins background computation for the Tk app ---
+# Requests are debounced on the Tk thread, computed on a single worker thread and
+# handed back through a queue polled with after(). A request superseded before the
+# worker picks it up is never computed; of the results that arrive, only the newest
+# is painted, and never one older than what is already on screen.
+class LatestWinsScheduler:
+    def __init__(self, root, compute, on_result, on_error=None, debounce_ms=40, poll_ms=10, metric="input_to_paint"):
+        self.root, self.compute, self.on_result, self.on_error = root, compute, on_result, on_error
+        self.metric = metric
+        self.debounce_ms, self.poll_ms = debounce_ms, poll_ms
+        self.generation = 0
+        self.painted = 0
+        self.dropped = 0
+        self.latencies = []  # input change -> paint, in ms
+        self._after_id = None
+        self._pending = None
+        self._cond = threading.Condition()
+        self._results = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="chart-worker", daemon=True)
+        self._thread.start()
+        self.root.after(self.poll_ms, self._poll)
+
+    def submit(self, request, debounce_ms=None):
+        self.generation += 1
+        gen, t_input = self.generation, time.perf_counter()
+        if self._after_id is not None: self.root.after_cancel(self._after_id)
+        delay = self.debounce_ms if debounce_ms is None else debounce_ms
+        self._after_id = self.root.after(delay, lambda: self._dispatch(gen, request, t_input))
+
+    def _dispatch(self, gen, request, t_input):
+        self._after_id = None
+        with self._cond:
+            if self._pending is not None: self.dropped += 1
+            self._pending = (gen, request, t_input)
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None: self._cond.wait()
+                gen, request, t_input = self._pending; self._pending = None
+            if gen != self.generation: self.dropped += 1; continue
+            try: self._results.put((gen, t_input, self.compute(request), None))
+            except Exception as e: self._results.put((gen, t_input, None, e))
+
+    def _poll(self):
+        latest = None
+        while not self._results.empty():
+            if latest is not None: self.dropped += 1
+            latest = self._results.get_nowait()
+        if latest is not None:
+            gen, t_input, result, err = latest
+            if gen <= self.painted: self.dropped += 1
+            elif err is not None:
+                if self.on_error and gen == self.generation: self.on_error(err)
+            else:
+                self.painted = gen
+                self.on_result(result)
+                self.latencies.append((time.perf_counter() - t_input) * 1000.0)
+                if PROFILER.enabled: PROFILER.record(self.metric, self.latencies[-1])
+                del self.latencies[:-200]
+        self.root.after(self.poll_ms, self._poll)
+
+    def latency_stats(self):
+        if not self.latencies: return None
+        s = sorted(self.latencies)
+        return {"last": self.latencies[-1], "p95": s[min(len(s) - 1, int(len(s) * 0.95))], "max": s[-1], "count": len(s)}
@@ -0,0 +1,223 @@
+import argparse
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qsl
+
+import chart_engine as eng
+
+ENDPOINTS = ("chart", "vargas", "panchang", "dasha")
+MAX_BODY = 64 * 1024
+MAX_DASHA_DEPTH = 3  # 9**3 = 729 periods; deeper levels are reachable through "at"
+
+
+class BadRequest(ValueError): pass
+
+
+# --- Request normalization ---
+# Every request is reduced to a tuple of canonical values; it is the cache key and the only thing
+# sent to a worker. Equivalent inputs ("5.50" vs "5.5", query string vs JSON body) share an entry.
+def _flag(v):
+    return v if isinstance(v, bool) else str(v).lower() in ("1", "true", "yes", "on")
+
+def normalize(endpoint, params):
+    if endpoint not in ENDPOINTS: raise KeyError(endpoint)
+    missing = [k for k in ("year", "month", "day", "tz", "lat", "lon") if params.get(k) in (None, "")]
+    if missing: raise BadRequest(f"missing parameter {', '.join(missing)}")
+    try:
+        dt, tz, lat, lon = eng.parse_record(params)
+    except (TypeError, ValueError) as e: raise BadRequest(str(e))
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180 and -14 <= tz <= 14): raise BadRequest("lat, lon or tz out of range")
+    base = (endpoint, dt.isoformat(), round(tz, 4), round(lat, 6), round(lon, 6), _flag(params.get("outer", False)))
+    try:
+        if endpoint == "vargas":
+            ds = params.get("d")
+            ds = eng.VARGAS if ds in (None, "") else sorted({int(d) for d in (ds if isinstance(ds, list) else str(ds).split(","))})
+            bad = [d for d in ds if d not in eng.VARGAS]
+            if bad: raise BadRequest(f"unknown varga D{bad[0]}")
+            return base + (tuple(ds),)
+        if endpoint == "dasha":
+            depth = int(params.get("depth", 2))
+            if not 1 <= depth <= MAX_DASHA_DEPTH: raise BadRequest(f"depth must be 1-{MAX_DASHA_DEPTH}")
+            at = params.get("at")
+            return base + (depth, datetime.fromisoformat(at).isoformat() if at else None)
+    except BadRequest: raise
+    except (TypeError, ValueError) as e: raise BadRequest(str(e))
+    return base
+
+
+# --- Worker side: one normalized request in, the JSON response body out ---
+def _period(p, depth):
+    out = {"lord": p.name, "label": p.label, "start": p.start_dt.isoformat(timespec="seconds"), "end": p.end_dt.isoformat(timespec="seconds")}
+    if p.level + 1 < depth: out["periods"] = [_period(c, depth) for c in p.children]
+    return out
+
+def compute(key):
+    endpoint, dt, tz, lat, lon, outer = key[:6]
+    dt = datetime.fromisoformat(dt)
+    if endpoint == "chart":
+        chart = eng.compute_chart(dt, tz, lat, lon, {"outer": outer, "vargas": False, "dashas": False, "panchang": False})
+        for b in chart["bodies"]:
+            b["sign_name"], b["nakshatra_name"] = eng.SIGNS[b["sign"]], eng.NAKSHATRAS[b["nakshatra"]]
+            b["nak_lord"] = eng.LORD_ORDER[b["nakshatra"] % 9]; del b["vargas"]
+        out = chart
+    elif endpoint == "vargas":
+        chart = eng.compute_chart(dt, tz, lat, lon, {"outer": outer, "dashas": False, "panchang": False})
+        pos = [eng.VARGAS.index(d) for d in key[6]]
+        out = {"jd": chart["jd"], "vargas": [f"D{d}" for d in key[6]],
+               "bodies": {b["name"]: [b["vargas"][i] for i in pos] for b in chart["bodies"]}}
+    elif endpoint == "panchang":
+        chart = eng.compute_chart(dt, tz, lat, lon, {"outer": False, "vargas": False, "dashas": False})
+        out = {"jd": chart["jd"], "panchang": {k: v for row in chart["panchang"] for k, v in (row[:2], row[2:])}}
+    else:
+        import dasha
+        depth, at = key[6], key[7]
+        moon = eng.compute_chart(dt, tz, lat, lon, {"vargas": False, "dashas": False, "panchang": False})["bodies"]
+        tree = dasha.DashaTree(next(b["lon"] for b in moon if b["name"] == "Moo"), dt)
+        out = {"periods": [_period(p, depth) for p in tree.mahas]}
+        if at: out["running"] = [{"level": dasha.LEVELS[p.level], "lord": p.name, "start": p.start_dt.isoformat(timespec="seconds"),
+                                  "end": p.end_dt.isoformat(timespec="seconds")} for p in tree.at(datetime.fromisoformat(at))]
+    return json.dumps(out, ensure_ascii=False).encode()
+
+
+# --- Service: response cache, in-flight coalescing and a bounded queue in front of the pool ---
+class ChartService:
+    def __init__(self, workers=None, cache_size=4096, max_pending=None, timeout=30.0):
+        self.workers = workers or os.cpu_count() or 1
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        # Start the workers now: forked after the socket is bound, they would hold the port open.
+        list(self.pool.map(int, range(self.workers)))
+        self.cache_size, self.timeout = cache_size, timeout
+        self.max_pending = max_pending or self.workers * 32
+        self._cache, self._inflight = OrderedDict(), {}
+        self._lock = threading.Lock()
+        self._latency = deque(maxlen=10000)
+        self.stats = {"requests": 0, "hits": 0, "misses": 0, "coalesced": 0, "rejected": 0, "errors": 0}
+
+    def get(self, key):
+        # Returns (status, body). A full queue is refused straight away rather than queued without bound.
+        t0, new = time.perf_counter(), False
+        with self._lock:
+            self.stats["requests"] += 1
+            body = self._cache.get(key)
+            if body is not None:
+                self._cache.move_to_end(key); self.stats["hits"] += 1
+                return 200, body
+            fut = self._inflight.get(key)
+            if fut is not None: self.stats["coalesced"] += 1
+            elif len(self._inflight) >= self.max_pending:
+                self.stats["rejected"] += 1
+                return 503, b'{"error": "server busy"}'
+            else:
+                self.stats["misses"] += 1
+                fut = self._inflight[key] = self.pool.submit(compute, key); new = True
+        # Outside the lock: a future that has already finished runs its callback right here.
+        if new: fut.add_done_callback(lambda f, k=key: self._done(k, f))
+        try: body = fut.result(self.timeout)
+        except FutureTimeout: return 504, b'{"error": "computation timed out"}'
+        except Exception as e:
+            with self._lock: self.stats["errors"] += 1
+            return 500, json.dumps({"error": str(e) or type(e).__name__}).encode()
+        self._latency.append((time.perf_counter() - t0) * 1000.0)
+        return 200, body
+
+    def _done(self, key, fut):
+        with self._lock:
+            self._inflight.pop(key, None)
+            if fut.exception() is None:
+                self._cache[key] = fut.result()
+                if len(self._cache) > self.cache_size: self._cache.popitem(last=False)
+
+    def summary(self):
+        with self._lock:
+            out = dict(self.stats, cached=len(self._cache), pending=len(self._inflight), workers=self.workers, max_pending=self.max_pending)
+        s = sorted(self._latency)
+        if s: out["compute_ms"] = {"p50": s[len(s) // 2], "p95": s[int(len(s) * 0.95)], "max": s[-1]}
+        return out
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+
+# --- HTTP front end ---
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so load tests measure the service rather than TCP setup
+    disable_nagle_algorithm = True  # headers and body go out in separate writes
+    service = None
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        self.handle_request(url.path.strip("/"), dict(parse_qsl(url.query)))
+
+    def do_POST(self):
+        try: n = int(self.headers.get("Content-Length") or 0)
+        except ValueError: n = -1
+        # The body is left unread on these two, so the connection cannot be reused.
+        if n < 0: self.close_connection = True; return self.reply(400, b'{"error": "bad Content-Length"}')
+        if n > MAX_BODY: self.close_connection = True; return self.reply(413, b'{"error": "request body too large"}')
+        try: params = json.loads(self.rfile.read(n) or b"{}")
+        except ValueError: return self.reply(400, b'{"error": "body is not valid JSON"}')
+        if not isinstance(params, dict): return self.reply(400, b'{"error": "body must be a JSON object"}')
+        self.handle_request(urlsplit(self.path).path.strip("/"), params)
+
+    def handle_request(self, endpoint, params):
+        if endpoint == "health": return self.reply(200, b'{"ok": true}')
+        if endpoint == "stats": return self.reply(200, json.dumps(self.service.summary()).encode())
+        try: key = normalize(endpoint, params)
+        except KeyError: return self.reply(404, json.dumps({"error": f"unknown endpoint /{endpoint}", "endpoints": list(ENDPOINTS)}).encode())
+        except BadRequest as e: return self.reply(400, json.dumps({"error": str(e)}).encode())
+        status, body = self.service.get(key)
+        self.reply(status, body, {"Retry-After": "1"} if status == 503 else None)
+
+    def reply(self, status, body, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items(): self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, fmt, *args):
+        if self.server.verbose: super().log_message(fmt, *args)
+
+
+class Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # the default listen backlog of 5 drops connections from bursty clients
+
+def make_server(host="127.0.0.1", port=8765, workers=None, cache_size=4096, max_pending=None, verbose=False):
+    service = ChartService(workers, cache_size, max_pending)
+    server = Server((host, port), type("BoundHandler", (Handler,), {"service": service}))
+    server.verbose, server.service = verbose, service
+    return server
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="main.py serve", description="Serve chart, varga, panchang and dasha computations as JSON over HTTP on localhost.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes (default: all CPUs)")
+    ap.add_argument("--cache", type=int, default=4096, help="responses kept in the LRU cache")
+    ap.add_argument("--max-pending", type=int, help="distinct computations queued before answering 503 (default: 32 per worker)")
+    ap.add_argument("-v", "--verbose", action="store_true", help="log every request to stderr")
+    args = ap.parse_args(argv)
+
+    server = make_server(args.host, args.port, args.workers, args.cache, args.max_pending, args.verbose)
+    signal.signal(signal.SIGTERM, lambda *a: sys.exit(0))
+    print(f"serving on http://{args.host}:{server.server_address[1]}/ ({', '.join(ENDPOINTS)}) with {server.service.workers} workers", file=sys.stderr, flush=True)
+    try: server.serve_forever()
+    except KeyboardInterrupt: pass
+    finally:
+        server.server_close(); server.service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+import numpy as np
+from chart_engine import VARGAS
+
+# Vectorized counterpart of chart_engine.get_divisional_sign. Every varga is a
+# lookup table indexed by (sign, amsha segment); the segment is computed with the
+# same float expression as the scalar function so both agree at every boundary.
+# Tables carry one extra column for the rare case where rounding pushes the
+# segment of a longitude just below a sign cusp onto n_segments (seen in D45).
+
+_SEGMENT = {
+    2: lambda rem: rem / 15, 3: lambda rem: rem / 10, 4: lambda rem: rem / 7.5, 7: lambda rem: rem / (30/7),
+    10: lambda rem: rem / 3, 12: lambda rem: rem / 2.5, 16: lambda rem: rem / (30/16), 20: lambda rem: rem / 1.5,
+    24: lambda rem: rem / 1.25, 27: lambda rem: rem / (30/27), 40: lambda rem: rem / 0.75, 45: lambda rem: rem / (30/45),
+    60: lambda rem: rem * 2,
+}
+_RULE = {
+    2: lambda s, k: (4 if k == 0 else 3) if s % 2 == 0 else (3 if k == 0 else 4),
+    3: lambda s, k: (s + k*4) % 12,
+    4: lambda s, k: (s + k*3) % 12,
+    7: lambda s, k: s if s % 2 == 0 else ((s+6) % 12 + k) % 12,
+    10: lambda s, k: s if s % 2 == 0 else ((s+8) % 12 + k) % 12,
+    12: lambda s, k: (s + k) % 12,
+    16: lambda s, k: ((s % 3)*4 + k) % 12,
+    20: lambda s, k: ({0: 0, 1: 8, 2: 4}[s % 3] + k) % 12,
+    24: lambda s, k: ((4 if s % 2 == 0 else 3) + k) % 12,
+    27: lambda s, k: ((s % 4)*3 + k) % 12,
+    40: lambda s, k: ((0 if s % 2 == 0 else 6) + k) % 12,
+    45: lambda s, k: ((s % 3)*4 + k) % 12,
+    60: lambda s, k: (s + k) % 12,
+}
+# D30 uses unequal portions, split at these degrees for even / odd signs.
+D30_CUTS = (np.array([5.0, 10.0, 18.0, 25.0]), np.array([5.0, 12.0, 20.0, 25.0]))
+D30_SIGNS = np.array([[0, 10, 8, 2, 6], [1, 5, 11, 9, 7]], dtype=np.int8)
+# D9 counts navamshas from 0 Aries, so its table is indexed by the absolute navamsha.
+D9_TABLE = (np.arange(109) % 12).astype(np.int8)
+
+LOOKUP = {d: np.array([[rule(s, k) for k in range(d + 1)] for s in range(12)], dtype=np.int8) for d, rule in _RULE.items()}
+
+
+def varga_signs(lons, d_chart_val):
+    lons = np.asarray(lons, dtype=np.float64)
+    sign = np.floor(lons / 30).astype(np.intp)
+    rem = np.mod(lons, 30)
+    return _varga(lons, sign, rem, d_chart_val)
+
+def _varga(lons, sign, rem, d):
+    if d == 1: return sign.astype(np.int8)
+    if d == 9: return D9_TABLE[np.floor((lons*9)/30).astype(np.intp)]
+    if d == 30:
+        odd = sign % 2
+        seg = np.where(odd == 0, np.searchsorted(D30_CUTS[0], rem, side="right"), np.searchsorted(D30_CUTS[1], rem, side="right"))
+        return D30_SIGNS[odd, seg]
+    return LOOKUP[d][sign, np.floor(_SEGMENT[d](rem)).astype(np.intp)]
+
+def shodashvarga(lons):
+    lons = np.asarray(lons, dtype=np.float64)
+    sign = np.floor(lons / 30).astype(np.intp)
+    rem = np.mod(lons, 30)
+    out = np.empty(lons.shape + (len(VARGAS),), dtype=np.int8)
+    for i, d in enumerate(VARGAS):
+        out[..., i] = _varga(lons, sign, rem, d)
+    return out
@@ -0,0 +1,28 @@
+import io
+import json
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import panchang
+from batch_cli import read_records
+
+CSV = "name,lat,lon,tz\nBangalore,12.97,77.59,5.5\nBerlin,52.52,13.40,Europe/Berlin\n"
+
+
+def run(cities, days=2):
+    return [json.loads(line) for lines, _ in panchang.generate(cities, datetime(2024, 3, 30), days) for line in lines]
+
+
+def test_csv_numeric_tz_string():
+    rows = run(list(read_records(io.StringIO(CSV), "csv")))
+    assert not [r for r in rows if "error" in r]
+    assert [r["utc_offset"] for r in rows if r["city"] == "Bangalore"] == [5.5, 5.5]
+    assert [r["utc_offset"] for r in rows if r["city"] == "Berlin"] == [1.0, 2.0]  # DST starts 2024-03-31
+
+
+def test_numeric_and_string_tz_agree():
+    city = {"name": "Bangalore", "lat": 12.97, "lon": 77.59}
+    assert run([dict(city, tz="5.5")]) == run([dict(city, tz=5.5)])
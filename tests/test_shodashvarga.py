@@ -0,0 +1,50 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chart_engine as eng
+from shodashvarga import shodashvarga, varga_signs
+
+D30_CUTS = {0: (5, 10, 18, 25), 1: (5, 12, 20, 25)}
+
+
+def boundaries(d):
+    # Every longitude where the varga sign may change, with the doubles on either side of it.
+    if d == 30: cuts = [s*30 + c for s in range(12) for c in (0,) + D30_CUTS[s % 2]]
+    else: cuts = [k*30/d for k in range(12*d)] + [s*30.0 for s in range(12)]
+    cuts = np.unique(np.array(cuts, dtype=np.float64))
+    lons = np.concatenate([cuts, np.nextafter(cuts, -np.inf), np.nextafter(cuts, np.inf)])
+    return lons[(lons >= 0) & (lons < 360)]
+
+def scalar(lons, d):
+    return np.array([eng.get_divisional_sign(float(x), d) for x in lons])
+
+
+@pytest.mark.parametrize("d", eng.VARGAS)
+def test_boundaries_match_scalar(d):
+    lons = boundaries(d)
+    assert np.array_equal(varga_signs(lons, d), scalar(lons, d))
+
+@pytest.mark.parametrize("d", eng.VARGAS)
+def test_random_longitudes_match_scalar(d):
+    lons = np.random.default_rng(d).uniform(0, 360, 20000)
+    assert np.array_equal(varga_signs(lons, d), scalar(lons, d))
+
+def test_d2_and_d30_special_cases():
+    # D2 gives only Cancer/Leo, swapped between odd and even signs; D30 uses unequal portions.
+    lons = np.array([0.0, 14.999, 15.0, 30.0, 44.999, 45.0, 4.999, 5.0, 9.999, 10.0, 17.999, 18.0, 24.999, 25.0,
+                     34.999, 35.0, 41.999, 42.0, 49.999, 50.0, 54.999, 55.0])
+    assert np.array_equal(varga_signs(lons[:6], 2), [4, 4, 3, 3, 3, 4])
+    assert np.array_equal(varga_signs(lons[6:14], 30), [0, 10, 10, 8, 8, 2, 2, 6])
+    assert np.array_equal(varga_signs(lons[14:], 30), [1, 5, 5, 11, 11, 9, 9, 7])
+
+def test_shodashvarga_matches_scalar_for_every_varga():
+    lons = np.random.default_rng(0).uniform(0, 360, (50, 9))
+    out = shodashvarga(lons)
+    assert out.shape == (50, 9, len(eng.VARGAS))
+    for i, d in enumerate(eng.VARGAS):
+        assert np.array_equal(out[..., i].ravel(), scalar(lons.ravel(), d))
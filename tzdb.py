@@ -0,0 +1,92 @@
+from datetime import datetime
+from functools import lru_cache
+
+import numpy as np
+
+OK, AMBIGUOUS, NONEXISTENT = 0, 1, 2
+FLAG_NAMES = {AMBIGUOUS: "ambiguous", NONEXISTENT: "nonexistent"}
+EPOCH = datetime(1970, 1, 1)
+UNIX_JD = 2440587.5
+
+
+# --- Transition tables ---
+# A zone is a run of intervals with a constant UTC offset. In local wall time, interval k covers
+# [start + offset_k, next start + offset_k); when clocks go back, neighbours overlap (ambiguous),
+# and when they go forward, a gap opens (nonexistent). A lookup is one searchsorted over the starts.
+class Zone:
+    def __init__(self, name):
+        import pytz
+        tz = pytz.timezone(name)
+        self.name = name
+        if hasattr(tz, "_utc_transition_times"):
+            utc = [(t - EPOCH).total_seconds() for t in tz._utc_transition_times]
+            info = tz._transition_info
+        else:  # fixed-offset zones (UTC, Etc/GMT+5) have no transitions
+            utc, info = [0.0], [(tz.utcoffset(EPOCH), None, None)]
+        self.offset = np.array([off.total_seconds() for off, _, _ in info])
+        self.dst = np.array([bool(dst) for _, dst, _ in info])
+        starts = np.array(utc); starts[0] = -np.inf
+        self.start_local = starts + self.offset
+        self.end_local = np.append(starts[1:], np.inf) + self.offset
+
+    def lookup(self, local_seconds, is_dst=False):
+        # (offset seconds, flag) per local time, resolved as pytz's localize(is_dst=...) does: an
+        # ambiguous time takes the side whose DST state matches is_dst, or if that does not decide,
+        # the earlier side for True and the later for False; a nonexistent time takes the offset
+        # from after the gap for True and from before it for False.
+        t = np.asarray(local_seconds, dtype=np.float64)
+        k = np.searchsorted(self.start_local, t, "right") - 1
+        prev, nxt = np.maximum(k - 1, 0), np.minimum(k + 1, len(self.offset) - 1)
+        ambiguous = (k > 0) & (t < self.end_local[prev])
+        gap = t >= self.end_local[k]
+        early, late = np.where(ambiguous, prev, k), np.where(ambiguous, k, nxt)
+        match_e, match_l = self.dst[early] == is_dst, self.dst[late] == is_dst
+        use_late = np.where(ambiguous, np.where(match_e != match_l, match_l, not is_dst), gap & is_dst)
+        return self.offset[np.where(use_late, late, early)], np.where(ambiguous, AMBIGUOUS, np.where(gap, NONEXISTENT, OK))
+
+@lru_cache(maxsize=None)
+def zone(name):
+    return Zone(name)
+
+
+# --- Conversions ---
+def local_seconds(year, month, day, hour=0, minute=0, second=0):
+    # Proleptic Gregorian wall time as seconds since 1970-01-01, for arrays of valid dates.
+    y, m, d = (np.asarray(a, dtype=np.int64) for a in (year, month, day))
+    days = ((y - 1970).astype("datetime64[Y]").astype("datetime64[M]") + (m - 1)).astype("datetime64[D]") + (d - 1)
+    return days.astype(np.int64) * 86400.0 + np.asarray(hour) * 3600.0 + np.asarray(minute) * 60.0 + np.asarray(second, dtype=np.float64)
+
+def offset_hours(name, dt, is_dst=False):
+    off, flag = zone(name).lookup(local_seconds(dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second + dt.microsecond / 1e6), is_dst)
+    return float(off) / 3600.0, int(flag)
+
+def to_jd(names, year, month, day, hour=0, minute=0, second=0, is_dst=False):
+    # Julian Days (UT) for a batch of local birth times, each in its own IANA zone, plus the
+    # resolved UTC offsets in hours and OK/AMBIGUOUS/NONEXISTENT flags. Same result as
+    # swe.julday on the UTC time, one table lookup per distinct zone.
+    t = np.broadcast_to(local_seconds(year, month, day, hour, minute, second), np.shape(names)).astype(np.float64)
+    off, flags = np.zeros(len(t)), np.zeros(len(t), dtype=np.int8)
+    uniq, inverse = np.unique(np.asarray(names, dtype=str), return_inverse=True)
+    for i, name in enumerate(uniq):
+        rows = inverse == i
+        off[rows], flags[rows] = zone(name).lookup(t[rows], is_dst)
+    return (t - off) / 86400.0 + UNIX_JD, off / 3600.0, flags
+
+
+def resolve_records(records, is_dst=False):
+    # Replace a zone name in "tz" with that birth's historical UTC offset, in place; numeric offsets
+    # are left alone. Returns ({index: flag} for ambiguous or nonexistent times, [indexes with an
+    # unknown zone]). Records with malformed dates are skipped and left for parse_record to reject.
+    todo, names, fields, unknown = [], [], [], []
+    for i, rec in enumerate(records):
+        try: float(rec["tz"]); continue
+        except (KeyError, TypeError): continue
+        except ValueError: name = str(rec["tz"]).strip()
+        try: zone(name); fields.append([int(rec.get(k, 0) or 0) for k in ("year", "month", "day", "hour", "minute", "second")])
+        except KeyError: unknown.append(i); continue  # pytz.UnknownTimeZoneError
+        except ValueError: continue
+        todo.append(i); names.append(name)
+    if not todo: return {}, unknown
+    _, hours, flags = to_jd(names, *np.array(fields).T, is_dst=is_dst)
+    for i, h in zip(todo, hours.tolist()): records[i]["tz"] = h
+    return {i: int(f) for i, f in zip(todo, flags.tolist()) if f}, unknown